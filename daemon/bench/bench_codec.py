@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""
+Benchmarks the single pass codec against the replace per witness/channel it replaced
+"""
+
+import os
+import sys
+import time
+import types
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+
+import codec # pylint: disable=wrong-import-position
+import witnesses # pylint: disable=wrong-import-position
+
+MEMBERS = 50000
+CHANNELS = 500
+ROUNDS = 20
+
+
+def legacy_decode(text, witness_list, channel_list):
+    """
+    How decode_text used to work
+    """
+
+    cleaned = text
+
+    for witness in witness_list:
+        encode_text = f"<@{witness.who}>"
+        decode_text = f"{{entity:{witness.entity_id}}}"
+
+        if encode_text in cleaned:
+            cleaned = cleaned.replace(encode_text, decode_text)
+
+    for channel in channel_list:
+        encode_text = f"<#{channel.id}>"
+        decode_text = f"{{channel:{channel.name}}}"
+
+        if encode_text in cleaned:
+            cleaned = cleaned.replace(encode_text, decode_text)
+
+    return cleaned
+
+
+def legacy_encode(text, witness_list, channel_list):
+    """
+    How encode_text used to work
+    """
+
+    cleaned = text
+
+    for witness in witness_list:
+        encode_text = f"<@{witness.who}>"
+        decode_text = f"{{entity:{witness.entity_id}}}"
+
+        if decode_text in cleaned:
+            cleaned = cleaned.replace(decode_text, encode_text)
+
+    for channel in channel_list:
+        encode_text = f"<#{channel.id}>"
+        decode_text = f"{{channel:{channel.name}}}"
+
+        if decode_text in cleaned:
+            cleaned = cleaned.replace(decode_text, encode_text)
+
+    return cleaned
+
+
+def timed(call, *args):
+    """
+    Seconds per call averaged over ROUNDS
+    """
+
+    start = time.perf_counter()
+
+    for _ in range(ROUNDS):
+        result = call(*args)
+
+    return (time.perf_counter() - start) / ROUNDS, result
+
+
+def main():
+    """
+    Runs the comparison
+    """
+
+    rand = random.Random(42)
+
+    witness_list = [
+        types.SimpleNamespace(id=index, who=str(10**17 + index), entity_id=index)
+        for index in range(1, MEMBERS + 1)
+    ]
+    channel_list = [
+        types.SimpleNamespace(id=2 * 10**17 + index, name=f"channel-{index}")
+        for index in range(CHANNELS)
+    ]
+
+    identity = witnesses.WitnessMap(origin_id=1)
+    identity.load(witness_list)
+
+    compiled = codec.TextCodec(identity)
+    compiled.load_channels(channel_list)
+
+    mentions = " ".join(f"<@{rand.choice(witness_list).who}>" for _ in range(5))
+    channels = " ".join(f"<#{rand.choice(channel_list).id}>" for _ in range(3))
+    discord_text = f"hey {mentions} take a look at {channels} " + "lorem ipsum " * 100
+
+    legacy_seconds, legacy_text = timed(legacy_decode, discord_text, witness_list, channel_list)
+    compiled_seconds, compiled_text = timed(compiled.decode, discord_text)
+
+    assert legacy_text == compiled_text
+
+    print(f"decode  legacy {legacy_seconds * 1000:10.3f} ms  compiled {compiled_seconds * 1000:8.3f} ms  {legacy_seconds / compiled_seconds:8.0f}x")
+
+    unum_text = compiled_text
+
+    legacy_seconds, legacy_text = timed(legacy_encode, unum_text, witness_list, channel_list)
+    compiled_seconds, compiled_text = timed(compiled.encode, unum_text)
+
+    assert legacy_text == compiled_text == discord_text
+
+    print(f"encode  legacy {legacy_seconds * 1000:10.3f} ms  compiled {compiled_seconds * 1000:8.3f} ms  {legacy_seconds / compiled_seconds:8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+#!/usr/bin/env python
+"""
+Benchmarks the message pipeline's parsing and rendering at different scales, writing results to JSON
+"""
+
+import os
+import sys
+import json
+import time
+import types
+import random
+import asyncio
+import logging
+import argparse
+import datetime
+import platform
+import tracemalloc
+
+import yaml
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+
+import relations.unittest # pylint: disable=wrong-import-position
+
+import service # pylint: disable=wrong-import-position
+import unum_discord # pylint: disable=wrong-import-position
+
+# witnesses, channels, apps, commands per app
+
+SCALES = {
+    "small": (100, 20, 2, 5),
+    "medium": (5000, 200, 10, 20),
+    "large": (50000, 500, 50, 40)
+}
+
+USAGES = [
+    {
+        "name": "list",
+        "meme": "?",
+        "description": "List things for"
+    },
+    {
+        "name": "show",
+        "meme": "?",
+        "description": "Show a {thing} for",
+        "args": [
+            {
+                "name": "thing",
+                "description": "what to show"
+            },
+            {
+                "name": "since",
+                "format": "duration",
+                "description": "how far back"
+            }
+        ]
+    },
+    {
+        "name": "record",
+        "meme": "!",
+        "description": "Record something for",
+        "args": [
+            {
+                "name": "kind",
+                "valids": ["fast", "slow", "never"]
+            },
+            {
+                "name": "thoughts",
+                "format": "remainder"
+            }
+        ]
+    }
+]
+
+
+def app_meta(index, commands):
+    """
+    Meta for a synthetic App
+    """
+
+    return {
+        "title": f"App {index}",
+        "description": f"Synthetic App {index}",
+        "channel": f"channel-{index}",
+        "help": "Benchmark App\n" * 3,
+        "commands": [
+            {
+                "name": f"command-{index}-{number}",
+                "description": f"Command {number} of App {index}",
+                "examples": [
+                    {"meme": "?", "args": "thing 1d", "description": "Shows for"},
+                    {"meme": "!", "kind": "private", "args": "fast well", "description": "Records for"}
+                ],
+                "usages": USAGES
+            }
+            for number in range(commands)
+        ]
+    }
+
+
+def build(scale):
+    """
+    A client with resident Witnesses, channels, Apps and Origin but no connection
+    """
+
+    members, channels, apps, commands = SCALES[scale]
+
+    daemon = types.SimpleNamespace(
+        logger=logging.getLogger("bench"),
+        redis=None,
+        group="bench",
+        group_id="bench",
+        creds={"guild": {"id": "1"}},
+        ledger_workers=1,
+        message_cache_size=10000,
+        help_cache_size=1000,
+        page_size=10,
+        act_batch=10,
+        act_concurrency=1,
+        act_idle=60,
+        act_deliveries=5,
+        outbox_size=1000,
+        send_concurrency=1,
+        dedup_ttl=86400,
+        dedup_size=100000,
+        ingest_size=1000,
+        ingest_workers=1,
+        status_ttl=300,
+        journal_idle=3600
+    )
+
+    client = unum_discord.OriginClient(daemon=daemon, intents=unum_discord.discord.Intents.default())
+    client._connection.user = types.SimpleNamespace(id=1) # pylint: disable=protected-access
+
+    meta = yaml.safe_load(service.META)
+
+    client.origin = types.SimpleNamespace(
+        id=1,
+        who=service.WHO,
+        meta__channel=meta["channel"],
+        meta__commands=meta["commands"]
+    )
+
+    client.witnesses.load([
+        types.SimpleNamespace(id=index, who=str(10**17 + index), entity_id=index)
+        for index in range(1, members + 1)
+    ], origin_id=1)
+
+    client.codec.load_channels(
+        [types.SimpleNamespace(id=2 * 10**17, name=meta["channel"])] + [
+            types.SimpleNamespace(id=2 * 10**17 + index, name=f"channel-{index}")
+            for index in range(1, channels)
+        ]
+    )
+
+    client.registry.load("origin", [types.SimpleNamespace(id=1, who=service.WHO, meta=meta)])
+    client.registry.load("app", [
+        types.SimpleNamespace(id=index, who=f"app-{index}", meta=app_meta(index, commands))
+        for index in range(1, apps + 1)
+    ])
+
+    return client
+
+
+def message(client, content, channel="channel-1"):
+    """
+    A public message from a Witness
+    """
+
+    channel_id = client.codec.channel_ids[channel]
+
+    return types.SimpleNamespace(
+        id=random.randint(10**17, 10**18),
+        author=types.SimpleNamespace(id=10**17 + 1, name="bench", discriminator="0", bot=False),
+        channel=types.SimpleNamespace(id=channel_id, name=channel, type="text"),
+        guild=types.SimpleNamespace(id=1, name="bench"),
+        content=content,
+        attachments=[],
+        reference=None,
+        created_at=datetime.datetime.now()
+    )
+
+
+def cases(client, scale):
+    """
+    What to run, by name
+    """
+
+    members, channels, _, _ = SCALES[scale]
+    rand = random.Random(42)
+
+    mentions = " ".join(f"<@{10**17 + rand.randint(1, members)}>" for _ in range(5))
+    links = " ".join(f"<#{2 * 10**17 + rand.randint(1, channels - 1)}>" for _ in range(3))
+
+    discord_text = f"hey {mentions} look at {links} " + "lorem ipsum " * 20
+    unum_text = client.decode_text(discord_text)
+
+    command = client.registry.command("app", "app-1", "command-1-0")
+
+    statement = message(client, "?command-1-0 thing 1d")
+    help_general = message(client, "?help")
+    help_command = message(client, "?help command-1-0")
+
+    async def parse_statement():
+        await client.parse_statement(statement)
+
+    async def parse_command():
+        await client.parse_command({
+            "kind": "public",
+            "channel": "channel-1",
+            "text": "!command-1-0 fast this is slow",
+            "meme": "!"
+        })
+
+    def parse_usage():
+        client.parse_usage({"meme": "?"}, command, "thing 1d", None, "app-1")
+
+    async def render_help():
+        for help_message in [help_general, help_command]:
+            what, _ = await client.parse_statement(help_message)
+            client.encode_chunks(client.render_help(what))
+
+    return {
+        "decode_text": lambda: client.decode_text(discord_text),
+        "encode_text": lambda: client.encode_text(unum_text),
+        "parse_usage": parse_usage,
+        "parse_command": parse_command,
+        "parse_statement": parse_statement,
+        "render_help": render_help
+    }
+
+
+async def call(case):
+    """
+    Runs a case, sync or async
+    """
+
+    result = case()
+
+    if asyncio.iscoroutine(result):
+        await result
+
+
+async def measure(case, seconds):
+    """
+    Ops per second over a while, then the worst peak allocation of a few ops
+    """
+
+    await call(case)
+
+    count = 0
+    start = time.perf_counter()
+    end = start + seconds
+
+    while time.perf_counter() < end:
+        await call(case)
+        count += 1
+
+    ops = count / (time.perf_counter() - start)
+
+    tracemalloc.start()
+
+    peak = 0
+
+    for _ in range(20):
+        tracemalloc.reset_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        await call(case)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+
+    tracemalloc.stop()
+
+    return ops, peak
+
+
+async def run(scales, seconds):
+    """
+    Runs every case at every scale
+    """
+
+    results = []
+
+    for scale in scales:
+
+        client = build(scale)
+
+        for name, case in cases(client, scale).items():
+
+            ops, peak = await measure(case, seconds)
+
+            results.append({
+                "scale": scale,
+                "case": name,
+                "ops_per_sec": round(ops, 1),
+                "peak_bytes": peak
+            })
+
+            print(f"{scale:8} {name:16} {ops:12.1f} ops/s {peak:10d} peak bytes")
+
+    return results
+
+
+def main():
+    """
+    Runs the suite and writes the JSON
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", default=",".join(SCALES), help="comma separated scales to run")
+    parser.add_argument("--seconds", type=float, default=1.0, help="seconds to run each case")
+    parser.add_argument("--output", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "results.json"))
+    args = parser.parse_args()
+
+    relations.unittest.MockSource("ledger")
+
+    results = asyncio.run(run(args.scales.split(","), args.seconds))
+
+    with open(args.output, "w") as results_file:
+        json.dump({
+            "when": time.time(),
+            "python": platform.python_version(),
+            "scales": {scale: SCALES[scale] for scale in args.scales.split(",")},
+            "results": results
+        }, results_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
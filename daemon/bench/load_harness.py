@@ -0,0 +1,875 @@
+#!/usr/bin/env python
+"""
+Runs the client end to end against a fake gateway, Redis and ledger, reporting throughput and latency percentiles
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import types
+import random
+import asyncio
+import logging
+import argparse
+import datetime
+import platform
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import prometheus_client # pylint: disable=wrong-import-position
+import relations.unittest # pylint: disable=wrong-import-position
+
+import test.test_service # pylint: disable=wrong-import-position
+import ingest # pylint: disable=wrong-import-position
+import service # pylint: disable=wrong-import-position
+import unum_ledger # pylint: disable=wrong-import-position
+import unum_discord # pylint: disable=wrong-import-position
+
+ACT = re.compile(r"load-act-(\d+)")
+BOT = 1
+GUILD = 1
+USERS = 10**17
+CHANNELS = 2 * 10**17
+
+
+class LatencySource(relations.unittest.MockSource):
+    """
+    In memory ledger that takes a while to answer, like the real one over the network
+    """
+
+    def __init__(self, name, latency=0.0, **kwargs):
+
+        super().__init__(name, **kwargs)
+
+        self.latency = latency
+        self.lock = threading.RLock()
+
+    def delayed(self, call, *args, **kwargs):
+        """
+        Waits outside the lock so calls overlap like they would remotely
+        """
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        with self.lock:
+            return call(*args, **kwargs)
+
+    def create(self, *args, **kwargs):
+
+        return self.delayed(super().create, *args, **kwargs)
+
+    def retrieve(self, model, verify=True):
+
+        return self.delayed(super().retrieve, model, verify)
+
+    def titles(self, model):
+
+        return self.delayed(super().titles, model)
+
+    def count(self, model):
+
+        return self.delayed(super().count, model)
+
+    def update(self, *args, **kwargs):
+
+        return self.delayed(super().update, *args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+
+        return self.delayed(super().delete, *args, **kwargs)
+
+
+def stream_id(id):
+    """
+    Orders stream ids
+    """
+
+    if id in ["-", "+"]:
+        return (0, 0) if id == "-" else (float("inf"), 0)
+
+    exclusive = id.startswith("(")
+    milliseconds, sequence = id.lstrip("(").split("-")
+
+    return (int(milliseconds), int(sequence) + (1 if exclusive else 0))
+
+
+class StreamPipeline:
+    """
+    Buffers adds until executed
+    """
+
+    def __init__(self, redis):
+
+        self.redis = redis
+        self.adds = []
+
+    def xadd(self, stream, fields):
+
+        self.adds.append((stream, fields))
+
+    async def execute(self):
+
+        ids = [await self.redis.xadd(stream, fields) for stream, fields in self.adds]
+        self.adds = []
+
+        return ids
+
+
+class StreamRedis(test.test_service.MockRedis):
+    """
+    Async Redis streams with consumer groups, pending entries and claims, all in process
+    """
+
+    def __init__(self, host="harness", hook=None, **kwargs):
+
+        super().__init__(host, **kwargs)
+
+        self.hook = hook
+        self.sequence = 0
+        self.changed = {}
+        self.keys = {}
+
+    def condition(self, stream):
+        """
+        What blocked readers wait on
+        """
+
+        if stream not in self.changed:
+            self.changed[stream] = asyncio.Condition()
+
+        return self.changed[stream]
+
+    async def wait(self, stream, block):
+        """
+        Waits for an add, up to block milliseconds
+        """
+
+        condition = self.condition(stream)
+
+        async with condition:
+            try:
+                await asyncio.wait_for(condition.wait(), block / 1000)
+            except asyncio.TimeoutError:
+                pass
+
+    async def set(self, name, value, ex=None, nx=False):
+
+        if nx and name in self.keys:
+            return None
+
+        self.keys[name] = value
+
+        return True
+
+    async def delete(self, *names):
+
+        return sum(1 for name in names if self.keys.pop(name, None) is not None)
+
+    async def exists(self, stream):
+
+        return int(stream in self.queue)
+
+    async def xinfo_groups(self, stream):
+
+        return [
+            {"name": name, "last-delivered-id": state["last"], "lag": len(self.after(stream, state["last"], None))}
+            for name, state in self.groups.get(stream, {}).items()
+        ]
+
+    async def xinfo_consumers(self, stream, group):
+
+        return [{"name": "harness", "pending": len(self.groups[stream][group]["pending"]), "idle": 0}]
+
+    async def xgroup_create(self, stream, name, id="$", mkstream=False):
+
+        if mkstream:
+            self.queue.setdefault(stream, [])
+
+        if id == "$":
+            id = self.queue[stream][-1][0] if self.queue[stream] else "0-0"
+
+        self.groups.setdefault(stream, {})[name] = {"last": id, "pending": {}}
+
+    async def xgroup_setid(self, stream, name, id):
+
+        self.groups[stream][name]["last"] = id
+
+    async def xgroup_destroy(self, stream, name):
+
+        return int(self.groups[stream].pop(name, None) is not None)
+
+    async def xadd(self, stream, fields):
+
+        self.sequence += 1
+        id = f"1-{self.sequence}"
+
+        self.queue.setdefault(stream, []).append((id, dict(fields)))
+
+        if self.hook:
+            self.hook(stream, id, fields)
+
+        condition = self.condition(stream)
+
+        async with condition:
+            condition.notify_all()
+
+        return id
+
+    def after(self, stream, last, count):
+        """
+        Entries past an id
+        """
+
+        entries = [entry for entry in self.queue.get(stream, []) if stream_id(entry[0]) > stream_id(last)]
+
+        return entries[:count] if count else entries
+
+    async def xread(self, streams, count=None, block=None):
+
+        stream, last = list(streams.items())[0]
+
+        entries = self.after(stream, last, count)
+
+        if not entries and block is not None:
+            await self.wait(stream, block)
+            entries = self.after(stream, last, count)
+
+        return [[stream, entries]] if entries else []
+
+    async def xreadgroup(self, group, consumer, streams, count=None, block=None):
+
+        stream = list(streams.keys())[0]
+
+        if group not in self.groups.get(stream, {}):
+            raise Exception(f"NOGROUP No such key '{stream}' or consumer group '{group}'")
+
+        state = self.groups[stream][group]
+
+        entries = self.after(stream, state["last"], count)
+
+        if not entries and block is not None:
+            await self.wait(stream, block)
+            entries = self.after(stream, state["last"], count)
+
+        if not entries:
+            return []
+
+        now = time.time()
+
+        for id, _ in entries:
+            state["pending"][id] = {"consumer": consumer, "delivered": now, "times": 1}
+
+        state["last"] = entries[-1][0]
+
+        return [[stream, entries]]
+
+    async def xack(self, stream, group, *ids):
+
+        if group not in self.groups.get(stream, {}):
+            return 0
+
+        pending = self.groups[stream][group]["pending"]
+
+        return sum(1 for id in ids if pending.pop(id, None) is not None)
+
+    async def xrevrange(self, stream, max="+", min="-", count=None):
+
+        entries = list(reversed(self.queue.get(stream, [])))
+
+        return entries[:count] if count else entries
+
+    async def xrange(self, stream, min="-", max="+", count=None):
+
+        entries = [
+            entry for entry in self.queue.get(stream, [])
+            if stream_id(min) <= stream_id(entry[0]) <= stream_id(max)
+        ]
+
+        return entries[:count] if count else entries
+
+    async def xpending_range(self, stream, group, min, max, count, consumername=None, idle=None):
+
+        now = time.time()
+        entries = []
+
+        for id, state in sorted(self.groups[stream][group]["pending"].items(), key=lambda item: stream_id(item[0])):
+
+            idled = (now - state["delivered"]) * 1000
+
+            if not stream_id(min) <= stream_id(id) <= stream_id(max) or (idle is not None and idled < idle):
+                continue
+
+            entries.append({
+                "message_id": id,
+                "consumer": state["consumer"],
+                "time_since_delivered": int(idled),
+                "times_delivered": state["times"]
+            })
+
+            if len(entries) == count:
+                break
+
+        return entries
+
+    async def xclaim(self, stream, group, consumer, min_idle_time, message_ids):
+
+        now = time.time()
+        pending = self.groups[stream][group]["pending"]
+        fields = dict(self.queue.get(stream, []))
+        claimed = []
+
+        for id in message_ids:
+
+            state = pending.get(id)
+
+            if state is None or (now - state["delivered"]) * 1000 < min_idle_time:
+                continue
+
+            state.update(consumer=consumer, delivered=now, times=state["times"] + 1)
+            claimed.append((id, fields.get(id)))
+
+        return claimed
+
+    def pipeline(self, transaction=True):
+
+        return StreamPipeline(self)
+
+
+class FakeMessage:
+    """
+    Enough of a discord.Message for the pipeline
+    """
+
+    def __init__(self, id, author, channel, content, reference=None):
+
+        self.id = id
+        self.author = author
+        self.channel = channel
+        self.guild = channel.guild
+        self.content = content
+        self.attachments = []
+        self.reference = types.SimpleNamespace(message_id=reference.id) if reference else None
+        self.created_at = datetime.datetime.now()
+
+    async def add_reaction(self, emoji):
+
+        await self.channel.harness.rest()
+
+
+class FakeChannel:
+    """
+    A text channel whose sends go to the harness after REST latency
+    """
+
+    def __init__(self, harness, id, name, guild):
+
+        self.harness = harness
+        self.id = id
+        self.name = name
+        self.guild = guild
+        self.type = "text"
+
+    async def send(self, content, reference=None):
+
+        await self.harness.rest()
+
+        return self.harness.sent(self, content, reference)
+
+    async def fetch_message(self, id):
+
+        await self.harness.rest()
+
+        return self.harness.messages[id]
+
+
+class FakeMember:
+    """
+    A member who can be DM'd
+    """
+
+    def __init__(self, harness, id):
+
+        self.harness = harness
+        self.id = id
+        self.name = f"user-{id - USERS}"
+        self.discriminator = "0"
+        self.bot = False
+
+    async def send(self, content, reference=None):
+
+        await self.harness.rest()
+
+        return self.harness.sent(self, content, reference)
+
+
+class Harness:
+    """
+    Wires the client to the fakes, drives load and keeps the timings
+    """
+
+    def __init__(self, args):
+
+        self.args = args
+        self.rand = random.Random(args.seed)
+
+        self.sequence = 10**18
+        self.messages = {}
+        self.chatter = []
+        self.said = []
+        self.started = {}
+        self.latencies = {"message_fact": [], "act_send": []}
+        self.counts = {"messages": 0, "replays": 0, "reactions": 0, "acts": 0, "facts": 0, "sends": 0}
+
+        self.guild = types.SimpleNamespace(id=GUILD, name="harness")
+        self.channels = [
+            FakeChannel(self, CHANNELS + index, f"channel-{index}", self.guild)
+            for index in range(args.channels)
+        ]
+        self.channel_ids = {channel.id: channel for channel in self.channels}
+        self.bot = FakeMember(self, BOT)
+        self.bot.bot = True
+        self.members = {USERS + index: FakeMember(self, USERS + index) for index in range(1, args.users + 1)}
+
+        self.redis = StreamRedis(hook=self.added)
+        self.client = None
+
+    def next_id(self):
+        """
+        Snowflakes, more or less
+        """
+
+        self.sequence += 1
+
+        return self.sequence
+
+    async def rest(self):
+        """
+        A round trip to Discord
+        """
+
+        if self.args.rest_latency:
+            await asyncio.sleep(self.args.rest_latency)
+
+    def added(self, stream, id, fields):
+        """
+        Facts landing on the stream end message latency
+        """
+
+        if stream != "ledger/fact":
+            return
+
+        self.counts["facts"] += 1
+
+        start = self.started.pop(json.loads(fields["fact"])["who"], None)
+
+        if start is not None:
+            self.latencies["message_fact"].append(time.perf_counter() - start)
+
+    def sent(self, channel, content, reference):
+        """
+        Sends end act latency
+        """
+
+        self.counts["sends"] += 1
+
+        # Only channel messages get replied to, DMs are out of sight
+
+        if isinstance(channel, FakeChannel):
+            message = FakeMessage(self.next_id(), self.bot, channel, content)
+            self.messages[message.id] = message
+        else:
+            message = types.SimpleNamespace(id=self.next_id(), channel=channel, content=content)
+
+        for number in ACT.findall(content):
+
+            start = self.started.pop(f"act:{number}", None)
+
+            if start is not None:
+                self.latencies["act_send"].append(time.perf_counter() - start)
+
+        return message
+
+    def get_guild(self, id):
+        """
+        Gateway cached guild, unless we're running cold
+        """
+
+        if self.args.cold:
+            return None
+
+        return types.SimpleNamespace(id=id, get_member=self.members.get, fetch_member=self.fetch_member)
+
+    def get_channel(self, id):
+        """
+        Gateway cached channel, unless we're running cold
+        """
+
+        if self.args.cold:
+            return None
+
+        return self.channel_ids.get(id)
+
+    async def fetch_guild(self, id):
+        """
+        REST guild, for DMs
+        """
+
+        await self.rest()
+
+        return types.SimpleNamespace(id=id, fetch_member=self.fetch_member)
+
+    async def fetch_member(self, id):
+        """
+        REST member, for DMs
+        """
+
+        await self.rest()
+
+        return self.members[int(id)]
+
+    async def fetch_channel(self, id):
+        """
+        REST channel, for references
+        """
+
+        await self.rest()
+
+        return self.channel_ids[int(id)]
+
+    def seed(self):
+        """
+        Unum, Origin, an Entity and Witness per user and the App acts come from
+        """
+
+        unum = unum_ledger.Unum(who="self").create()
+
+        self.app = unum_ledger.App(who="harness", meta={
+            "title": "Harness",
+            "channel": self.channels[0].name,
+            "commands": []
+        }).create()
+
+        self.entities = unum_ledger.Entity([
+            {
+                "unum_id": unum.id,
+                "who": f"user-{id - USERS}",
+                "status": "active",
+                "meta": {"talk": {
+                    "kind": "private" if self.rand.random() < self.args.private else "public",
+                    "noise": "loud"
+                }}
+            }
+            for id in self.members
+        ]).create()
+
+        origin = unum_ledger.Origin(who=service.WHO).create()
+
+        unum_ledger.Witness([
+            {
+                "entity_id": entity.id,
+                "origin_id": origin.id,
+                "who": str(id),
+                "status": "active"
+            }
+            for id, entity in zip(self.members, self.entities)
+        ]).create()
+
+    async def start(self):
+        """
+        Builds the client like discord.py's login would, minus the gateway
+        """
+
+        daemon = types.SimpleNamespace(
+            logger=logging.getLogger("harness"),
+            redis=self.redis,
+            group="harness",
+            group_id="harness",
+            creds={"guild": {"id": str(GUILD)}},
+            loop=None,
+            ledger_workers=self.args.ledger_workers,
+            message_cache_size=10000,
+            help_cache_size=1000,
+            page_size=10,
+            act_batch=10,
+            act_concurrency=self.args.act_concurrency,
+            act_idle=60,
+            act_deliveries=5,
+            outbox_size=1000,
+            send_concurrency=self.args.send_concurrency,
+            dedup_ttl=86400,
+            dedup_size=100000,
+            ingest_size=self.args.ingest_size,
+            ingest_workers=self.args.ingest_workers,
+            status_ttl=300,
+            journal_idle=3600
+        )
+
+        intents = unum_discord.discord.Intents.default()
+        intents.members = True
+        intents.message_content = True # pylint: disable=assigning-non-slot
+
+        client = unum_discord.OriginClient(daemon=daemon, intents=intents)
+
+        await client._async_setup_hook() # pylint: disable=protected-access
+
+        client._connection.user = self.bot # pylint: disable=protected-access
+        client.get_all_channels = lambda: self.channels
+        client.get_guild = self.get_guild
+        client.get_channel = self.get_channel
+        client.fetch_guild = self.fetch_guild
+        client.fetch_channel = self.fetch_channel
+
+        self.client = client
+
+        self.seed()
+
+        await client.setup_hook()
+        await client.on_ready()
+
+    async def inject_message(self, number):
+        """
+        Someone says something, now and then a command or a reply
+        """
+
+        # Gateway resumes replay what we've already seen, commands included
+
+        if self.said and self.rand.random() < self.args.replays:
+            self.counts["replays"] += 1
+            await self.client.on_message(self.rand.choice(self.said))
+            return
+
+        channel = self.rand.choice(self.channels)
+        author = self.members[self.rand.choice(list(self.members))]
+
+        if self.rand.random() < self.args.commands:
+            content = f"?scat load {number}"
+        else:
+            content = f"chatter {number} from <@{author.id}> in <#{channel.id}>"
+
+        reference = None
+
+        if self.messages and self.rand.random() < 0.1:
+            reference = self.messages[self.rand.choice(list(self.messages))]
+
+        message = FakeMessage(self.next_id(), author, channel, content, reference)
+        self.messages[message.id] = message
+
+        self.said.append(message)
+
+        if content.startswith("chatter"):
+            self.chatter.append(message)
+
+        self.counts["messages"] += 1
+        self.started[f"message:{message.id}"] = time.perf_counter()
+
+        await self.client.on_message(message)
+
+    async def inject_reaction(self, number):
+        """
+        Someone reacts to something already said, commands react differently
+        """
+
+        message = self.rand.choice(self.chatter)
+        user = self.members[self.rand.choice(list(self.members))]
+        emoji = self.rand.choice(["👍", "❓", "✅"])
+
+        self.counts["reactions"] += 1
+        self.started.setdefault(f"reaction:{message.id}:{emoji}", time.perf_counter())
+
+        await self.client.on_reaction_add(types.SimpleNamespace(message=message, emoji=emoji), user)
+
+    async def inject_act(self, number):
+        """
+        An App wants something said
+        """
+
+        entity = self.rand.choice(self.entities)
+
+        self.counts["acts"] += 1
+        self.started[f"act:{number}"] = time.perf_counter()
+
+        await self.redis.xadd("ledger/act", {"act": json.dumps({
+            "entity_id": entity.id,
+            "app_id": self.app.id,
+            "what": {"base": "statement", "text": f"load-act-{number}"},
+            "meta": {}
+        })})
+
+    async def drive(self, rate, inject, end):
+        """
+        Injects at a steady rate without waiting on the previous injection, like a gateway
+        """
+
+        if rate <= 0:
+            return
+
+        loop = asyncio.get_running_loop()
+        tasks = set()
+        number = 0
+        start = loop.time()
+
+        while loop.time() < end:
+
+            number += 1
+
+            if inject != self.inject_reaction or self.chatter:
+                task = loop.create_task(self.logged(inject, number))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            await asyncio.sleep(max(0, start + number / rate - loop.time()))
+
+        if tasks:
+            await asyncio.wait(tasks)
+
+    async def logged(self, inject, number):
+        """
+        Failures count, they just don't stop the run
+        """
+
+        try:
+            await inject(number)
+        except Exception: # pylint: disable=broad-except
+            self.counts.setdefault("errors", 0)
+            self.counts["errors"] += 1
+            logging.getLogger("harness").exception("inject failed")
+
+    async def run(self):
+        """
+        Starts, loads for a while, lets things settle, then reports
+        """
+
+        await self.start()
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        end = start + self.args.seconds
+
+        await asyncio.gather(
+            self.drive(self.args.message_rate, self.inject_message, end),
+            self.drive(self.args.reaction_rate, self.inject_reaction, end),
+            self.drive(self.args.act_rate, self.inject_act, end)
+        )
+
+        # Give acts and sends still in flight a chance to finish
+
+        settle = loop.time() + self.args.settle
+
+        while loop.time() < settle and any(key.startswith("act:") for key in self.started):
+            await asyncio.sleep(0.05)
+
+        await self.client.ingest.drain()
+        await self.client.acts.drain()
+        await self.client.outbox.drain()
+
+        elapsed = loop.time() - start
+
+        for task in asyncio.all_tasks():
+            if task is not asyncio.current_task():
+                task.cancel()
+
+        self.client.pool.shutdown(wait=False)
+
+        return self.report(elapsed)
+
+    def report(self, elapsed):
+        """
+        Throughput and percentiles
+        """
+
+        for kind in ingest.KINDS:
+            self.counts[f"shed_{kind}"] = int(
+                prometheus_client.REGISTRY.get_sample_value("ingest_shed_total", {"kind": kind}) or 0
+            )
+
+        results = {
+            "elapsed": round(elapsed, 3),
+            "counts": self.counts,
+            "throughput": {name: round(count / elapsed, 1) for name, count in self.counts.items()},
+            "latency": {}
+        }
+
+        for name, latencies in self.latencies.items():
+
+            latencies = sorted(latencies)
+
+            results["latency"][name] = {
+                "count": len(latencies),
+                **{
+                    f"p{percent}": round(percentile(latencies, percent) * 1000, 2)
+                    for percent in [50, 90, 95, 99]
+                },
+                "max": round(latencies[-1] * 1000, 2) if latencies else None
+            }
+
+        return results
+
+
+def percentile(latencies, percent):
+    """
+    Nearest rank on sorted latencies
+    """
+
+    if not latencies:
+        return 0
+
+    return latencies[min(len(latencies) - 1, int(len(latencies) * percent / 100))]
+
+
+def main():
+    """
+    Runs the harness and prints, optionally writes, the results
+    """
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=10.0, help="seconds to inject for")
+    parser.add_argument("--settle", type=float, default=5.0, help="seconds to wait for acts in flight")
+    parser.add_argument("--users", type=int, default=200, help="members with Entities")
+    parser.add_argument("--channels", type=int, default=20, help="text channels")
+    parser.add_argument("--message-rate", type=float, default=50.0, help="messages per second")
+    parser.add_argument("--reaction-rate", type=float, default=10.0, help="reactions per second")
+    parser.add_argument("--act-rate", type=float, default=20.0, help="acts per second")
+    parser.add_argument("--replays", type=float, default=0.05, help="fraction of messages that are replays")
+    parser.add_argument("--commands", type=float, default=0.1, help="fraction of messages that are commands")
+    parser.add_argument("--private", type=float, default=0.2, help="fraction of Entities acted on by DM")
+    parser.add_argument("--ledger-latency", type=float, default=0.005, help="seconds per ledger call")
+    parser.add_argument("--rest-latency", type=float, default=0.05, help="seconds per Discord REST call")
+    parser.add_argument("--cold", action="store_true", help="miss the gateway caches, going to REST")
+    parser.add_argument("--ledger-workers", type=int, default=10)
+    parser.add_argument("--ingest-size", type=int, default=1000)
+    parser.add_argument("--ingest-workers", type=int, default=16)
+    parser.add_argument("--act-concurrency", type=int, default=8)
+    parser.add_argument("--send-concurrency", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="where to write JSON results")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    LatencySource("ledger", latency=args.ledger_latency)
+
+    results = asyncio.run(Harness(args).run())
+
+    for name, count in results["counts"].items():
+        print(f"{name:10} {count:8d} {results['throughput'][name]:10.1f}/s")
+
+    for name, latency in results["latency"].items():
+        print(f"{name:12} " + " ".join(f"{key}={value}" for key, value in latency.items()))
+
+    if args.output:
+        with open(args.output, "w") as results_file:
+            json.dump({
+                "when": time.time(),
+                "python": platform.python_version(),
+                "args": vars(args),
+                "results": results
+            }, results_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Module for the concurrent Act consumer
+"""
+
+import asyncio
+
+
+class ActConsumer:
+    """
+    Runs Acts concurrently, those with the same key in the order they were read
+    """
+
+    def __init__(self, handle, concurrency, backlog, logger):
+
+        self.handle = handle
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.backlog = backlog
+        self.logger = logger
+
+        self.tails = {}
+        self.outstanding = set()
+        self.ids = set()
+        self.queued = 0
+        self.inflight = 0
+
+    def submit(self, key, id, instance):
+        """
+        Schedules an Act behind the last one with the same key
+        """
+
+        previous = self.tails.get(key)
+
+        task = asyncio.ensure_future(self.run(previous, id, instance))
+
+        self.tails[key] = task
+        self.outstanding.add(task)
+        self.ids.add(id)
+
+        task.add_done_callback(lambda done: self.done(key, id, done))
+
+        return task
+
+    def done(self, key, id, task):
+        """
+        Forgets a finished Act
+        """
+
+        self.outstanding.discard(task)
+        self.ids.discard(id)
+
+        if self.tails.get(key) is task:
+            del self.tails[key]
+
+    async def run(self, previous, id, instance):
+        """
+        Waits for its turn, then for a slot, then handles
+        """
+
+        self.queued += 1
+
+        try:
+
+            if previous is not None:
+                await asyncio.wait([previous])
+
+            await self.semaphore.acquire()
+
+        finally:
+            self.queued -= 1
+
+        self.inflight += 1
+
+        try:
+            await self.handle(id, instance)
+        except Exception: # pylint: disable=broad-except
+            self.logger.exception("act failed", extra={"act": {"id": id}})
+        finally:
+            self.inflight -= 1
+            self.semaphore.release()
+
+    async def room(self):
+        """
+        Waits until there's room for more, so we don't read faster than we can act
+        """
+
+        while len(self.outstanding) >= self.backlog:
+            await asyncio.wait(list(self.outstanding), return_when=asyncio.FIRST_COMPLETED)
+
+    async def drain(self):
+        """
+        Waits for everything submitted to finish
+        """
+
+        while self.outstanding:
+            await asyncio.wait(list(self.outstanding))
@@ -0,0 +1,106 @@
+"""
+Module for the mention and channel codec
+"""
+
+import re
+
+DECODE = re.compile(r"<([@#])(\d+)>")
+ENCODE = re.compile(r"\{(entity|channel):([^{}]+)\}")
+
+
+class TextCodec:
+    """
+    Converts Discord mentions to Unum references, and back, in a single pass
+    """
+
+    def __init__(self, witnesses):
+
+        self.witnesses = witnesses
+        self.channel_names = {}
+        self.channel_ids = {}
+        self.channels = {}
+
+    def load_channels(self, channels):
+        """
+        Replaces the channel maps, first channel wins a name like get() does
+        """
+
+        channel_names = {}
+        channel_ids = {}
+        by_name = {}
+
+        for channel in channels:
+            channel_names[str(channel.id)] = channel.name
+            channel_ids.setdefault(channel.name, str(channel.id))
+            by_name.setdefault(channel.name, channel)
+
+        self.channel_names = channel_names
+        self.channel_ids = channel_ids
+        self.channels = by_name
+
+    def channel(self, name):
+        """
+        The channel with a name, without scanning them all
+        """
+
+        return self.channels.get(name)
+
+    def decode_token(self, match):
+        """
+        Converts a single <@id> or <#id>
+        """
+
+        kind, id = match.groups()
+
+        if kind == "@":
+
+            entity_id = self.witnesses.entity_id(id)
+
+            if entity_id is not None:
+                return f"{{entity:{entity_id}}}"
+
+        elif id in self.channel_names:
+
+            return f"{{channel:{self.channel_names[id]}}}"
+
+        return match.group(0)
+
+    def encode_token(self, match):
+        """
+        Converts a single {entity:id} or {channel:name}
+        """
+
+        kind, value = match.groups()
+
+        if kind == "entity":
+
+            who = self.witnesses.who(int(value)) if value.isdigit() else None
+
+            if who is not None:
+                return f"<@{who}>"
+
+        elif value in self.channel_ids:
+
+            return f"<#{self.channel_ids[value]}>"
+
+        return match.group(0)
+
+    def decode(self, text):
+        """
+        Take Discord text and makes it Unum friendly
+        """
+
+        if "<" not in text:
+            return text
+
+        return DECODE.sub(self.decode_token, text)
+
+    def encode(self, text):
+        """
+        Take Unum text and makes it Discord friendly
+        """
+
+        if "{" not in text:
+            return text
+
+        return ENCODE.sub(self.encode_token, text)
@@ -0,0 +1,99 @@
+"""
+Module for deduplicating events before they're written
+"""
+
+import math
+import hashlib
+
+ERROR = 0.001
+
+
+class BloomFilter:
+    """
+    Probably seen or definitely not, aging out by swapping generations when full
+    """
+
+    def __init__(self, size, error=ERROR):
+
+        self.size = size
+        self.bits = max(8, int(-size * math.log(error) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / size * math.log(2)))
+        self.current = bytearray((self.bits + 7) // 8)
+        self.previous = bytearray((self.bits + 7) // 8)
+        self.count = 0
+
+    def positions(self, key):
+        """
+        Where a key's bits are, by double hashing
+        """
+
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+
+        return [(first + index * second) % self.bits for index in range(self.hashes)]
+
+    @staticmethod
+    def has(bits, positions):
+        """
+        Whether every position is set
+        """
+
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in positions)
+
+    def __contains__(self, key):
+
+        positions = self.positions(key)
+
+        return self.has(self.current, positions) or self.has(self.previous, positions)
+
+    def add(self, key):
+        """
+        Adds a key, retiring the older generation if this one's full
+        """
+
+        if self.count >= self.size:
+            self.previous = self.current
+            self.current = bytearray(len(self.previous))
+            self.count = 0
+
+        for position in self.positions(key):
+            self.current[position >> 3] |= 1 << (position & 7)
+
+        self.count += 1
+
+
+class Dedup:
+    """
+    Claims event keys in Redis for a while, with a local filter saying what's surely new
+    """
+
+    def __init__(self, redis, ttl, size, prefix="discord/dedup/"):
+
+        self.redis = redis
+        self.ttl = ttl
+        self.prefix = prefix
+        self.bloom = BloomFilter(size)
+
+    def seen(self, key):
+        """
+        Whether this process has probably seen a key before
+        """
+
+        return key in self.bloom
+
+    async def claim(self, key):
+        """
+        True if no one, here or in any other replica, has claimed the key yet
+        """
+
+        self.bloom.add(key)
+
+        return bool(await self.redis.set(f"{self.prefix}{key}", 1, nx=True, ex=self.ttl))
+
+    async def release(self, key):
+        """
+        Lets a key be claimed again, for when writing failed
+        """
+
+        await self.redis.delete(f"{self.prefix}{key}")
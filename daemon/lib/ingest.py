@@ -0,0 +1,99 @@
+"""
+Module for the bounded ingestion queue
+"""
+
+import time
+import asyncio
+import collections
+
+KINDS = ["command", "chatter"]
+
+
+class Ingest:
+    """
+    Handles events with a few workers, commands first, shedding chatter when full
+    """
+
+    def __init__(self, size, workers, logger, waited=None, shed=None):
+
+        self.size = size
+        self.workers = workers
+        self.logger = logger
+        self.waited = waited or (lambda kind, seconds: None)
+        self.shed = shed or (lambda kind: None)
+
+        self.queues = {kind: collections.deque() for kind in KINDS}
+        self.running = set()
+
+    @property
+    def depth(self):
+        """
+        Everything waiting
+        """
+
+        return sum(len(queue) for queue in self.queues.values())
+
+    def put(self, kind, handle, *args):
+        """
+        Queues an event without waiting, returning whether it was taken
+        """
+
+        if self.depth >= self.size:
+
+            # Make room for a command with the oldest chatter, chatter just goes
+
+            if kind == "chatter" or not self.queues["chatter"]:
+                self.shed(kind)
+                return False
+
+            self.queues["chatter"].popleft()
+            self.shed("chatter")
+
+        self.queues[kind].append((time.monotonic(), handle, args))
+
+        if len(self.running) < self.workers:
+            worker = asyncio.ensure_future(self.work())
+            self.running.add(worker)
+
+        return True
+
+    def take(self):
+        """
+        The next event, commands before chatter
+        """
+
+        for kind in KINDS:
+            if self.queues[kind]:
+                return (kind, *self.queues[kind].popleft())
+
+        return None
+
+    async def work(self):
+        """
+        Handles events until there are none
+        """
+
+        try:
+
+            while self.depth:
+
+                kind, queued, handle, args = self.take()
+
+                self.waited(kind, time.monotonic() - queued)
+
+                try:
+                    await handle(*args)
+                except Exception: # pylint: disable=broad-except
+                    self.logger.exception("ingest failed", extra={"ingest": {"kind": kind}})
+
+        finally:
+            # Right away, so whatever's put next starts a worker rather than waiting on one that's done
+            self.running.discard(asyncio.current_task())
+
+    async def drain(self):
+        """
+        Waits for everything queued to be handled
+        """
+
+        while self.running:
+            await asyncio.wait(list(self.running))
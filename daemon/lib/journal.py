@@ -0,0 +1,221 @@
+"""
+Module for the batched Journal writer and the Journal reader
+"""
+
+import time
+import json
+import contextlib
+import contextvars
+
+BATCH = contextvars.ContextVar("journal_batch", default=None)
+
+
+class JournalWriter:
+    """
+    Collects Journal entries for the event being handled and writes them all at once
+    """
+
+    def __init__(self, write):
+
+        self.write = write
+
+    @contextlib.asynccontextmanager
+    async def batch(self):
+        """
+        Collects everything journaled while handling an event, flushing at the end
+        """
+
+        token = BATCH.set([])
+
+        try:
+            yield
+        finally:
+            try:
+                await self.flush()
+            finally:
+                BATCH.reset(token)
+
+    async def add(self, entry):
+        """
+        Adds to the current batch, writing right away if there isn't one
+        """
+
+        batch = BATCH.get()
+
+        if batch is None:
+            await self.write([entry])
+        else:
+            batch.append(entry)
+
+    async def flush(self):
+        """
+        Writes whatever's in the current batch
+        """
+
+        batch = BATCH.get()
+
+        if not batch:
+            return
+
+        entries = list(batch)
+        batch.clear()
+
+        await self.write(entries)
+
+
+class JournalReader:
+    """
+    Applies everyone's Journal entries to registered read models, in its own consumer group
+    """
+
+    def __init__(self, redis, group, consumer, logger, reload=None, stream="ledger/journal", clock=time.time):
+
+        self.redis = redis
+        self.group = group
+        self.consumer = consumer
+        self.logger = logger
+        self.reload = reload
+        self.stream = stream
+        self.clock = clock
+
+        self.models = {}
+        self.last = None
+        self.lag = 0
+        self.delay = 0
+
+    def register(self, block, apply):
+        """
+        Has a read model apply Journal whats for a block
+        """
+
+        self.models.setdefault(block, []).append(apply)
+
+    def apply(self, what):
+        """
+        Applies a Journal what to every read model for its block
+        """
+
+        for apply in self.models.get(what.get("block"), []):
+            apply(what)
+
+    async def position(self):
+        """
+        Where the Journal is now, to note before loading read models
+        """
+
+        last = await self.redis.xrevrange(self.stream, count=1)
+
+        return last[0][0] if last else "0-0"
+
+    async def start(self, last, idle):
+        """
+        Reads from where the read models were loaded, dropping groups of readers long gone
+        """
+
+        groups = await self.redis.xinfo_groups(self.stream) if await self.redis.exists(self.stream) else []
+
+        if self.group in [group["name"] for group in groups]:
+            await self.redis.xgroup_setid(self.stream, self.group, last)
+        else:
+            await self.redis.xgroup_create(self.stream, self.group, id=last, mkstream=True)
+
+        self.last = last
+
+        prefix = self.group.rsplit("/", 1)[0] + "/"
+
+        for group in groups:
+
+            if group["name"] == self.group or not group["name"].startswith(prefix):
+                continue
+
+            consumers = await self.redis.xinfo_consumers(self.stream, group["name"])
+
+            # No consumers yet is a pod just starting, not one long gone
+
+            if consumers and all(consumer["idle"] > idle * 1000 for consumer in consumers):
+                self.logger.info("journal group pruned", extra={"group": group["name"]})
+                await self.redis.xgroup_destroy(self.stream, group["name"])
+
+    async def recover(self):
+        """
+        Recreates our group if it's gone, reloading the read models since entries were missed
+        """
+
+        self.logger.warning("journal group missing", extra={"group": self.group})
+
+        last = await self.position()
+
+        if self.reload is not None:
+            await self.reload()
+
+        await self.redis.xgroup_create(self.stream, self.group, id=last, mkstream=True)
+
+        self.last = last
+
+    async def read(self, count=100, block=500):
+        """
+        Applies the next entries, acknowledging them, returning how many
+        """
+
+        try:
+            message = await self.redis.xreadgroup(self.group, self.consumer, {self.stream: ">"}, count=count, block=block)
+        except Exception as exception: # pylint: disable=broad-except
+
+            if "NOGROUP" not in str(exception):
+                raise
+
+            await self.recover()
+            return 0
+
+        if not message or not message[0][1]:
+            self.delay = 0
+            return 0
+
+        for id, fields in message[0][1]:
+
+            if "journal" in fields:
+
+                entry = json.loads(fields["journal"])
+
+                try:
+                    self.apply(entry["what"])
+                except Exception: # pylint: disable=broad-except
+                    self.logger.exception("journal apply failed", extra={"journal": {"id": id}})
+
+                self.delay = max(0, self.clock() - entry.get("when", self.clock()))
+
+            self.last = id
+
+        await self.redis.xack(self.stream, self.group, *[id for id, _ in message[0][1]])
+
+        return len(message[0][1])
+
+    async def measure(self, limit=100):
+        """
+        How many entries we're behind, from Redis if it knows, counting a few if it doesn't
+        """
+
+        info = {}
+
+        for group in await self.redis.xinfo_groups(self.stream):
+            if group["name"] == self.group:
+                info = group
+
+        if info.get("lag") is not None:
+            self.lag = info["lag"]
+            return self.lag
+
+        # Redis can still tell by how many were added and how many we've read,
+        # otherwise count, but only so far, as counting pulls whole entries
+
+        if info.get("entries-read") is not None:
+
+            added = (await self.redis.xinfo_stream(self.stream)).get("entries-added")
+
+            if added is not None:
+                self.lag = max(added - info["entries-read"], 0)
+                return self.lag
+
+        self.lag = len(await self.redis.xrange(self.stream, f"({self.last}", "+", count=limit))
+
+        return self.lag
@@ -0,0 +1,85 @@
+"""
+Module for the Discord message cache
+"""
+
+import copy
+import collections
+
+
+class MessageCache:
+    """
+    Bounded LRU of Discord messages and their parsed what, meta by message id
+    """
+
+    def __init__(self, size):
+
+        self.size = size
+        self.entries = collections.OrderedDict()
+
+    def __len__(self):
+
+        return len(self.entries)
+
+    def __contains__(self, id):
+
+        return int(id) in self.entries
+
+    def lookup(self, id):
+        """
+        The entry, freshened, or None
+        """
+
+        id = int(id)
+        entry = self.entries.get(id)
+
+        if entry is not None:
+            self.entries.move_to_end(id)
+
+        return entry
+
+    def get(self, id):
+        """
+        The message or None
+        """
+
+        entry = self.lookup(id)
+
+        return entry[0] if entry is not None else None
+
+    def parsed(self, id):
+        """
+        A copy of the parsed what, meta or None
+        """
+
+        entry = self.lookup(id)
+
+        return copy.deepcopy(entry[1]) if entry is not None else None
+
+    def add(self, message, parsed=None):
+        """
+        Adds or freshens a message, keeping what was parsed unless there's new
+        """
+
+        # Copied in and out, as whoever parsed it keeps adding to it
+
+        parsed = copy.deepcopy(parsed)
+
+        entry = self.lookup(message.id)
+
+        if entry is not None:
+            entry[0] = message
+            if parsed is not None:
+                entry[1] = parsed
+            return
+
+        self.entries[int(message.id)] = [message, parsed]
+
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def discard(self, id):
+        """
+        Removes a message if we have it, like when it's edited or deleted
+        """
+
+        self.entries.pop(int(id), None)
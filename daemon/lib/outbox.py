@@ -0,0 +1,128 @@
+"""
+Module for the outbound message queue
+"""
+
+import asyncio
+import collections
+
+LIMIT = 2000
+
+
+class Outbox:
+    """
+    Sends in order per channel, channels in parallel, merging what can be merged
+    """
+
+    def __init__(self, send, size, concurrency, logger):
+
+        self.send = send
+        self.size = size
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.logger = logger
+
+        self.queues = {}
+        self.workers = {}
+        self.space = asyncio.Event()
+        self.depth = 0
+        self.merged = 0
+
+    async def put(self, channel, text, reference=None, merge=True):
+        """
+        Queues a text, waiting if we're full, returning a future for the sent message that fails if sending did
+        """
+
+        while self.depth >= self.size:
+            self.space.clear()
+            await self.space.wait()
+
+        future = asyncio.get_running_loop().create_future()
+
+        self.queues.setdefault(channel.id, collections.deque()).append((channel, text, reference, merge, future))
+        self.depth += 1
+
+        if channel.id not in self.workers:
+            self.workers[channel.id] = asyncio.ensure_future(self.work(channel.id))
+
+        return future
+
+    @staticmethod
+    def mergeable(current, following):
+        """
+        Whether the following text can go out with the current one
+        """
+
+        return (
+            current[3] and following[3] and
+            getattr(current[2], "id", current[2]) == getattr(following[2], "id", following[2]) and
+            len(current[1]) + 1 + len(following[1]) <= LIMIT
+        )
+
+    def take(self, queue):
+        """
+        Takes the next text off a queue, along with whatever adjacent texts merge into it
+        """
+
+        current = queue.popleft()
+        futures = [current[4]]
+        self.depth -= 1
+
+        while queue and self.mergeable(current, queue[0]):
+
+            following = queue.popleft()
+            current = (current[0], f"{current[1]}\n{following[1]}", current[2], True, None)
+            futures.append(following[4])
+
+            self.depth -= 1
+            self.merged += 1
+
+        self.space.set()
+
+        return current[0], current[1], current[2], futures
+
+    @staticmethod
+    def fail(futures, exception):
+        """
+        Fails whoever's waiting, already logged so those not waiting needn't be warned
+        """
+
+        for future in futures:
+            if not future.done():
+                future.set_exception(exception)
+                future.exception()
+
+    async def work(self, key):
+        """
+        Sends everything queued for a channel, one at a time
+        """
+
+        queue = self.queues[key]
+
+        try:
+
+            while queue:
+
+                channel, text, reference, futures = self.take(queue)
+
+                try:
+                    async with self.semaphore:
+                        message = await self.send(channel, text, reference)
+                except Exception as exception: # pylint: disable=broad-except
+                    self.logger.exception("send failed", extra={"send": {"channel": key}})
+                    self.fail(futures, exception)
+                    continue
+
+                for future in futures:
+                    if not future.done():
+                        future.set_result(message)
+
+        finally:
+            del self.workers[key]
+            del self.queues[key]
+
+    async def drain(self):
+        """
+        Waits for everything queued to be sent
+        """
+
+        while self.workers:
+            await asyncio.wait(list(self.workers.values()))
@@ -0,0 +1,202 @@
+"""
+Module for the on demand profiling endpoints on the metrics server
+"""
+
+import io
+import sys
+import time
+import asyncio
+import threading
+import collections
+import tracemalloc
+import urllib.parse
+import wsgiref.simple_server
+
+import prometheus_client.exposition
+
+MAX_SECONDS = 60
+INTERVAL = 0.01
+
+
+def cpu(seconds, interval=INTERVAL):
+    """
+    Samples every thread's stack for a while, returning folded stacks (flamegraph.pl / speedscope ready)
+    """
+
+    me = threading.get_ident()
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    stacks = collections.Counter()
+    end = time.monotonic() + seconds
+
+    while time.monotonic() < end:
+
+        for ident, frame in sys._current_frames().items(): # pylint: disable=protected-access
+
+            if ident == me:
+                continue
+
+            stack = []
+
+            while frame is not None:
+                stack.append(f"{frame.f_code.co_name} ({frame.f_code.co_filename}:{frame.f_lineno})")
+                frame = frame.f_back
+
+            stack.append(names.get(ident, str(ident)))
+
+            stacks[";".join(reversed(stack))] += 1
+
+        time.sleep(interval)
+
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def memory(seconds, limit=50):
+    """
+    Diffs tracemalloc snapshots taken a while apart, tracing only while asked
+    """
+
+    started = not tracemalloc.is_tracing()
+
+    if started:
+        tracemalloc.start(25)
+
+    try:
+
+        before = tracemalloc.take_snapshot()
+        time.sleep(seconds)
+        after = tracemalloc.take_snapshot()
+
+    finally:
+
+        if started:
+            tracemalloc.stop()
+
+    text = ""
+
+    for stat in after.compare_to(before, "traceback")[:limit]:
+        text += f"{stat}\n"
+        for line in stat.traceback.format():
+            text += f"    {line}\n"
+
+    return text
+
+
+def tasks(loop, timeout=5):
+    """
+    Every asyncio task's stack, gathered on the loop itself
+    """
+
+    async def dump():
+
+        text = io.StringIO()
+
+        for task in asyncio.all_tasks():
+            text.write(f"{task!r}\n")
+            task.print_stack(file=text)
+            text.write("\n")
+
+        return text.getvalue()
+
+    return asyncio.run_coroutine_threadsafe(dump(), loop).result(timeout)
+
+
+class ProfilingApp:
+    """
+    Serves profiles under /debug, everything else as metrics
+    """
+
+    def __init__(self, metrics, loop):
+
+        self.metrics = metrics
+        self.loop = loop
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def respond(start_response, status, body, filename=None):
+        """
+        Sends text, as a download if there's a filename
+        """
+
+        headers = [("Content-Type", "text/plain; charset=utf-8")]
+
+        if filename:
+            headers.append(("Content-Disposition", f'attachment; filename="{filename}"'))
+
+        start_response(status, headers)
+
+        return [body.encode("utf-8")]
+
+    def profile(self, path, seconds):
+        """
+        Runs a profile, returning its filename and text
+        """
+
+        if path == "/debug/cpu":
+            return "cpu.folded", cpu(seconds)
+
+        if path == "/debug/memory":
+            return "memory.txt", memory(seconds)
+
+        loop = self.loop()
+
+        if loop is None:
+            raise LookupError("loop not running yet")
+
+        return "tasks.txt", tasks(loop)
+
+    def __call__(self, environ, start_response):
+
+        path = environ.get("PATH_INFO", "")
+
+        if path not in ["/debug/cpu", "/debug/memory", "/debug/tasks"]:
+            return self.metrics(environ, start_response)
+
+        try:
+            seconds = float(urllib.parse.parse_qs(environ.get("QUERY_STRING", "")).get("seconds", ["10"])[0])
+        except ValueError:
+            return self.respond(start_response, "400 Bad Request", "seconds must be a number\n")
+
+        if not 0 < seconds <= MAX_SECONDS:
+            return self.respond(start_response, "400 Bad Request", f"seconds must be over 0 and at most {MAX_SECONDS}\n")
+
+        # One at a time, profiling the profiler helps no one
+
+        if not self.lock.acquire(blocking=False):
+            return self.respond(start_response, "409 Conflict", "already profiling\n")
+
+        try:
+            filename, body = self.profile(path, seconds)
+        except LookupError as exception:
+            return self.respond(start_response, "503 Service Unavailable", f"{exception}\n")
+        finally:
+            self.lock.release()
+
+        return self.respond(start_response, "200 OK", body, filename)
+
+
+class SilentHandler(wsgiref.simple_server.WSGIRequestHandler):
+    """
+    Doesn't log every scrape
+    """
+
+    def log_message(self, format, *args): # pylint: disable=redefined-builtin
+        """
+        Quiet
+        """
+
+
+def start_http_server(port, loop):
+    """
+    Starts the metrics server with profiling as a daemon thread
+    """
+
+    app = ProfilingApp(prometheus_client.make_wsgi_app(), loop)
+
+    httpd = wsgiref.simple_server.make_server(
+        "", port, app, prometheus_client.exposition.ThreadingWSGIServer, handler_class=SilentHandler
+    )
+
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+
+    return httpd
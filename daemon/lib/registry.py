@@ -0,0 +1,164 @@
+"""
+Module for the resident command registry
+"""
+
+import specs
+
+
+class Source:
+    """
+    An App or Origin as far as commands are concerned
+    """
+
+    def __init__(self, kind, id, who, meta):
+
+        self.kind = kind
+        self.id = id
+        self.who = who
+        self.meta = meta or {}
+
+        self.title = self.meta.get("title")
+        self.description = self.meta.get("description")
+        self.help = self.meta.get("help")
+        self.channel = self.meta.get("channel")
+        self.commands = specs.freeze(self.meta.get("commands") or [])
+
+
+class CommandRegistry:
+    """
+    Apps and Origins indexed by id, who, channel and (kind, who, command name)
+    """
+
+    def __init__(self):
+
+        self.sources = {}
+        self.whos = {}
+        self.channels = {}
+        self.commands = {}
+
+    def load(self, kind, models):
+        """
+        Replaces every Source of a kind with a bulk retrieve
+        """
+
+        for key in [key for key in self.sources if key[0] == kind]:
+            self.discard(*key)
+
+        for model in models:
+            self.add(kind, model.id, model.who, model.meta)
+
+    @staticmethod
+    def index(entries, source):
+        """
+        Adds to a list index, keeping id order like the ledger does
+        """
+
+        entries.append(source)
+        entries.sort(key=lambda entry: (entry.kind, entry.id))
+
+    def add(self, kind, id, who, meta):
+        """
+        Adds or replaces a single Source
+        """
+
+        self.discard(kind, id)
+
+        source = Source(kind, id, who, meta)
+
+        self.sources[(kind, id)] = source
+
+        self.index(self.whos.setdefault(who, []), source)
+
+        if source.channel:
+            self.index(self.channels.setdefault(source.channel, []), source)
+
+        for command in source.commands:
+            self.commands.setdefault((kind, who, command["name"]), command)
+
+    def discard(self, kind, id):
+        """
+        Removes a Source if we have it
+        """
+
+        source = self.sources.pop((kind, id), None)
+
+        if source is None:
+            return
+
+        for index, key in [(self.whos, source.who), (self.channels, source.channel)]:
+
+            if source in index.get(key, []):
+
+                index[key].remove(source)
+
+                if not index[key]:
+                    del index[key]
+
+        for command in source.commands:
+            if self.commands.get((source.kind, source.who, command["name"])) is command:
+                del self.commands[(source.kind, source.who, command["name"])]
+
+    def apply(self, kind, what):
+        """
+        Applies a Journal what for an App or Origin
+        """
+
+        after = what.get("after")
+
+        if what["action"] == "delete" or not after:
+            self.discard(kind, what["id"])
+        else:
+            self.add(kind, what["id"], after["who"], after.get("meta"))
+
+    def get(self, kind, id):
+        """
+        Source by kind and id
+        """
+
+        return self.sources.get((kind, id))
+
+    def search(self, kind, who=None, meta__channel=None):
+        """
+        Sources of a kind by who or channel, all of them with neither
+        """
+
+        if who is not None:
+            entries = self.whos.get(who, [])
+        elif meta__channel is not None:
+            entries = self.channels.get(meta__channel, [])
+        else:
+            entries = sorted(self.sources.values(), key=lambda entry: entry.id)
+
+        return [entry for entry in entries if entry.kind == kind]
+
+    def apps(self, **search):
+        """
+        All the Apps matching
+        """
+
+        return self.search("app", **search)
+
+    def app(self, who):
+        """
+        The first App with this who
+        """
+
+        apps = self.search("app", who=who) if who is not None else []
+
+        return apps[0] if apps else None
+
+    def origin(self, **search):
+        """
+        The first Origin matching
+        """
+
+        origins = self.search("origin", **search)
+
+        return origins[0] if origins else None
+
+    def command(self, kind, who, name):
+        """
+        A command by the kind and who it's for and its name
+        """
+
+        return self.commands.get((kind, who, name))
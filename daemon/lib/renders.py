@@ -0,0 +1,50 @@
+"""
+Module for the rendered text cache
+"""
+
+import collections
+
+
+class RenderCache:
+    """
+    Bounded LRU of encoded text chunks by what they were rendered from
+    """
+
+    def __init__(self, size):
+
+        self.size = size
+        self.entries = collections.OrderedDict()
+
+    def __len__(self):
+
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        The chunks, freshened, or None
+        """
+
+        chunks = self.entries.get(key)
+
+        if chunks is not None:
+            self.entries.move_to_end(key)
+
+        return chunks
+
+    def add(self, key, chunks):
+        """
+        Stores chunks, evicting the least recently used
+        """
+
+        self.entries[key] = tuple(chunks)
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Forgets everything, for when what it's rendered from has changed
+        """
+
+        self.entries.clear()
@@ -0,0 +1,227 @@
+"""
+Module for evaluating Award and Task fact predicates locally
+"""
+
+import collections
+import collections.abc
+
+import overscore
+import relations
+
+OPERATORS = relations.Field.OPERATORS
+
+
+class Predicate:
+    """
+    Overscore criteria (what__command, what__channel__not_eq, ...) compiled to check a Fact dict
+    """
+
+    def __init__(self, criteria):
+
+        self.conditions = []
+
+        for key, satisfy in (criteria or {}).items():
+            self.conditions.append(self.condition(key, satisfy))
+
+    @staticmethod
+    def condition(key, satisfy):
+        """
+        Compiles one criterion the way the Ledger reads it
+        """
+
+        field, criterion = key.split("__", 1) if "__" in key else (key, "eq")
+
+        path = overscore.parse(criterion)
+
+        if isinstance(path[-1], str) and path[-1].split("not_", 1)[-1] in OPERATORS:
+            operator = path.pop(-1)
+        else:
+            operator = "eq"
+
+        invert = operator.startswith("not_")
+        operator = operator.split("not_", 1)[-1]
+
+        if satisfy is None and operator == "eq":
+            operator, satisfy = "null", True
+
+        if OPERATORS[operator] and not isinstance(satisfy, (set, list, tuple)):
+            satisfy = [satisfy]
+
+        return (field, tuple(path), operator, invert, satisfy)
+
+    def index(self):
+        """
+        The (field, path, value) that best narrows down what this could match, if any
+        """
+
+        keys = [
+            (field, path, satisfy)
+            for field, path, operator, invert, satisfy in self.conditions
+            if operator == "eq" and not invert and isinstance(satisfy, collections.abc.Hashable)
+        ]
+
+        keys.sort(key=lambda key: key[:2] != ("what", ("command",)))
+
+        return keys[0] if keys else None
+
+    @staticmethod
+    def compare(operator, value, satisfy):
+        """
+        Orders the way the Ledger does, except what can't be ordered just doesn't match
+        """
+
+        try:
+            if operator == "gt":
+                return value > satisfy
+            if operator == "gte":
+                return value >= satisfy
+            if operator == "lt":
+                return value < satisfy
+            return value <= satisfy
+        except TypeError:
+            return False
+
+    def __call__(self, values): # pylint: disable=too-many-branches
+
+        for field, path, operator, invert, satisfy in self.conditions:
+
+            value = overscore.get(values.get(field) or {}, list(path)) if path else values.get(field)
+
+            if operator == "null":
+                condition = satisfy == (value is None)
+            elif value is None:
+                condition = False
+            elif operator == "eq":
+                condition = value == satisfy
+            elif operator == "in":
+                condition = value in satisfy
+            elif operator in ["gt", "gte", "lt", "lte"]:
+                condition = self.compare(operator, value, satisfy)
+            elif operator == "like":
+                condition = str(satisfy).lower() in str(value).lower()
+            elif operator == "start":
+                condition = str(value).lower().startswith(str(satisfy).lower())
+            elif operator == "end":
+                condition = str(value).lower().endswith(str(satisfy).lower())
+            elif operator == "has":
+                condition = all(item in value for item in satisfy)
+            elif operator == "any":
+                condition = any(item in value for item in satisfy)
+            else:
+                condition = all(item in value for item in satisfy) and len(value) == len(satisfy)
+
+            if invert:
+                condition = not condition
+
+            if not condition:
+                return False
+
+        return True
+
+
+class RuleIndex:
+    """
+    Open Awards or Tasks with fact predicates, indexed so a Fact only checks the ones it could match
+    """
+
+    def __init__(self, statuses):
+
+        self.statuses = statuses
+
+        self.rules = {}
+        self.index = collections.defaultdict(set)
+        self.unindexed = collections.defaultdict(set)
+        self.keys = collections.Counter()
+
+    def load(self, records):
+        """
+        Loads exported Award or Task records
+        """
+
+        self.rules = {}
+        self.index = collections.defaultdict(set)
+        self.unindexed = collections.defaultdict(set)
+        self.keys = collections.Counter()
+
+        for record in records:
+            self.add(record)
+
+    def add(self, record):
+        """
+        Adds an exported record if it's open and has a predicate
+        """
+
+        self.discard(record["id"])
+
+        fact = (record.get("what") or {}).get("fact")
+
+        if record.get("status") not in self.statuses or not fact:
+            return
+
+        predicate = Predicate(fact)
+        key = predicate.index()
+
+        self.rules[record["id"]] = (record, predicate, key)
+
+        if key is None:
+            self.unindexed[record["entity_id"]].add(record["id"])
+        else:
+            self.index[(record["entity_id"], *key)].add(record["id"])
+            self.keys[key[:2]] += 1
+
+    def discard(self, id):
+        """
+        Removes a record, if we have it
+        """
+
+        if id not in self.rules:
+            return
+
+        record, _, key = self.rules.pop(id)
+
+        if key is None:
+            bucket, place = self.unindexed, record["entity_id"]
+        else:
+            bucket, place = self.index, (record["entity_id"], *key)
+
+            self.keys[key[:2]] -= 1
+            if not self.keys[key[:2]]:
+                del self.keys[key[:2]]
+
+        bucket[place].discard(id)
+
+        if not bucket[place]:
+            del bucket[place]
+
+    def apply(self, what):
+        """
+        Applies a Journal what for an Award or Task
+        """
+
+        after = what.get("after")
+
+        if what["action"] != "delete" and after:
+            self.add({**after, "id": what["id"]})
+        else:
+            self.discard(what["id"])
+
+    def match(self, fact):
+        """
+        Records whose predicates an exported Fact satisfies
+        """
+
+        entity_id = fact.get("entity_id")
+        ids = set(self.unindexed.get(entity_id, ()))
+
+        for field, path in self.keys:
+
+            value = overscore.get(fact.get(field) or {}, list(path)) if path else fact.get(field)
+
+            if isinstance(value, collections.abc.Hashable):
+                ids.update(self.index.get((entity_id, field, path, value), ()))
+
+        return [self.rules[id][0] for id in sorted(ids) if self.rules[id][1](fact)]
+
+    def __len__(self):
+
+        return len(self.rules)
@@ -14,12 +14,52 @@ import relations_rest
 
 import prometheus_client
 
+import profiling
+
 import unum_ledger
 import unum_discord
 
+# Summaries for the facts_written_count and acts_read_count series dashboards already use
+
 FACTS = prometheus_client.Summary("facts_written", "Facts written")
 ACTS = prometheus_client.Summary("acts_read", "Acts read")
 
+STAGE_LATENCY = prometheus_client.Histogram(
+    "stage_seconds", "Time spent in each pipeline stage", ["stage", "command", "usage"]
+)
+LEDGER_LATENCY = prometheus_client.Histogram(
+    "ledger_call_seconds", "Time for a Ledger call, waiting for the pool included", ["model", "operation"]
+)
+
+LOOP_LAG = prometheus_client.Histogram(
+    "loop_lag_seconds", "How late the event loop wakes up a sleeping task",
+    buckets=(.001, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+)
+LEDGER_INFLIGHT = prometheus_client.Gauge("ledger_calls_inflight", "Ledger calls running or waiting in the pool")
+ACTS_INFLIGHT = prometheus_client.Gauge("acts_inflight", "Acts being performed")
+ACTS_QUEUED = prometheus_client.Gauge("acts_queued", "Acts read and waiting their turn or a worker")
+ACTS_RECOVERED = prometheus_client.Counter("acts_recovered", "Acts claimed back after being left pending")
+ACTS_DEAD = prometheus_client.Counter("acts_dead", "Acts moved to the dead letter stream")
+INGEST_DEPTH = prometheus_client.Gauge("ingest_depth", "Events waiting for a worker", ["kind"])
+INGEST_WAIT = prometheus_client.Histogram("ingest_wait_seconds", "Time events waited for a worker", ["kind"])
+INGEST_SHED = prometheus_client.Counter("ingest_shed", "Events dropped because we were full", ["kind"])
+OUTBOX_DEPTH = prometheus_client.Gauge("outbox_depth", "Messages queued to send")
+SEND_LATENCY = prometheus_client.Histogram("send_seconds", "Time for Discord to take a message, rate limits included")
+SEND_RATELIMITS = prometheus_client.Counter("send_ratelimits", "429s from Discord")
+MESSAGE_CACHE = prometheus_client.Counter("message_cache_lookups", "Message cache lookups", ["kind", "result"])
+TARGET_CACHE = prometheus_client.Counter("target_cache_lookups", "Act target lookups in the gateway cache", ["kind", "result"])
+EVENT_DEDUP = prometheus_client.Counter("event_dedup", "Message and reaction dedup checks by what they found", ["result"])
+STATUS_CACHE = prometheus_client.Counter("status_cache_lookups", "Entity and Herald active lookups", ["kind", "result"])
+HELP_CACHE = prometheus_client.Counter("help_cache_lookups", "Rendered help lookups", ["result"])
+JOURNAL_FLUSH_SIZE = prometheus_client.Histogram(
+    "journal_flush_size", "Journal entries written per flush",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500)
+)
+JOURNAL_FLUSH_LATENCY = prometheus_client.Histogram("journal_flush_seconds", "Time to write and publish a Journal flush")
+JOURNAL_LAG = prometheus_client.Gauge("journal_lag", "Journal entries not yet applied to local read models")
+JOURNAL_DELAY = prometheus_client.Gauge("journal_delay_seconds", "How old the last Journal entry applied was")
+STARTUP_LATENCY = prometheus_client.Gauge("startup_seconds", "Time each startup phase took", ["phase"])
+
 WHO = "discord"
 META = """
 title: the Discord Origin
@@ -222,6 +262,24 @@ class Daemon(): # pylint: disable=too-few-public-methods
         self.group_id = os.environ["K8S_POD"]
 
         self.sleep = int(os.environ.get("SLEEP", 5))
+        self.profiling = os.environ.get("PROFILING", "false").lower() == "true"
+        self.loop = None
+        self.ledger_workers = int(os.environ.get("LEDGER_WORKERS", 8))
+        self.message_cache_size = int(os.environ.get("MESSAGE_CACHE_SIZE", 10000))
+        self.help_cache_size = int(os.environ.get("HELP_CACHE_SIZE", 1000))
+        self.act_concurrency = int(os.environ.get("ACT_CONCURRENCY", 8))
+        self.act_batch = int(os.environ.get("ACT_BATCH", 10))
+        self.act_idle = int(os.environ.get("ACT_IDLE", 60))
+        self.act_deliveries = int(os.environ.get("ACT_DELIVERIES", 5))
+        self.outbox_size = int(os.environ.get("OUTBOX_SIZE", 1000))
+        self.page_size = int(os.environ.get("PAGE_SIZE", 10))
+        self.send_concurrency = int(os.environ.get("SEND_CONCURRENCY", 5))
+        self.dedup_ttl = int(os.environ.get("DEDUP_TTL", 86400))
+        self.dedup_size = int(os.environ.get("DEDUP_SIZE", 100000))
+        self.ingest_size = int(os.environ.get("INGEST_SIZE", 1000))
+        self.ingest_workers = int(os.environ.get("INGEST_WORKERS", 16))
+        self.status_ttl = int(os.environ.get("STATUS_TTL", 300))
+        self.journal_idle = int(os.environ.get("JOURNAL_IDLE", 3600))
 
         self.logger = micro_logger.getLogger(self.name)
 
@@ -237,6 +295,9 @@ class Daemon(): # pylint: disable=too-few-public-methods
         Main loop with sleep
         """
 
-        prometheus_client.start_http_server(80)
+        if self.profiling:
+            profiling.start_http_server(80, lambda: self.loop)
+        else:
+            prometheus_client.start_http_server(80)
 
         unum_discord.run(self)
@@ -0,0 +1,43 @@
+"""
+Module for immutable command specs
+"""
+
+import types
+import collections.abc
+
+
+def freeze(value):
+    """
+    Makes a read only copy of a spec, shareable across messages
+    """
+
+    if isinstance(value, collections.abc.Mapping):
+        return types.MappingProxyType({key: freeze(item) for key, item in value.items()})
+
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+
+    return value
+
+
+def thaw(value, title=None):
+    """
+    Makes a plain copy of a spec, adding the title to descriptions that aren't private
+    """
+
+    if isinstance(value, collections.abc.Mapping):
+
+        thawed = {}
+
+        for key, item in value.items():
+            if title is not None and key == "description" and value.get("kind") != "private":
+                thawed[key] = item + title
+            else:
+                thawed[key] = thaw(item, title)
+
+        return thawed
+
+    if isinstance(value, (list, tuple)):
+        return [thaw(item, title) for item in value]
+
+    return value
@@ -0,0 +1,112 @@
+"""
+Module for the Entity status and Herald membership cache
+"""
+
+import time
+
+
+class StatusCache:
+    """
+    Whether Entities and their Heralds are active, from bulk loads and the Journal, trusted for a while
+    """
+
+    def __init__(self, ttl, clock=time.monotonic):
+
+        self.ttl = ttl
+        self.clock = clock
+
+        self.entities = {}
+        self.heralds = {}
+
+    def __len__(self):
+
+        return len(self.entities) + len(self.heralds)
+
+    def fresh(self, entries, key):
+        """
+        Whether active, None if we don't know or knew too long ago
+        """
+
+        entry = entries.get(key)
+
+        if entry is None:
+            return None
+
+        active, at = entry
+
+        if self.clock() - at > self.ttl:
+            del entries[key]
+            return None
+
+        return active
+
+    def load(self, entities, heralds):
+        """
+        Replaces everything with bulk retrieves
+        """
+
+        now = self.clock()
+
+        self.entities = {}
+        self.heralds = {}
+
+        for entity in entities:
+            self.entities[entity.id] = (entity.status == "active", now)
+
+        for herald in heralds:
+            self.heralds[(herald.entity_id, herald.app_id)] = (herald.status == "active", now)
+
+    def entity(self, entity_id):
+        """
+        Whether an Entity's active, None if unknown
+        """
+
+        return self.fresh(self.entities, entity_id)
+
+    def herald(self, entity_id, app_id):
+        """
+        Whether an Entity's active in an App, None if unknown
+        """
+
+        return self.fresh(self.heralds, (entity_id, app_id))
+
+    def set_entity(self, entity_id, active):
+        """
+        Remembers what the Ledger said about an Entity
+        """
+
+        self.entities[entity_id] = (active, self.clock())
+
+    def set_herald(self, entity_id, app_id, active):
+        """
+        Remembers what the Ledger said about a Herald
+        """
+
+        self.heralds[(entity_id, app_id)] = (active, self.clock())
+
+    def apply_entity(self, what):
+        """
+        Applies a Journal what for an Entity
+        """
+
+        after = what.get("after")
+
+        if what["action"] == "delete" or not after:
+            self.entities.pop(what["id"], None)
+        else:
+            self.set_entity(what["id"], after.get("status") == "active")
+
+    def apply_herald(self, what):
+        """
+        Applies a Journal what for a Herald
+        """
+
+        record = what.get("after") or what.get("before")
+
+        if not record:
+            return
+
+        if what["action"] == "delete":
+            self.heralds.pop((record["entity_id"], record["app_id"]), None)
+        else:
+            self.set_herald(record["entity_id"], record["app_id"], record.get("status") == "active")
@@ -4,21 +4,40 @@ Handles everything for the Discord Origin
 
 # pylint: disable=unsupported-membership-test,too-many-lines,no-self-use,undefined-loop-variable,unused-argument,too-many-locals,len-as-condition,too-many-branches,too-many-statements,unused-variable,assigning-non-slot,too-many-nested-blocks,invalid-overridden-method,too-many-return-statements,redefined-outer-name,too-many-public-methods,line-too-long,redefined-argument-from-local
 
+import re
 import time
-import copy
 import json
+import hashlib
+import asyncio
+import logging
+import functools
+import contextlib
+import concurrent.futures
 import yaml
 
 from emoji import EMOJI_DATA
 import discord
 import discord.abc
-import discord.utils
 
 import overscore
 
+import acts
+import codec
+import dedup
+import ingest
+import journal
+import messages
+import outbox
+import registry
+import renders
+import rules
 import service
+import specs
+import statuses
 import unum_base
 import unum_ledger
+import usage
+import witnesses
 
 FORMATS = [
     {
@@ -67,6 +86,84 @@ AWARDS = {
     "excepted": "❗"
 }
 
+PAGES = {
+    "⬅": -1,
+    "➡": 1
+}
+
+PAGE = re.compile(r"\*page (\d+)\* - ⬅")
+
+AWARDS_OPEN = ["requested", "accepted"]
+TASKS_OPEN = ["blocked", "inprogress"]
+
+LAG_INTERVAL = 0.5
+JOURNAL_MEASURE = 5
+
+
+def stage_labels(args, kwargs, result):
+    """
+    Command and usage of whatever what a stage was handling, blank if none
+    """
+
+    for candidate in [kwargs.get("what"), *args, result[0] if isinstance(result, tuple) and result else None]:
+
+        if not isinstance(candidate, dict):
+            continue
+
+        what = candidate["what"] if isinstance(candidate.get("what"), dict) else candidate
+
+        # Only found commands have a usage, so user typos don't become labels
+
+        if what.get("usage"):
+            return str(what.get("command", "")), str(what["usage"])
+
+    return "", ""
+
+
+def meta_hash(meta):
+    """
+    Fingerprints meta so unchanged meta needn't be written again
+    """
+
+    return hashlib.sha256(json.dumps(meta, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def timed(stage):
+    """
+    Times a coroutine method as a pipeline stage
+    """
+
+    def decorator(method):
+
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+
+            start = time.time()
+            result = None
+
+            try:
+                result = await method(self, *args, **kwargs)
+                return result
+            finally:
+                service.STAGE_LATENCY.labels(stage, *stage_labels(args, kwargs, result)).observe(time.time() - start)
+
+        return wrapper
+
+    return decorator
+
+
+class RateLimits(logging.Filter): # pylint: disable=too-few-public-methods
+    """
+    Counts the 429s discord.py waits out for us
+    """
+
+    def filter(self, record):
+
+        if str(record.msg).startswith("We are being rate limited"):
+            service.SEND_RATELIMITS.inc()
+
+        return True
+
 class OriginClient(discord.Client, unum_base.OriginSource):
     """
     Discord Client to handel the Discord origin
@@ -76,10 +173,17 @@ class OriginClient(discord.Client, unum_base.OriginSource):
     redis = None
     origin = None
     pool = None
-    apps = None
-    orgins = None
-    witness_entity_ids = None
-    witness_user_ids = None
+    witnesses = None
+    codec = None
+    registry = None
+    matchers = None
+    messages = None
+    journal = None
+    awards = None
+    tasks = None
+    outbox = None
+    helps = None
+    acts = None
 
     def __init__(self, *args, daemon, **kwargs):
 
@@ -90,7 +194,99 @@ class OriginClient(discord.Client, unum_base.OriginSource):
         self.group = daemon.group
         self.group_id = daemon.group_id
         self.guild = daemon.creds["guild"]
+        self.daemon = daemon
+        self.started = None
+
+        self.witnesses = witnesses.WitnessMap()
+        self.codec = codec.TextCodec(self.witnesses)
+        self.registry = registry.CommandRegistry()
+        self.awards = rules.RuleIndex(AWARDS_OPEN)
+        self.tasks = rules.RuleIndex(TASKS_OPEN)
+        self.statuses = statuses.StatusCache(daemon.status_ttl)
+        self.matchers = {}
+        self.messages = messages.MessageCache(daemon.message_cache_size)
+        self.helps = renders.RenderCache(daemon.help_cache_size)
+        self.journal = journal.JournalWriter(self.write_journals)
+
+        # Caches are per process, so every pod reads the whole Journal in its own group
+
+        self.reader = journal.JournalReader(
+            self.redis, f"{self.group}/{self.group_id}", self.group_id, self.logger, reload=self.load_models
+        )
+        self.reader.register(unum_ledger.Witness.NAME, self.witnesses.apply)
+        self.reader.register(unum_ledger.App.NAME, lambda what: self.registry.apply("app", what))
+        self.reader.register(unum_ledger.App.NAME, lambda what: self.helps.clear())
+        self.reader.register(unum_ledger.Origin.NAME, lambda what: self.registry.apply("origin", what))
+        self.reader.register(unum_ledger.Origin.NAME, lambda what: self.helps.clear())
+        self.reader.register(unum_ledger.Award.NAME, self.awards.apply)
+        self.reader.register(unum_ledger.Task.NAME, self.tasks.apply)
+        self.reader.register(unum_ledger.Entity.NAME, self.statuses.apply_entity)
+        self.reader.register(unum_ledger.Herald.NAME, self.statuses.apply_herald)
+        service.JOURNAL_LAG.set_function(lambda: self.reader.lag)
+        service.JOURNAL_DELAY.set_function(lambda: self.reader.delay)
+        self.journal_idle = daemon.journal_idle
+
+        self.page_size = daemon.page_size
+        self.act_batch = daemon.act_batch
+        self.act_idle = daemon.act_idle
+        self.act_deliveries = daemon.act_deliveries
+        self.acts = acts.ActConsumer(
+            self.do_act, daemon.act_concurrency, daemon.act_batch + daemon.act_concurrency, self.logger
+        )
+        service.ACTS_INFLIGHT.set_function(lambda: self.acts.inflight)
+        service.ACTS_QUEUED.set_function(lambda: self.acts.queued)
+
+        self.ingest = ingest.Ingest(
+            daemon.ingest_size, daemon.ingest_workers, self.logger,
+            waited=lambda kind, seconds: service.INGEST_WAIT.labels(kind).observe(seconds),
+            shed=lambda kind: service.INGEST_SHED.labels(kind).inc()
+        )
+        for kind in ingest.KINDS:
+            service.INGEST_DEPTH.labels(kind).set_function(lambda kind=kind: len(self.ingest.queues[kind]))
+
+        self.dedup = dedup.Dedup(self.redis, daemon.dedup_ttl, daemon.dedup_size)
+        self.outbox = outbox.Outbox(self.send_text, daemon.outbox_size, daemon.send_concurrency, self.logger)
+        service.OUTBOX_DEPTH.set_function(lambda: self.outbox.depth)
+
+        self.pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=daemon.ledger_workers,
+            thread_name_prefix="ledger"
+        )
+
+    async def ledger(self, call, *args, **kwargs):
+        """
+        Runs a blocking ledger call in the pool so the loop keeps going
+        """
+
+        owner = getattr(call, "__self__", None)
+        start = time.time()
+
+        service.LEDGER_INFLIGHT.inc()
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.pool, functools.partial(call, *args, **kwargs)
+            )
+        finally:
+            service.LEDGER_INFLIGHT.dec()
+            service.LEDGER_LATENCY.labels(
+                getattr(owner, "NAME", type(owner).__name__), getattr(call, "__name__", "call")
+            ).observe(time.time() - start)
+
+    async def on_lag(self):
+        """
+        Measures how late the loop is in waking us up
+        """
+
+        loop = asyncio.get_running_loop()
+
+        while True:
 
+            start = loop.time()
+            await asyncio.sleep(LAG_INTERVAL)
+            service.LOOP_LAG.observe(max(0, loop.time() - start - LAG_INTERVAL))
+
+    @timed("journal_change")
     async def journal_change(
             self,
             action,
@@ -111,7 +307,7 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
         if action == "create":
 
-            model = model.create()
+            model = await self.ledger(model.create)
             what["after"] = model.export()
 
         who += f":{model.id}"
@@ -134,74 +330,132 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
             what["after"] = model.export()
 
-            create = model.update()
+            create = await self.ledger(model.update)
 
         elif action == "delete":
 
             what["before"] = model.export()
 
-            create = model.delete()
+            create = await self.ledger(model.delete)
 
         if create:
-            journal = unum_ledger.Journal(
-                who=who,
-                what=what,
-                when=time.time()
-            ).create()
+            self.apply_journal(what)
 
-            self.logger.info("journal", extra={"journal": {"id": journal.id}})
-            await self.redis.xadd("ledger/journal", fields={"journal": json.dumps(journal.export())})
+            await self.journal.add({
+                "who": who,
+                "what": what,
+                "when": time.time()
+            })
 
         if action == "create":
             return model
 
         return create
 
-    def decode_text(self, text):
+    async def write_journals(self, entries):
         """
-        Take Discord text and makes it Unum friendly
+        Creates Journals in bulk and pipelines them to the stream
         """
 
-        cleaned = text
+        start = time.time()
 
-        for witness in unum_ledger.Witness.many(origin_id=self.origin.id):
-            encode_text = f"<@{witness.who}>"
-            decode_text = f"{{entity:{witness.entity_id}}}"
+        journals = await self.ledger(unum_ledger.Journal(entries).create)
 
-            if encode_text in cleaned:
-                cleaned = cleaned.replace(encode_text, decode_text)
+        pipeline = self.redis.pipeline(transaction=False)
 
-        for channel in self.get_all_channels():
-            encode_text = f"<#{channel.id}>"
-            decode_text = f"{{channel:{channel.name}}}"
+        for journal in journals:
+            self.logger.info("journal", extra={"journal": {"id": journal.id}})
+            pipeline.xadd("ledger/journal", fields={"journal": json.dumps(journal.export())})
 
-            if encode_text in cleaned:
-                cleaned = cleaned.replace(encode_text, decode_text)
+        await pipeline.execute()
 
-        return cleaned
+        service.JOURNAL_FLUSH_SIZE.observe(len(entries))
+        service.JOURNAL_FLUSH_LATENCY.observe(time.time() - start)
 
-    def encode_text(self, text):
+    def apply_journal(self, what):
         """
-        Take Unum text and makes it Discord friendly
+        Keeps local models current with a Journal what, ours right away rather than when read back
+        """
+
+        self.reader.apply(what)
+
+    async def active(self, entity_id):
+        """
+        Whether an Entity's active, from the cache, from the Ledger only if we have to
+        """
+
+        if entity_id is None:
+            return False
+
+        active = self.statuses.entity(entity_id)
+
+        if active is not None:
+            service.STATUS_CACHE.labels("entity", "hit").inc()
+            return active
+
+        service.STATUS_CACHE.labels("entity", "miss").inc()
+
+        active = bool(await self.ledger(self.is_active, entity_id))
+        self.statuses.set_entity(entity_id, active)
+
+        return active
+
+    async def heralded(self, entity_id, app_id):
+        """
+        Whether an Entity's active in an App, from the cache, from the Ledger only if we have to
         """
 
-        cleaned = text
+        active = self.statuses.herald(entity_id, app_id)
 
-        for witness in unum_ledger.Witness.many(origin_id=self.origin.id):
-            encode_text = f"<@{witness.who}>"
-            decode_text = f"{{entity:{witness.entity_id}}}"
+        if active is not None:
+            service.STATUS_CACHE.labels("herald", "hit").inc()
+            return active
 
-            if decode_text in cleaned:
-                cleaned = cleaned.replace(decode_text, encode_text)
+        service.STATUS_CACHE.labels("herald", "miss").inc()
 
-        for channel in self.get_all_channels():
-            encode_text = f"<#{channel.id}>"
-            decode_text = f"{{channel:{channel.name}}}"
+        active = await self.ledger(unum_ledger.Herald.one(
+            entity_id=entity_id,
+            app_id=app_id,
+            status="active"
+        ).retrieve, False) is not None
+        self.statuses.set_herald(entity_id, app_id, active)
+
+        return active
+
+    async def on_journal(self):
+        """
+        Listens for Journal entries, ours and everyone else's, measuring how far behind we are
+        """
+
+        measured = 0
+
+        while True:
+
+            try:
+
+                await self.reader.read(count=100, block=500)
+
+                if time.time() - measured >= JOURNAL_MEASURE:
+                    await self.reader.measure()
+                    measured = time.time()
+
+            except Exception: # pylint: disable=broad-except
+                self.logger.exception("journal read failed")
+                await asyncio.sleep(1)
+
+    def decode_text(self, text):
+        """
+        Take Discord text and makes it Unum friendly
+        """
+
+        return self.codec.decode(text)
 
-            if decode_text in cleaned:
-                cleaned = cleaned.replace(decode_text, encode_text)
+    def encode_text(self, text):
+        """
+        Take Unum text and makes it Discord friendly
+        """
 
-        return cleaned
+        return self.codec.encode(text)
 
     def parse_user(self, user):
         """
@@ -233,10 +487,10 @@ class OriginClient(discord.Client, unum_base.OriginSource):
         Converts a channel info to a standard dict
         """
 
-        witness = unum_ledger.Witness.one(who=message.author.id).retrieve(False)
+        entity_id = self.witnesses.entity_id(message.author.id)
 
-        if witness:
-            what["entity_id"] = witness.entity_id
+        if entity_id is not None:
+            what["entity_id"] = entity_id
         elif message.author.id == self.user.id:
             what["self"] = True
 
@@ -255,153 +509,30 @@ class OriginClient(discord.Client, unum_base.OriginSource):
                 "name": message.guild.name,
             }
 
-    def parse_usage(self, what, command, text):
+    def matcher(self, command, source=None):
         """
-        Parse the args of the command
+        Compiles a command's usages once, again only if they change
         """
 
-        invalid = []
-
-        for usage in command["usages"]:
-
-            current = text
-            args = usage.get("args", [])
-            usage["values"] = values = {}
-            usage["errors"] = errors = {}
-
-            if what['meme'] != usage['meme']:
-                usage["error"] = F"wrong usage - try {usage['meme']}{command['name']}"
-                invalid.append(usage)
-                continue
-
-            if not args and current:
-                usage["error"] = "less args than text"
-                invalid.append(usage)
-                continue
-
-            for arg in args:
-
-                name = arg["name"]
+        key = (source, command["name"])
+        matcher = self.matchers.get(key)
 
-                if not current:
-                    errors[name] = "missing value"
-                    invalid.append(usage)
-                    break
+        if matcher is None or matcher.usages is not command["usages"]:
+            matcher = self.matchers[key] = usage.UsageMatcher(command, self.decode_time)
 
-                format = arg.get("format", "word")
-                pieces = current.split(maxsplit=1)
-                piece = pieces.pop(0)
+        return matcher
 
-                if format == "word":
-                    if not arg.get("valids"):
-                        values[name] = piece
-                    else:
-                        if arg["valids"] and isinstance(arg["valids"][0], dict):
-                            options = [list(valid.keys())[0] for valid in arg["valids"]]
-                        else:
-                            options = arg["valids"]
-
-                        if piece in options:
-                            values[name] = piece
-                        else:
-                            valids = ', '.join(options)
-                            errors[name] = f"{piece} is not in {valids}"
-                elif format == "remainder":
-                    if current:
-                        values[name] = current
-                        current = ""
-                        pieces = []
-                    else:
-                        errors[name] = "nothing remaining"
-                elif format == "emoji":
-                    if piece in EMOJI_DATA:
-                        values[name] = piece
-                    else:
-                        errors[name] = f"{pieces} is not a single emoji"
-                elif format == "duration":
-                    seconds = self.decode_time(piece)
-                    if seconds:
-                        values[name] = seconds
-                    else:
-                        errors[name] = f"{piece} is not in duration format, ie 3d2h1m = 3 days 2 hours 1 min"
-                elif format == "user":
-                    if piece.startswith("{entity:") and piece.endswith("}"):
-                        values[name] = int(piece[1:-1].split(":")[-1])
-                    elif piece.startswith("<@") and piece.endswith(">"):
-                        errors[name] = f"{piece} hasn't joined"
-                    else:
-                        errors[name] = f"{piece} is not a user"
-
-                current = pieces.pop(0) if pieces else ""
-
-            if current:
-                usage["error"] = "more text than args"
-                invalid.append(usage)
-            elif errors:
-                invalid.append(usage)
-
-        # Sort remainders by number of args. The one that matches with
-        # the most args is the best match since remainder can catch
-        # anything.
-
-        remainders = sorted([usage for usage in command["usages"] if
-            usage not in invalid and
-            usage.get("args") and
-            usage["args"][-1].get("format") == "remainder"
-        ], key=lambda usage: len(usage["args"]), reverse=True)
-
-        valid = [usage for usage in command["usages"] if usage not in invalid and usage not in remainders]
-
-        # If we can one valid, that's it
-
-        if len(valid) == 1:
-            what["usage"] = valid[0]["name"]
-            what["values"] = valid[0]["values"]
-
-        # if there's one remainder, or if there more than one remainder and
-        # the top one has more args than the nex, that's it
-
-        elif len(remainders) == 1 or (
-            len(remainders) > 1 and len(remainders[0]["args"]) > len(remainders[1]["args"])
-        ):
-            what["usage"] = remainders[0]["name"]
-            what["values"] = remainders[0]["values"]
-
-        # Nope, too many good ones
-
-        elif len(valid) > 1 or len(remainders):
-            valids = " and ".join([usage["name"] for usage in valid + remainders])
-            what["error"] = f"too many valid usages: {valids}"
-        elif len(invalid):
-            closest = sorted(invalid, key=lambda close: len(close.get("errors", [])))[0]
-            what["usage"] = closest["name"]
-            if "args" in usage:
-                what["args"] = usage["args"]
-            if "error" in usage:
-                what["error"] = usage["error"]
-            if "errors" in usage:
-                what["errors"] = usage["errors"]
-        else:
-            what["error"] = "no usage found"
-
-        return "error" not in what
-
-    def encode_title(self, what, title):
+    def parse_usage(self, what, command, text, valids=None, source=None):
         """
-        Adds title to all descriptions
+        Parse the args of the command
         """
 
-        if isinstance(what, dict):
-            for key, value in what.items():
-                if key == "description" and what.get("kind") != "private":
-                    what[key] += title
-                else:
-                    self.encode_title(what[key], title)
-        elif isinstance(what, list):
-            for value in what:
-                self.encode_title(value, title)
+        what.update(self.matcher(command, source).match(what["meme"], text, valids))
+
+        return "error" not in what
 
-    def parse_command(self, what):
+    @timed("parse_command")
+    async def parse_command(self, what):
         """
         Add command info to the dicts
         """
@@ -468,7 +599,7 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
         # Data structures multiple apps and a single origin
 
-        commands = []
+        sources = []
         what["apps"] = []
         titles = []
         descriptions = []
@@ -477,25 +608,25 @@ class OriginClient(discord.Client, unum_base.OriginSource):
         # Find all Apps that could apply. This could be all of them
         # if we're in a proivate chat
 
-        for app in unum_ledger.App.many(**search):
+        for app in self.registry.apps(**search):
             what["apps"].append(app.who)
-            commands.extend([{**command, "source": app.who} for command in app.meta__commands])
-            titles .append(app.meta__title)
-            descriptions.append(app.meta__description)
-            helps.append(app.meta__help)
+            sources.append(app)
+            titles .append(app.title)
+            descriptions.append(app.description)
+            helps.append(app.help)
 
         # If there's search criteria, find a single Origin
 
         if search:
-            origin = unum_ledger.Origin.one(**search).retrieve(False)
+            origin = self.registry.origin(**search)
 
             if origin:
                 what["origin"] = origin.who
                 if origin.id != self.origin.id:
-                    commands.extend([{**command, "source": origin.who} for command in origin.meta__commands])
-                titles.append(origin.meta__title)
-                descriptions.append(origin.meta__description)
-                helps.append(origin.meta__help)
+                    sources.append(origin)
+                titles.append(origin.title)
+                descriptions.append(origin.description)
+                helps.append(origin.help)
 
         # If we have an id, there's notjhing more to search for
 
@@ -504,7 +635,7 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
         # If nothing to search
 
-        if not commands:
+        if not any(source.commands for source in sources):
             what["error"] = f"No Apps or Origin here - try `?help` in {{channel:{self.origin.meta__channel}}}"
             return
 
@@ -515,33 +646,29 @@ class OriginClient(discord.Client, unum_base.OriginSource):
         # If we're public, add help, join, and leave. This means using these commands in
         # shared channel will simultaneously join/leave all at once.
 
-        if kind == "public":
+        # The specs are frozen and shared, so the title is only added when rendering help
 
-            commands = self.origin.meta__commands + commands
+        if kind == "public":
 
-            self.encode_title(commands[0], title)
-            self.encode_title(commands[1], title)
-            self.encode_title(commands[2], title)
-            self.encode_title(commands[3], title)
-            self.encode_title(commands[4], title)
-            self.encode_title(commands[5], title)
+            common = self.registry.get("origin", self.origin.id).commands
 
         # If we're private, just add help
 
         elif kind == "private":
 
-            commands.insert(0, self.origin.meta__commands[0])
-            commands.insert(1, self.origin.meta__commands[1])
-            commands.insert(2, self.origin.meta__commands[2])
-            commands.insert(3, self.origin.meta__commands[3])
-            self.encode_title(commands[0], title)
-            self.encode_title(commands[1], title)
-            self.encode_title(commands[2], title)
-            self.encode_title(commands[3], title)
+            common = self.registry.get("origin", self.origin.id).commands[:4]
+
+        # Match by name alone for now, straight from the index. Common
+        # commands have no source.
+
+        found = [(None, command) for command in common if name == command["name"]]
 
-        # Match by name alone for now
+        for source in sources:
 
-        found = [command for command in commands if name == command["name"]]
+            command = self.registry.command(source.kind, source.who, name)
+
+            if command:
+                found.append((source.who, command))
 
         # Not enough
 
@@ -561,19 +688,24 @@ class OriginClient(discord.Client, unum_base.OriginSource):
             what["error"] = text
             return
 
-        # We're going to be mucking with data structures, make a copy to not fuck up original
+        # Nothing's mucked with so no copy needed
 
-        command = copy.deepcopy(found[0])
+        who, command = found[0]
 
         # Grab the single single if there is one
 
-        if "source" in command:
-            what["source"] = command["source"]
+        if who:
+            what["source"] = who
 
         # If they've chosen help, add all the possible commands we just checked to valid usage
 
+        valids = None
+
         if command["name"] == "help":
-            command["usages"][1]["args"][0]["valids"] = [command["name"] for command in commands]
+            commands = [(None, command) for command in common] + [
+                (source.who, command) for source in sources for command in source.commands
+            ]
+            valids = {"command": [command["name"] for _, command in commands]}
 
         # If this command has usages, check those
 
@@ -581,7 +713,7 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
             # If couldn't find one, bail
 
-            if not self.parse_usage(what, command, text):
+            if not self.parse_usage(what, command, text, valids, who):
                 return
 
         # If it doens't have usages, we must match it's meme
@@ -607,12 +739,19 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
                 what["description"] = " and ".join(descriptions)
                 what["help"] = "\n".join(helps)
-                what["commands"] = [
-                    {
-                        "name": command["name"],
-                        "description":  command.get("description", command["name"])
-                    } for command in commands
-                ]
+                what["commands"] = []
+
+                for listed_who, listed in commands:
+
+                    description = listed.get("description", listed["name"])
+
+                    if listed_who is None and "description" in listed:
+                        description += title
+
+                    what["commands"].append({
+                        "name": listed["name"],
+                        "description": description
+                    })
 
             # If they want the help for a specific command
 
@@ -620,12 +759,16 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
                 # Find the command you need the usage for
 
-                usage = [command for command in commands if what["values"]["command"] == command["name"]][0]
+                usage_who, usage = [(who, command) for who, command in commands if what["values"]["command"] == command["name"]][0]
+
+                # A plain copy to go in the what, titled if it's common
+
+                usage = specs.thaw(usage, title if usage_who is None else None)
 
                 # Use the descrption of the command and the usages if there, if not, the command and meme
 
-                if "source" in usage:
-                    what["source"] = usage["source"]
+                if usage_who:
+                    what["source"] = usage_who
 
                 if "help" in usage:
                     what["help"] = usage["help"]
@@ -652,6 +795,71 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
                 what["error"] = f"channel required - try:\n- `?{command['name']}#channel`"
 
+    async def cached_message(self, channel, id):
+        """
+        Gets a message from the cache, from Discord only if we have to
+        """
+
+        message = self.messages.get(id)
+
+        if message is not None:
+            service.MESSAGE_CACHE.labels("message", "hit").inc()
+            return message
+
+        service.MESSAGE_CACHE.labels("message", "miss").inc()
+
+        message = await channel.fetch_message(id)
+        self.messages.add(message)
+
+        return message
+
+    async def cached_reference(self, channel_id, id):
+        """
+        Gets a message from the cache, from its channel on Discord if we have to
+        """
+
+        message = self.messages.get(id)
+
+        if message is not None:
+            service.MESSAGE_CACHE.labels("message", "hit").inc()
+            return message
+
+        return await self.cached_message(await self.cached_channel(channel_id), id)
+
+    async def cached_channel(self, id):
+        """
+        Gets a channel from the gateway cache, from Discord only if we have to
+        """
+
+        channel = self.get_channel(int(id))
+
+        if channel is not None:
+            service.TARGET_CACHE.labels("channel", "hit").inc()
+            return channel
+
+        service.TARGET_CACHE.labels("channel", "miss").inc()
+
+        return await self.fetch_channel(id)
+
+    async def cached_member(self, guild_id, id):
+        """
+        Gets a member from the gateway cache, from Discord only if we have to
+        """
+
+        guild = self.get_guild(int(guild_id))
+        member = guild.get_member(int(id)) if guild is not None else None
+
+        if member is not None:
+            service.TARGET_CACHE.labels("member", "hit").inc()
+            return member
+
+        service.TARGET_CACHE.labels("member", "miss").inc()
+
+        if guild is None:
+            guild = await self.fetch_guild(guild_id)
+
+        return await guild.fetch_member(id)
+
     async def parse_ancestor(self, ancestor, what, meta):
         """
         Adds parent to the resource provider
@@ -662,10 +870,19 @@ class OriginClient(discord.Client, unum_base.OriginSource):
             if ancestor.content and ancestor.content[0] in ['!', '?', '*']:
                 break
 
-            ancestor = await ancestor.channel.fetch_message(ancestor.reference.message_id)
+            ancestor = await self.cached_message(ancestor.channel, ancestor.reference.message_id)
+
+        parsed = self.messages.parsed(ancestor.id)
 
-        what["ancestor"], meta["ancestor"] = await self.parse_statement(ancestor)
+        if parsed is not None:
+            service.MESSAGE_CACHE.labels("parsed", "hit").inc()
+        else:
+            service.MESSAGE_CACHE.labels("parsed", "miss").inc()
+            parsed = await self.parse_statement(ancestor)
+
+        what["ancestor"], meta["ancestor"] = parsed
 
+    @timed("parse_statement")
     async def parse_statement(self, message):
         """
         Converts a message obj to a standard dict, optional including the reply
@@ -679,7 +896,7 @@ class OriginClient(discord.Client, unum_base.OriginSource):
         what["text"] = self.decode_text(message.content)
         what["meme"] = self.parse_meme(what["text"])
 
-        self.parse_command(what)
+        await self.parse_command(what)
 
         if message.attachments:
             what["links"] = [attachment.url for attachment in message.attachments]
@@ -691,7 +908,7 @@ class OriginClient(discord.Client, unum_base.OriginSource):
         })
 
         if message.reference:
-            ancestor = await message.channel.fetch_message(message.reference.message_id)
+            ancestor = await self.cached_message(message.channel, message.reference.message_id)
             await self.parse_ancestor(ancestor, what, meta)
 
         if not what.get("error") and (
@@ -702,6 +919,8 @@ class OriginClient(discord.Client, unum_base.OriginSource):
         ):
             what["error"] = "There are errors"
 
+        self.messages.add(message, (what, meta))
+
         return what, meta
 
     async def parse_reaction(self, reaction, user):
@@ -723,23 +942,45 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
         await self.parse_ancestor(reaction.message, what, meta)
 
-        witness = unum_ledger.Witness.one(who=user.id).retrieve(False)
+        entity_id = self.witnesses.entity_id(user.id)
 
-        if witness:
-            what["entity_id"] = witness.entity_id
+        if entity_id is not None:
+            what["entity_id"] = entity_id
 
         return what, meta
 
     # Reacting to Discord commands
 
-    async def multi_send(self, channel, text, reference=None):
+    async def send_text(self, channel, text, reference=None):
         """
-        Sends
+        Sends a single message, waiting out any rate limit discord.py won't
+        """
+
+        while True:
+
+            start = time.time()
+
+            try:
+                message = await channel.send(text, reference=reference)
+            except discord.RateLimited as exception:
+                service.SEND_RATELIMITS.inc()
+                await asyncio.sleep(exception.retry_after)
+                continue
+
+            service.SEND_LATENCY.observe(time.time() - start)
+
+            self.messages.add(message)
+
+            return message
+
+    def encode_chunks(self, text):
+        """
+        Splits text into messages Discord will take and encodes them
         """
 
-        texts = text if isinstance(text, list) else [text]
+        chunks = []
 
-        for text in texts:
+        for text in (text if isinstance(text, list) else [text]):
 
             while text:
 
@@ -751,7 +992,35 @@ class OriginClient(discord.Client, unum_base.OriginSource):
                     current = text
                     text = ""
 
-                await channel.send(self.encode_text(current), reference=reference)
+                chunks.append(self.encode_text(current))
+
+        return chunks
+
+    @timed("multi_send")
+    async def send_chunks(self, channel, chunks, reference=None, merge=True, wait=False):
+        """
+        Queues encoded chunks to send
+        """
+
+        # Everything journaled so far goes out before anyone hears about it
+
+        await self.journal.flush()
+
+        sent = [await self.outbox.put(channel, chunk, reference, merge) for chunk in chunks]
+
+        if wait:
+            await asyncio.gather(*sent)
+
+    async def multi_send(self, channel, text, reference=None, wait=False, merge=True):
+        """
+        Sends
+        """
+
+        # Separate texts are separate messages (to be reacted to) so only merge singles
+
+        merge = merge and not isinstance(text, list)
+
+        await self.send_chunks(channel, self.encode_chunks(text), reference, merge, wait)
 
     async def command_help(self, what, meta, message):
         """
@@ -762,7 +1031,7 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
         if "entity_id" not in what:
 
-            unum = unum_ledger.Unum.one(who='self')
+            unum = await self.ledger(unum_ledger.Unum.one(who='self').retrieve)
             entity = await self.journal_change("create", unum_ledger.Entity(
                 unum_id=unum.id,
                 who=meta["author"]["name"],
@@ -794,7 +1063,31 @@ class OriginClient(discord.Client, unum_base.OriginSource):
         for app in what.get("apps", []):
             await self.create_awards(what["entity_id"], app)
 
-        channel = message.channel
+        # Help only depends on these, and the registry and channels, which clear the cache
+
+        key = (
+            tuple(what.get("apps", [])),
+            what.get("origin"),
+            what.get("kind"),
+            what["usage"],
+            what.get("values", {}).get("command")
+        )
+
+        chunks = self.helps.get(key)
+
+        if chunks is not None:
+            service.HELP_CACHE.labels("hit").inc()
+        else:
+            service.HELP_CACHE.labels("miss").inc()
+            chunks = self.encode_chunks(self.render_help(what))
+            self.helps.add(key, chunks)
+
+        await self.send_chunks(message.channel, chunks, reference=message)
+
+    def render_help(self, what):
+        """
+        Renders help text for an App or Origin
+        """
 
         if what["usage"] == "general":
 
@@ -828,7 +1121,7 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
                     if example.get("kind") == "private":
 
-                        sources = what.get("apps", [])
+                        sources = list(what.get("apps", []))
 
                         if "origin" in what and what["origin"] != self.origin.who:
                             sources.append(what["origin"])
@@ -856,15 +1149,15 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
                             if source:
 
-                                origin = unum_ledger.Origin.one(who=source).retrieve(False)
+                                origin = self.registry.origin(who=source)
 
                                 if origin:
-                                    description += f" {origin.meta__title}"
+                                    description += f" {origin.title}"
 
-                                app = unum_ledger.App.one(who=source).retrieve(False)
+                                app = self.registry.app(source)
 
                                 if app:
-                                    description += f" {app.meta__title}"
+                                    description += f" {app.title}"
 
                                 description += f" while in direct message <@{self.user.id}> (or anywhere else)"
 
@@ -919,7 +1212,7 @@ class OriginClient(discord.Client, unum_base.OriginSource):
                     if format["name"] in formats:
                         text += f'\n- ***{format["name"]}*** - *{format["description"]}*'
 
-        await self.multi_send(channel, text, reference=message)
+        return text
 
     async def command_join(self, what, meta, message):
         """
@@ -932,12 +1225,12 @@ class OriginClient(discord.Client, unum_base.OriginSource):
         backs = []
         alreadys = []
 
-        for app in unum_ledger.App.many(who__in=what.get("apps", [])):
+        for app in await self.ledger(unum_ledger.App.many(who__in=what.get("apps", [])).retrieve):
 
-            herald = unum_ledger.Herald.one(
+            herald = await self.ledger(unum_ledger.Herald.one(
                 entity_id=what["entity_id"],
                 app_id=app.id
-            ).retrieve(False)
+            ).retrieve, False)
 
             if herald:
 
@@ -964,12 +1257,12 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
         if what.get("origin") == self.origin.who:
 
-            witness = unum_ledger.Witness.one(
+            witness = await self.ledger(unum_ledger.Witness.one(
                 origin_id=self.origin.id,
                 who=user_id
-            ).retrieve()
+            ).retrieve)
 
-            entity = unum_ledger.Entity.one(id=witness.entity_id)
+            entity = await self.ledger(unum_ledger.Entity.one(id=witness.entity_id).retrieve)
 
             if entity.status == "inactive":
 
@@ -981,7 +1274,7 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
                 before = entity.export()
                 witness.status = "active"
-                witness.update()
+                await self.ledger(witness.update)
 
             welcomes.append(self.origin.meta__title)
 
@@ -1024,12 +1317,12 @@ class OriginClient(discord.Client, unum_base.OriginSource):
         nevers = []
         alreadys = []
 
-        for app in unum_ledger.App.many(who__in=what.get("apps", [])):
+        for app in await self.ledger(unum_ledger.App.many(who__in=what.get("apps", [])).retrieve):
 
-            herald = unum_ledger.Herald.one(
+            herald = await self.ledger(unum_ledger.Herald.one(
                 entity_id=what["entity_id"],
                 app_id=app.id
-            ).retrieve(False)
+            ).retrieve, False)
 
             if herald:
 
@@ -1048,14 +1341,14 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
         if what.get("origin") == self.origin.who:
 
-            witness = unum_ledger.Witness.one(
+            witness = await self.ledger(unum_ledger.Witness.one(
                 origin_id=self.origin.id,
                 who=user_id
-            ).retrieve(False)
+            ).retrieve, False)
 
             if witness:
 
-                entity = unum_ledger.Entity.one(id=witness.entity_id).retrieve()
+                entity = await self.ledger(unum_ledger.Entity.one(id=witness.entity_id).retrieve)
 
                 if entity.status == "active":
 
@@ -1142,36 +1435,7 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
         elif meme == "?":
 
-            if usage == "list_unassigned":
-
-                text = ["♥️ unassigned scats are (👍 to assign, ♥️ to complete):"]
-
-                for scat in unum_ledger.Scat.many(status="recorded"):
-                    text.append(f"*scat:{scat.id} {scat.what__description} - {scat.status}")
-
-            else:
-
-                now = time.time()
-                when_min = when_max = 0
-
-                if usage == "list_since":
-
-                    when_min = values["since"]
-                    text = [f"♥️ your scats from {self.encode_time(when_min) or 'now'} are (👍 to assign, ♥️ to complete):"]
-
-                elif usage == "list_from_to":
-
-                    when_min = values["from"]
-                    when_max = values["to"]
-                    text = [f"♥️ your scats from {self.encode_time(when_min) or 'now'} to {self.encode_time(when_max) or 'now'} are (👍 to assign, ♥️ to complete):"]
-
-                for scat in unum_ledger.Scat.many(
-                    entity_id=entity_id,
-                    when__gte=now - when_min,
-                    when__lte=now - when_max
-                ):
-                    when = self.encode_time(now - scat.when) or "now"
-                    text.append(f"*scat:{scat.id} {scat.what__description} - {scat.status} - {when}")
+            text = await self.list_scats(what, 0)
 
         await self.multi_send(channel, text, reference=message)
 
@@ -1185,7 +1449,7 @@ class OriginClient(discord.Client, unum_base.OriginSource):
         meme = what["meme"]
         id = what["ancestor"]["id"]
 
-        scat = unum_ledger.Scat.one(id)
+        scat = await self.ledger(unum_ledger.Scat.one(id).retrieve)
 
         if meme == "+":
 
@@ -1211,7 +1475,7 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
             text = f"completed {scat.what__description}"
 
-            task = unum_ledger.Task.one(what__scat__id=scat.id).retrieve(False)
+            task = await self.ledger(unum_ledger.Task.one(what__scat__id=scat.id).retrieve, False)
 
             if task:
 
@@ -1229,43 +1493,11 @@ class OriginClient(discord.Client, unum_base.OriginSource):
         channel = message.channel
         user_id = meta["author"]["id"]
 
-        herald = unum_ledger.Witness.one(
-            origin_id=self.origin.id,
-            who=user_id
-        ).retrieve(False)
-
-        if not herald:
+        if self.witnesses.entity_id(user_id) is None:
             what["error"] = "not yet aware of you - type `?help`"
             return
 
-        entity_id = what["entity_id"]
-        meme = what["meme"]
-        usage = what["usage"]
-        values = what.get("values", {})
-
-        if usage == "list_incomplete":
-
-            text = "♥️ your incomplete awards are:"
-
-            if what.get("origin"):
-                for award in unum_ledger.Award.many(entity_id=entity_id, status__not_eq="completed", what__source=what["origin"]):
-                    text += f"\n- {award.what__description} - {award.status} {AWARDS[award.status]}"
-
-            for app in what.get("apps", []):
-                for award in unum_ledger.Award.many(entity_id=entity_id, status__not_eq="completed", what__source=app):
-                    text += f"\n- {award.what__description} - {award.status} {AWARDS[award.status]}"
-
-        else:
-
-            text = "♥️ your awards are:"
-
-            if what.get("origin"):
-                for award in unum_ledger.Award.many(entity_id=entity_id, what__source=what["origin"]):
-                    text += f"\n- {award.what__description} - {award.status} {AWARDS[award.status]}"
-
-            for app in what.get("apps", []):
-                for award in unum_ledger.Award.many(entity_id=entity_id, what__source=app):
-                    text += f"\n- {award.what__description} - {award.status} {AWARDS[award.status]}"
+        text = await self.list_awards(what, 0)
 
         await self.multi_send(channel, text, reference=message)
 
@@ -1277,12 +1509,7 @@ class OriginClient(discord.Client, unum_base.OriginSource):
         channel = message.channel
         user_id = meta["author"]["id"]
 
-        herald = unum_ledger.Witness.one(
-            origin_id=self.origin.id,
-            who=user_id
-        ).retrieve(False)
-
-        if not herald:
+        if self.witnesses.entity_id(user_id) is None:
             what["error"] = "not yet aware of you - type `?help`"
             return
 
@@ -1321,47 +1548,7 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
         elif meme == "?":
 
-            manuals = []
-
-            if usage == "list_incomplete":
-
-                text = "♥️ your incomplete tasks are:"
-
-                if what.get("origin"):
-                    for task in unum_ledger.Task.many(entity_id=entity_id, status__not_eq="done", what__source=what["origin"]):
-                        if task.what__fact:
-                            text += f"\n- {task.what__description} - {task.status} {TASKS[task.status]}"
-                        else:
-                            manuals.append(f"*task:{task.id} {task.what__description} - {task.status} {TASKS[task.status]}")
-
-                for app in what.get("apps", []):
-                    for task in unum_ledger.Task.many(entity_id=entity_id, status__not_eq="done", what__source=app):
-                        if task.what__fact:
-                            text += f"\n- {task.what__description} - {task.status} {TASKS[task.status]}"
-                        else:
-                            manuals.append(f"*task:{task.id} {task.what__description} - {task.status} {TASKS[task.status]}")
-
-            else:
-
-                text = ["♥️ your tasks are (♥️ to complete):"]
-
-                if what.get("origin"):
-                    for task in unum_ledger.Task.many(entity_id=entity_id, what__source=what["origin"]):
-                        if task.what__fact:
-                            text += f"\n- {task.what__description} - {task.status} {TASKS[task.status]}"
-                        else:
-                            manuals.append(f"*task:{task.id} {task.what__description} - {task.status} {TASKS[task.status]}")
-
-                for app in what.get("apps", []):
-                    for task in unum_ledger.Task.many(entity_id=entity_id, what__source=app):
-                        if task.what__fact:
-                            text += f"\n- {task.what__description} - {task.status} {TASKS[task.status]}"
-                        else:
-                            manuals.append(f"*task:{task.id} {task.what__description} - {task.status} {TASKS[task.status]}")
-
-            if manuals:
-                text += "\n(♥️ to complete):"
-                text = [text] + manuals
+            text = await self.list_tasks(what, 0)
 
         await self.multi_send(channel, text, reference=message)
 
@@ -1375,7 +1562,7 @@ class OriginClient(discord.Client, unum_base.OriginSource):
         meme = what["meme"]
         id = what["ancestor"]["id"]
 
-        task = unum_ledger.Task.one(id)
+        task = await self.ledger(unum_ledger.Task.one(id).retrieve)
 
         if meme == "*":
 
@@ -1383,7 +1570,7 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
             text = f"completed {task.what__description}"
 
-            scat = unum_ledger.Scat.one(task.what__scat__id).retrieve(False)
+            scat = await self.ledger(unum_ledger.Scat.one(task.what__scat__id).retrieve, False)
 
             if task:
 
@@ -1393,44 +1580,198 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
         await self.multi_send(channel, text, reference=reaction.message)
 
-    async def do_command(self, what, meta, message):
+    # Listings, a page at a time
+
+    def paged(self, header, page, more):
         """
-        If there's a command that doesn't require creation
+        Marks a listing header with its page and how to get to the others
         """
 
-        channel = message.channel
+        if page or more:
+            header += f"\n*page {page + 1}* - ⬅️ ➡️ to page"
 
-        if what.get("error"):
-            text = f'❗ {what["error"]}'
-            await self.multi_send(channel, text, reference=message)
-        elif what.get("errors"):
-            text = f'❗ issues with {what["command"]} usage:'
-            args = what["args"]
-            errors = what["errors"]
-            for arg in args:
-                if arg["name"] in errors:
-                    text += f'\n- {arg["name"]} - {errors[arg["name"]]}'
-            await self.multi_send(channel, text, reference=message)
-        elif what["command"] == "help":
-            await self.command_help(what, meta, message)
-        elif what["command"] == "join":
-            if "ledger" not in what.get("apps", []) and not self.is_active(what.get("entity_id")):
-                text = '❗ not active - need to join {channel:unifist-unum} first'
-                await self.multi_send(channel, text, reference=message)
-            else:
+        return header
+
+    async def retrieve_page(self, query, page):
+        """
+        Retrieves a page of a query, and whether there's more after it
+        """
+
+        rows = list(await self.ledger(query.limit(self.page_size + 1, page * self.page_size).retrieve))
+
+        return rows[:self.page_size], len(rows) > self.page_size
+
+    @staticmethod
+    def list_sources(what):
+        """
+        Sources a listing covers
+        """
+
+        return ([what["origin"]] if what.get("origin") else []) + what.get("apps", [])
+
+    async def list_scats(self, what, page):
+        """
+        Lists a page of scats, None if there's nothing past the first
+        """
+
+        usage = what["usage"]
+        values = what.get("values", {})
+
+        if usage == "list_unassigned":
+
+            header = "♥️ unassigned scats are (👍 to assign, ♥️ to complete):"
+
+            scats, more = await self.retrieve_page(unum_ledger.Scat.many(status="recorded"), page)
+
+            items = [f"*scat:{scat.id} {scat.what__description} - {scat.status}" for scat in scats]
+
+        else:
+
+            now = time.time()
+            when_min = when_max = 0
+
+            if usage == "list_since":
+
+                when_min = values["since"]
+                header = f"♥️ your scats from {self.encode_time(when_min) or 'now'} are (👍 to assign, ♥️ to complete):"
+
+            elif usage == "list_from_to":
+
+                when_min = values["from"]
+                when_max = values["to"]
+                header = f"♥️ your scats from {self.encode_time(when_min) or 'now'} to {self.encode_time(when_max) or 'now'} are (👍 to assign, ♥️ to complete):"
+
+            scats, more = await self.retrieve_page(unum_ledger.Scat.many(
+                entity_id=what["entity_id"],
+                when__gte=now - when_min,
+                when__lte=now - when_max
+            ), page)
+
+            items = [
+                f"*scat:{scat.id} {scat.what__description} - {scat.status} - {self.encode_time(now - scat.when) or 'now'}"
+                for scat in scats
+            ]
+
+        if page and not items:
+            return None
+
+        return [self.paged(header, page, more)] + items
+
+    async def list_awards(self, what, page):
+        """
+        Lists a page of awards, None if there's nothing past the first
+        """
+
+        sources = self.list_sources(what)
+
+        if what["usage"] == "list_incomplete":
+            header = "♥️ your incomplete awards are:"
+            query = unum_ledger.Award.many(entity_id=what["entity_id"], status__not_eq="completed", what__source__in=sources)
+        else:
+            header = "♥️ your awards are:"
+            query = unum_ledger.Award.many(entity_id=what["entity_id"], what__source__in=sources)
+
+        awards, more = await self.retrieve_page(query, page) if sources else ([], False)
+
+        if page and not awards:
+            return None
+
+        text = self.paged(header, page, more)
+
+        for award in awards:
+            text += f"\n- {award.what__description} - {award.status} {AWARDS[award.status]}"
+
+        return text
+
+    async def list_tasks(self, what, page):
+        """
+        Lists a page of tasks, None if there's nothing past the first
+        """
+
+        sources = self.list_sources(what)
+
+        if what["usage"] == "list_incomplete":
+            header = "♥️ your incomplete tasks are:"
+            query = unum_ledger.Task.many(entity_id=what["entity_id"], status__not_eq="done", what__source__in=sources)
+        else:
+            header = "♥️ your tasks are (♥️ to complete):"
+            query = unum_ledger.Task.many(entity_id=what["entity_id"], what__source__in=sources)
+
+        tasks, more = await self.retrieve_page(query, page) if sources else ([], False)
+
+        if page and not tasks:
+            return None
+
+        text = self.paged(header, page, more)
+        manuals = []
+
+        for task in tasks:
+            if task.what__fact:
+                text += f"\n- {task.what__description} - {task.status} {TASKS[task.status]}"
+            else:
+                manuals.append(f"*task:{task.id} {task.what__description} - {task.status} {TASKS[task.status]}")
+
+        if manuals:
+            text += "\n(♥️ to complete):"
+            text = [text] + manuals
+
+        return text
+
+    async def page_listing(self, what, meta, reaction):
+        """
+        Sends the page before or after the one reacted to
+        """
+
+        found = PAGE.search(reaction.message.content or "")
+
+        if not found or reaction.message.reference is None or "entity_id" not in what["ancestor"]:
+            return
+
+        page = int(found.group(1)) - 1 + PAGES[str(what["emoji"])[0]]
+
+        if page < 0:
+            return
+
+        text = await getattr(self, f"list_{what['ancestor']['command']}s")(what["ancestor"], page)
+
+        if text:
+            await self.multi_send(reaction.message.channel, text, reference=reaction.message.reference)
+
+    @timed("do_command")
+    async def do_command(self, what, meta, message):
+        """
+        If there's a command that doesn't require creation
+        """
+
+        channel = message.channel
+
+        if what.get("error"):
+            text = f'❗ {what["error"]}'
+            await self.multi_send(channel, text, reference=message)
+        elif what.get("errors"):
+            text = f'❗ issues with {what["command"]} usage:'
+            args = what["args"]
+            errors = what["errors"]
+            for arg in args:
+                if arg["name"] in errors:
+                    text += f'\n- {arg["name"]} - {errors[arg["name"]]}'
+            await self.multi_send(channel, text, reference=message)
+        elif what["command"] == "help":
+            await self.command_help(what, meta, message)
+        elif what["command"] == "join":
+            if "ledger" not in what.get("apps", []) and not await self.active(what.get("entity_id")):
+                text = '❗ not active - need to join {channel:unifist-unum} first'
+                await self.multi_send(channel, text, reference=message)
+            else:
                 await self.command_join(what, meta, message)
 
         elif what["command"] == "leave":
             await self.command_leave(what, meta, message)
         else:
 
-            app = unum_ledger.App.one(who=what.get("source")).retrieve(False)
+            app = self.registry.app(what.get("source"))
 
-            if not self.is_active(what.get("entity_id")) or (app and not unum_ledger.Herald.one(
-                entity_id=what.get("entity_id"),
-                app_id=app.id,
-                status="active"
-            ).retrieve(False)):
+            if not await self.active(what.get("entity_id")) or (app and not await self.heralded(what.get("entity_id"), app.id)):
                 text = '❗ not active - need to join first'
                 await self.multi_send(channel, text, reference=message)
             elif what["command"] == "scat":
@@ -1441,6 +1782,7 @@ class OriginClient(discord.Client, unum_base.OriginSource):
                 await self.command_task(what, meta, message)
 
 
+    @timed("do_reaction")
     async def do_reaction(self, what, meta, reaction):
         """
         Perform the who
@@ -1448,6 +1790,13 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
         name = what["ancestor"]["command"]
 
+        # Paging arrows only ever page, never count as a meme
+
+        if str(what["emoji"])[0] in PAGES:
+            if name in ["scat", "award", "task"] and what["ancestor"].get("meme") == "?":
+                await self.page_listing(what, meta, reaction)
+            return
+
         if name == "scat":
             await self.reaction_scat(what, meta, reaction)
         elif name == "award":
@@ -1459,52 +1808,162 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
     async def on_message(self, message):
         """
-        For every message this bot sees
+        Queues every message this bot sees, commands and replies ahead of chatter
+        """
+
+        kind = "command" if message.content[:1] in ["!", "?"] or message.reference else "chatter"
+
+        self.ingest.put(kind, self.ingest_message, message)
+
+    async def on_reaction_add(self, reaction, user):
+        """
+        Queues every reaction this bot sees, those to us ahead of chatter
+        """
+
+        kind = "command" if reaction.message.author.id == self.user.id else "chatter"
+
+        self.ingest.put(kind, self.ingest_reaction, reaction, user)
+
+    async def claim_event(self, key, parse):
         """
+        Parses an event only the first time Discord tells us, here or in any replica, None otherwise
+        """
+
+        # Probably a replay, so check before anything else. Otherwise it's surely
+        # new here, so claim it while parsing in case another replica got it too.
+
+        if self.dedup.seen(key):
+
+            if not await self.dedup.claim(key):
+                service.EVENT_DEDUP.labels("duplicate").inc()
+                return None
+
+            service.EVENT_DEDUP.labels("false_positive").inc()
 
-        what, meta = await self.parse_statement(message)
+            async with self.claimed(key):
+                return await parse()
 
-        if what.get("self"):
+        claiming = asyncio.ensure_future(self.dedup.claim(key))
+
+        # Only let go of the claim if it was ours, another replica may have it
+
+        try:
+            parsed = await parse()
+        except Exception:
+            if await claiming:
+                await self.dedup.release(key)
+            raise
+
+        if not await claiming:
+            service.EVENT_DEDUP.labels("replica").inc()
+            return None
+
+        service.EVENT_DEDUP.labels("new").inc()
+
+        return parsed
+
+    @contextlib.asynccontextmanager
+    async def claimed(self, key):
+        """
+        Lets an event be claimed again if handling it failed
+        """
+
+        try:
+            yield
+        except Exception:
+            await self.dedup.release(key)
+            raise
+
+    async def ingest_message(self, message):
+        """
+        Handles a message, once
+        """
+
+        # Our own messages aren't facts, no need to claim them
+
+        if message.author.id == self.user.id:
             return
 
-        if what.get("command"):
-            await self.do_command(what, meta, message)
+        key = f"{self.origin.id}:message:{message.id}"
 
-        self.logger.info("statement", extra={"what": what, "meta": meta})
+        parsed = await self.claim_event(key, lambda: self.parse_statement(message))
 
-        if "entity_id" in what:
-            await self.create_fact(
-                message,
-                origin_id=self.origin.id,
-                entity_id=what["entity_id"],
-                who=f"message:{message.id}",
-                when=time.mktime(message.created_at.timetuple()),
-                what=what,
-                meta=meta
-            )
+        if parsed is None:
+            return
 
-    async def on_reaction_add(self, reaction, user):
+        what, meta = parsed
+
+        async with self.claimed(key), self.journal.batch():
+
+            if what.get("command"):
+                await self.do_command(what, meta, message)
+
+            self.logger.info("statement", extra={"what": what, "meta": meta})
+
+            if "entity_id" in what:
+                await self.create_fact(
+                    message,
+                    origin_id=self.origin.id,
+                    entity_id=what["entity_id"],
+                    who=f"message:{message.id}",
+                    when=time.mktime(message.created_at.timetuple()),
+                    what=what,
+                    meta=meta
+                )
+
+    async def ingest_reaction(self, reaction, user):
         """
-        For every reactino this bot sees
+        Handles a reaction, once
         """
 
-        what, meta = await self.parse_reaction(reaction, user)
+        key = f"{self.origin.id}:reaction:{reaction.message.id}:{reaction.emoji}:{user.id}"
 
-        if what.get("ancestor", {}).get("command"):
-            await self.do_reaction(what, meta, reaction)
+        parsed = await self.claim_event(key, lambda: self.parse_reaction(reaction, user))
 
-        self.logger.info("reaction", extra={"what": what, "meta": meta})
+        if parsed is None:
+            return
 
-        if "entity_id" in what:
-            await self.create_fact(
-                reaction.message,
-                origin_id=self.origin.id,
-                entity_id=what["entity_id"],
-                who=f"reaction:{reaction.message.id}:{reaction.emoji}",
-                when=time.mktime(reaction.message.created_at.timetuple()),
-                what=what,
-                meta=meta
-            )
+        what, meta = parsed
+
+        async with self.claimed(key), self.journal.batch():
+
+            if what.get("ancestor", {}).get("command"):
+                await self.do_reaction(what, meta, reaction)
+
+            self.logger.info("reaction", extra={"what": what, "meta": meta})
+
+            if "entity_id" in what:
+                await self.create_fact(
+                    reaction.message,
+                    origin_id=self.origin.id,
+                    entity_id=what["entity_id"],
+                    who=f"reaction:{reaction.message.id}:{reaction.emoji}",
+                    when=time.mktime(reaction.message.created_at.timetuple()),
+                    what=what,
+                    meta=meta
+                )
+
+    async def on_raw_message_edit(self, payload):
+        """
+        Edited messages need to be parsed again
+        """
+
+        self.messages.discard(payload.message_id)
+
+    async def on_raw_message_delete(self, payload):
+        """
+        Deleted messages are no longer needed
+        """
+
+        self.messages.discard(payload.message_id)
+
+    def load_channels(self):
+        """
+        Reloads the channel maps, which changes how help encodes too
+        """
+
+        self.codec.load_channels(self.get_all_channels())
+        self.helps.clear()
 
     async def on_ready(self):
         """
@@ -1513,21 +1972,51 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
         self.logger.info(f"logged in as {self.user}", extra={"id": self.user.id})
 
+        self.load_channels()
+
+        # Reconnects call this too, only the first is startup
+
+        if self.started:
+            service.STARTUP_LATENCY.labels("gateway").set(time.time() - self.started)
+            self.started = None
+
+    async def on_guild_channel_create(self, channel):
+        """
+        Keeps the channel maps current
+        """
+
+        self.load_channels()
+
+    async def on_guild_channel_delete(self, channel):
+        """
+        Keeps the channel maps current
+        """
+
+        self.load_channels()
+
+    async def on_guild_channel_update(self, before, after):
+        """
+        Keeps the channel maps current
+        """
+
+        self.load_channels()
+
     # Executing Unum Acts
 
+    @timed("act_statement")
     async def act_statement(self, instance):
         """
         Sends a message where information is required
         """
 
         entity_id = instance["entity_id"]
-        entity = unum_ledger.Entity.one(entity_id)
+        entity = await self.ledger(unum_ledger.Entity.one(entity_id).retrieve)
 
         meme = instance["what"].get("meme", "*")
         emoji = instance["what"].get("emoji", MEMES[meme])
         command = ""
         text = instance["what"].get("text", "")
-        app = unum_ledger.App.one(instance["app_id"]).retrieve(False)
+        app = await self.ledger(unum_ledger.App.one(instance["app_id"]).retrieve, False)
 
         if "command" in instance["what"]:
 
@@ -1548,16 +2037,19 @@ class OriginClient(discord.Client, unum_base.OriginSource):
         reference = None
 
         if instance["meta"].get("ancestor", {}).get("id"):
-            target = await self.fetch_channel(instance["meta"]["ancestor"]["channel"]["id"])
-            reference = await target.fetch_message(instance["meta"]["ancestor"]["id"])
+            reference = await self.cached_reference(
+                instance["meta"]["ancestor"]["channel"]["id"],
+                instance["meta"]["ancestor"]["id"]
+            )
+            target = reference.channel
 
         if not target and entity.meta__talk__kind == "public":
 
-            target = discord.utils.get(self.get_all_channels(), name=(
+            target = self.codec.channel(
                 instance["what"].get("channel") or
                 app.meta__channel or
                 "unifist-unum"
-            ))
+            )
 
             if entity.meta__talk__noise == "loud":
                 text = f"{{entity:{entity.id}}}, " + text
@@ -1569,28 +2061,32 @@ class OriginClient(discord.Client, unum_base.OriginSource):
             if command:
                 command += f".{app.who}"
 
-            guild = await self.fetch_guild(self.origin.meta__guild__id)
-
-            target = await guild.fetch_member(unum_ledger.Witness.one(entity_id=entity_id).who)
+            target = await self.cached_member(self.origin.meta__guild__id, self.witnesses.who(entity_id))
 
         text = (command or emoji) + " " + text
 
-        await self.multi_send(target, text, reference=reference)
+        # Acts are replied and reacted to by their first line so each needs its own message
 
+        await self.multi_send(target, text, reference=reference, wait=True, merge=False)
+
+    @timed("act_reaction")
     async def act_reaction(self, instance):
         """
         Responds to a message
         """
 
         entity_id = instance["entity_id"]
-        entity = unum_ledger.Entity.one(entity_id)
+        entity = await self.ledger(unum_ledger.Entity.one(entity_id).retrieve)
 
         meme = instance["what"].get("meme", "*")
         text = instance["what"].get("text")
         emoji = instance["what"].get("emoji", MEMES[meme])
 
-        channel = await self.fetch_channel(instance["meta"]["ancestor"]["channel"]["id"])
-        reference = await channel.fetch_message(instance["meta"]["ancestor"]["id"])
+        reference = await self.cached_reference(
+            instance["meta"]["ancestor"]["channel"]["id"],
+            instance["meta"]["ancestor"]["id"]
+        )
+        channel = reference.channel
 
         # If we have something to say and we're allowed to say it
 
@@ -1605,7 +2101,7 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
             text = emoji + " " + text
 
-            await self.multi_send(channel, text, reference=reference)
+            await self.multi_send(channel, text, reference=reference, wait=True, merge=False)
 
         # Else we only have a reaction
 
@@ -1615,121 +2111,190 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
     # Create Unum Events
 
+    @timed("complete_awards")
     async def complete_awards(self, message, fact):
         """
         Complete awards if so
         """
 
-        for award in unum_ledger.Award.many(
-            entity_id=fact.entity_id,
-            status__in=["requested", "accepted"]
-        ):
+        matched = self.awards.match(fact)
 
-            completed = []
+        if not matched:
+            return
 
-            # Oh yes this is horribly inefficient but it's like no code
+        completed = []
 
-            if award.what__fact and unum_ledger.Fact.one(id=fact.id, **award.what__fact).retrieve(False):
+        # Only the ones the Fact satisfies, and only if they're still open
 
-                await self.journal_change("update", award, {"status": "completed"})
-                completed.append(award.what__description)
+        for award in await self.ledger(unum_ledger.Award.many(
+            id__in=[record["id"] for record in matched],
+            status__in=AWARDS_OPEN
+        ).retrieve):
 
-            if completed:
-                text = f"{MEMES['*'] } completed Awards:"
+            await self.journal_change("update", award, {"status": "completed"})
+            completed.append(award.what__description)
 
-                for award in completed:
-                    text += f"\n- {award}"
+        if completed:
+            text = f"{MEMES['*'] } completed Awards:"
 
-                await self.multi_send(message.channel, text, reference=message)
+            for award in completed:
+                text += f"\n- {award}"
 
+            await self.multi_send(message.channel, text, reference=message)
+
+    @timed("complete_tasks")
     async def complete_tasks(self, message, fact):
         """
         Complete tasks if so
         """
 
-        for task in unum_ledger.Task.many(
-            entity_id=fact.entity_id,
-            status__in=["blocked", "inprogress"]
-        ):
+        matched = self.tasks.match(fact)
 
-            completed = []
+        if not matched:
+            return
 
-            # Oh yes this is horribly inefficient but it's like no code
+        completed = []
 
-            if task.what__fact and unum_ledger.Fact.one(id=fact.id, **task.what__fact).retrieve(False):
+        # Only the ones the Fact satisfies, and only if they're still open
 
-                await self.journal_change("update", task, {"status": "done"})
-                completed.append(task.what__description)
+        for task in await self.ledger(unum_ledger.Task.many(
+            id__in=[record["id"] for record in matched],
+            status__in=TASKS_OPEN
+        ).retrieve):
+
+            await self.journal_change("update", task, {"status": "done"})
+            completed.append(task.what__description)
 
-            if completed:
-                text = f"{MEMES['*'] } completed Tasks:"
+        if completed:
+            text = f"{MEMES['*'] } completed Tasks:"
 
-                for task in completed:
-                    text += f"\n- {task}"
+            for task in completed:
+                text += f"\n- {task}"
 
-                await self.multi_send(message.channel, text, reference=message)
+            await self.multi_send(message.channel, text, reference=message)
 
+    @timed("create_fact")
     async def create_fact(self, message, **fact):
         """
         Creates a fact if needed
         """
 
-        if fact["what"].get("command") not in ["help", "award", "join", "leave"] and not self.is_active(fact["entity_id"]):
+        if fact["what"].get("command") not in ["help", "award", "join", "leave"] and not await self.active(fact["entity_id"]):
             return
 
         fact = await self.journal_change("create", unum_ledger.Fact(**fact))
 
         self.logger.info("fact", extra={"fact": {"id": fact.id}})
         service.FACTS.observe(1)
-        await self.redis.xadd("ledger/fact", fields={"fact": json.dumps(fact.export())})
+
+        exported = fact.export()
+
+        await self.journal.flush()
+        await self.redis.xadd("ledger/fact", fields={"fact": json.dumps(exported)})
 
         if not fact.what__error and not fact.what__errors:
-            await self.complete_awards(message, fact)
-            await self.complete_tasks(message, fact)
+            await self.complete_awards(message, exported)
+            await self.complete_tasks(message, exported)
+
+    async def journal_creates(self, model, records):
+        """
+        Creates in bulk and journals each
+        """
+
+        if not records:
+            return []
+
+        created = await self.ledger(model(records).create)
+
+        for instance in created:
+
+            what = {
+                "action": "create",
+                "app": instance.SOURCE,
+                "block": instance.NAME,
+                "after": instance.export(),
+                "id": instance.id
+            }
+
+            self.apply_journal(what)
+
+            await self.journal.add({
+                "who": f"create:{instance.NAME}.{instance.SOURCE}:{instance.id}",
+                "what": what,
+                "when": time.time()
+            })
+
+        return created
+
+    async def ensure_records(self, model, entity_id, records, status):
+        """
+        Ensures records exist, checking them all at once and creating what's missing together
+        """
+
+        desired = {}
+
+        for record in records:
+            desired.setdefault(record["who"], record)
+
+        if not desired:
+            return []
+
+        existing = set(
+            instance.who for instance in await self.ledger(model.many(entity_id=entity_id, who__in=list(desired)).retrieve)
+        )
+
+        when = time.time()
+
+        return await self.journal_creates(model, [
+            {
+                "entity_id": entity_id,
+                "status": status,
+                "when": when,
+                **record
+            }
+            for who, record in desired.items() if who not in existing
+        ])
+
+    async def ensure_awards(self, entity_id, awards):
+        """
+        Ensure awards exist
+        """
+
+        return await self.ensure_records(unum_ledger.Award, entity_id, awards, "requested")
+
+    async def ensure_tasks(self, entity_id, tasks):
+        """
+        Ensure tasks exist
+        """
+
+        return await self.ensure_records(unum_ledger.Task, entity_id, tasks, "inprogress")
 
     async def ensure_award(self, entity_id, who, **award):
         """
         Ensure a award exists
         """
 
-        if unum_ledger.Award.one(entity_id=entity_id, who=who).retrieve(False):
-            return
-
-        award = await self.journal_change("create", unum_ledger.Award(
-            entity_id=entity_id,
-            who=who,
-            status="requested",
-            when=time.time(),
-            **award
-        ))
+        await self.ensure_awards(entity_id, [{"who": who, **award}])
 
     async def ensure_task(self, entity_id, who, status="inprogress", **task):
         """
         Ensure a task exists
         """
 
-        if unum_ledger.Task.one(entity_id=entity_id, who=who).retrieve(False):
-            return
-
-        task = await self.journal_change("create", unum_ledger.Task(
-            entity_id=entity_id,
-            who=who,
-            status=status,
-            when=time.time(),
-            **task
-        ))
+        await self.ensure_tasks(entity_id, [{"who": who, "status": status, **task}])
 
     async def create_awards(self, entity_id, who):
         """
         Creates awards if needed
         """
 
+        awards = []
+
         if who == self.origin.who:
 
-            await self.ensure_award(
-                entity_id=entity_id,
-                who=f"command:help#{self.origin.meta__channel}",
-                what={
+            awards.append({
+                "who": f"command:help#{self.origin.meta__channel}",
+                "what": {
                     "source": self.origin.who,
                     "description": f"Run help publicly in {{channel:{self.origin.meta__channel}}}",
                     "fact": {
@@ -1739,12 +2304,11 @@ class OriginClient(discord.Client, unum_base.OriginSource):
                         "what__channel": self.origin.meta__channel
                     }
                 }
-            )
+            })
 
-            await self.ensure_award(
-                entity_id=entity_id,
-                who=f"command:help.{who}:private",
-                what={
+            awards.append({
+                "who": f"command:help.{who}:private",
+                "what": {
                     "source": self.origin.who,
                     "description": f"Run help privately for {who}",
                     "fact": {
@@ -1754,14 +2318,13 @@ class OriginClient(discord.Client, unum_base.OriginSource):
                         "what__command": "help"
                     }
                 }
-            )
+            })
 
             for command in self.origin.meta__commands[1:]:
 
-                await self.ensure_award(
-                    entity_id=entity_id,
-                    who=f"command:help:{command['name']}#{self.origin.meta__channel}",
-                    what={
+                awards.append({
+                    "who": f"command:help:{command['name']}#{self.origin.meta__channel}",
+                    "what": {
                         "source": self.origin.who,
                         "description": f"Get help for {command['name']} in {{channel:{self.origin.meta__channel}}}",
                         "fact": {
@@ -1772,21 +2335,25 @@ class OriginClient(discord.Client, unum_base.OriginSource):
                             "what__values__command": command['name']
                         }
                     }
-                )
+                })
+
+            await self.ensure_awards(entity_id, awards)
 
             return
 
-        source = unum_ledger.App.one(who=who).retrieve(False) or unum_ledger.Origin.one(who=who).retrieve(False)
+        source = (
+            await self.ledger(unum_ledger.App.one(who=who).retrieve, False) or
+            await self.ledger(unum_ledger.Origin.one(who=who).retrieve, False)
+        )
 
         if not source:
             return
 
         if source.who != "ledger":
 
-            await self.ensure_award(
-                entity_id=entity_id,
-                who=f"command:help#{source.meta__channel}",
-                what={
+            awards.append({
+                "who": f"command:help#{source.meta__channel}",
+                "what": {
                     "source": source.who,
                     "description": f"Run help for {source.who} in {{channel:{source.meta__channel}}}",
                     "fact": {
@@ -1796,14 +2363,13 @@ class OriginClient(discord.Client, unum_base.OriginSource):
                         "what__channel": source.meta__channel
                     }
                 }
-            )
+            })
 
             for command in self.origin.meta__commands[1:]:
 
-                await self.ensure_award(
-                    entity_id=entity_id,
-                    who=f"command:help:{command['name']}#{source.meta__channel}",
-                    what={
+                awards.append({
+                    "who": f"command:help:{command['name']}#{source.meta__channel}",
+                    "what": {
                         "source": source.who,
                         "description": f"Get help for {command['name']} in {{channel:{source.meta__channel}}}",
                         "fact": {
@@ -1814,14 +2380,13 @@ class OriginClient(discord.Client, unum_base.OriginSource):
                             "what__values__command": command['name']
                         }
                     }
-                )
+                })
 
         if isinstance(source, unum_ledger.App):
 
-            await self.ensure_award(
-                entity_id=entity_id,
-                who=f"command:help.{source.who}:public",
-                what={
+            awards.append({
+                "who": f"command:help.{source.who}:public",
+                "what": {
                     "source": source.who,
                     "description": f"Run help publicly for {source.who} but not in {{channel:{source.meta__channel}}}",
                     "fact": {
@@ -1832,14 +2397,13 @@ class OriginClient(discord.Client, unum_base.OriginSource):
                         "what__channel__not_eq": source.meta__channel
                     }
                 }
-            )
+            })
 
         for command in source.meta__commands:
 
-            await self.ensure_award(
-                entity_id=entity_id,
-                who=f"command:help.{source.who}:{command['name']}",
-                what={
+            awards.append({
+                "who": f"command:help.{source.who}:{command['name']}",
+                "what": {
                     "source": source.who,
                     "description": f"Get help for {command['name']} in {source.who}",
                     "fact": {
@@ -1850,7 +2414,9 @@ class OriginClient(discord.Client, unum_base.OriginSource):
                         "what__values__command": command['name']
                     }
                 }
-            )
+            })
+
+        await self.ensure_awards(entity_id, awards)
 
     async def create_learn_tasks(self, entity_id, who):
         """
@@ -1859,15 +2425,18 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
         await self.create_awards(entity_id, who)
 
-        for award in unum_ledger.Award.many(entity_id=entity_id, status="requested", what__source=who):
+        awards = await self.ledger(unum_ledger.Award.many(entity_id=entity_id, status="requested", what__source=who).retrieve)
 
-            await self.ensure_task(
-                entity_id=award.entity_id,
-                who=award.who,
-                what=award.what,
-                status=("done" if award.status == "completed" else "inprogress")
-            )
+        await self.ensure_tasks(entity_id, [
+            {
+                "who": award.who,
+                "what": award.what,
+                "status": ("done" if award.status == "completed" else "inprogress")
+            }
+            for award in awards
+        ])
 
+        for award in awards:
             await self.journal_change("update", award, {"status": "accepted"})
 
     async def create_qa_tasks(self, entity_id, who):
@@ -1879,11 +2448,16 @@ class OriginClient(discord.Client, unum_base.OriginSource):
 
         await self.create_awards(entity_id, who)
 
-        source = unum_ledger.App.one(who=who).retrieve(False) or unum_ledger.Origin.one(who=who).retrieve(False)
+        source = (
+            await self.ledger(unum_ledger.App.one(who=who).retrieve, False) or
+            await self.ledger(unum_ledger.Origin.one(who=who).retrieve, False)
+        )
 
         if not source:
             return
 
+        tasks = []
+
         # We run every usage of every command
 
         if source.who != "ledger":
@@ -1901,10 +2475,9 @@ class OriginClient(discord.Client, unum_base.OriginSource):
                     }
                 ]):
 
-                    await self.ensure_task(
-                        entity_id=entity_id,
-                        who=f"command:{command['name']}.{usage['name']}#{source.meta__channel}",
-                        what={
+                    tasks.append({
+                        "who": f"command:{command['name']}.{usage['name']}#{source.meta__channel}",
+                        "what": {
                             "source": source.who,
                             "description": f"Run {usage['name']} usage for {command['name']} in {{channel:{source.meta__channel}}}",
                             "fact": {
@@ -1914,7 +2487,7 @@ class OriginClient(discord.Client, unum_base.OriginSource):
                                 "what__channel": source.meta__channel
                             }
                         }
-                    )
+                    })
 
         for command in source.meta__commands:
 
@@ -1929,10 +2502,9 @@ class OriginClient(discord.Client, unum_base.OriginSource):
                 }
             ]):
 
-                await self.ensure_task(
-                    entity_id=entity_id,
-                    who=f"command:{command['name']}.{usage['name']}#{source.meta__channel}",
-                    what={
+                tasks.append({
+                    "who": f"command:{command['name']}.{usage['name']}#{source.meta__channel}",
+                    "what": {
                         "source": source.who,
                         "description": f"Run {usage['name']} usage for {command['name']} in {source.who}",
                         "fact": {
@@ -1942,14 +2514,16 @@ class OriginClient(discord.Client, unum_base.OriginSource):
                             "what__channel": source.meta__channel
                         }
                     }
-                )
+                })
+
+        await self.ensure_tasks(entity_id, tasks)
 
     async def create_scat_task(self, entity_id):
         """
         Creates awards if needed
         """
 
-        for scat in unum_ledger.Scat.many(status="recorded"):
+        for scat in await self.ledger(unum_ledger.Scat.many(status="recorded").retrieve):
 
             await self.ensure_task(
                 entity_id=entity_id,
@@ -1981,43 +2555,242 @@ class OriginClient(discord.Client, unum_base.OriginSource):
         ):
             await self.redis.xgroup_create("ledger/act", self.group, mkstream=True)
 
+        # Pick up whatever a previous pod left hanging before anything new
+
+        await self.recover_acts()
+        self.loop.create_task(self.on_recover())
+
+        # Whatever's read but not submitted stays pending for recovery
+
         while True:
 
-            message = await self.redis.xreadgroup(
-                self.group, self.group_id, {"ledger/act": ">"}, count=1, block=500
-            )
+            try:
 
-            if not message or "act" not in message[0][1][0][1]:
-                continue
+                await self.acts.room()
 
-            instance = json.loads(message[0][1][0][1]["act"])
-            self.logger.info("act", extra={"act": instance})
-            service.ACTS.observe(1)
+                message = await self.redis.xreadgroup(
+                    self.group, self.group_id, {"ledger/act": ">"}, count=self.act_batch, block=500
+                )
 
-            if not self.is_active(instance["entity_id"]):
-                return
+                if not message:
+                    continue
+
+                for id, fields in message[0][1]:
+                    await self.submit_act(id, fields)
+
+            except Exception: # pylint: disable=broad-except
+                self.logger.exception("act read failed")
+                await asyncio.sleep(1)
+
+    async def submit_act(self, id, fields):
+        """
+        Hands an Act to the workers, dead-lettering it if it can't be read
+        """
+
+        try:
+            instance = json.loads(fields["act"])
+            entity_id = instance["entity_id"]
+        except (KeyError, TypeError, ValueError):
+            await self.dead_act(id, fields, 1)
+            return
+
+        self.logger.info("act", extra={"act": instance})
+        service.ACTS.observe(1)
+
+        self.acts.submit(entity_id, id, instance)
+
+    @timed("act")
+    async def do_act(self, id, instance):
+        """
+        Performs an Act, acknowledging when done
+        """
+
+        if await self.active(instance["entity_id"]):
 
             if instance["what"]["base"] == "statement":
                 await self.act_statement(instance)
             elif instance["what"]["base"] == "reaction":
                 await self.act_reaction(instance)
 
-            await self.redis.xack("ledger/act", self.group, message[0][1][0][0])
+        await self.redis.xack("ledger/act", self.group, id)
+
+    async def recover_acts(self):
+        """
+        Claims Acts left pending too long, dead-lettering those delivered too often
+        """
+
+        start = "-"
+
+        while True:
+
+            entries = await self.redis.xpending_range(
+                "ledger/act", self.group, start, "+", self.act_batch, idle=self.act_idle * 1000
+            )
+
+            claims = []
+
+            for entry in entries:
+
+                # Ours and still running, just slow
+
+                if entry["message_id"] in self.acts.ids:
+                    continue
+
+                if entry["times_delivered"] >= self.act_deliveries:
+                    fields = await self.redis.xrange("ledger/act", entry["message_id"], entry["message_id"])
+                    await self.dead_act(entry["message_id"], fields[0][1] if fields else {}, entry["times_delivered"])
+                else:
+                    claims.append(entry["message_id"])
+
+            if claims:
+
+                for id, fields in await self.redis.xclaim(
+                    "ledger/act", self.group, self.group_id, self.act_idle * 1000, claims
+                ):
+
+                    if fields is None:
+                        continue
+
+                    service.ACTS_RECOVERED.inc()
+                    await self.acts.room()
+                    await self.submit_act(id, fields)
+
+            if len(entries) < self.act_batch:
+                return
+
+            start = f"({entries[-1]['message_id']}"
+
+    async def dead_act(self, id, fields, deliveries):
+        """
+        Moves an Act we can't perform to the dead letter stream
+        """
+
+        self.logger.warning("act dead", extra={"act": {"id": id, "deliveries": deliveries}})
+        service.ACTS_DEAD.inc()
+
+        await self.redis.xadd("ledger/act/dead", {
+            **(fields or {}),
+            "id": id,
+            "group": self.group,
+            "deliveries": deliveries
+        })
+        await self.redis.xack("ledger/act", self.group, id)
+
+    async def on_recover(self):
+        """
+        Periodically recovers Acts stuck pending
+        """
+
+        while True:
+
+            await asyncio.sleep(self.act_idle)
+
+            try:
+                await self.recover_acts()
+            except Exception: # pylint: disable=broad-except
+                self.logger.exception("act recovery failed")
 
     async def setup_hook(self):
         """
         Register our Fact and Act listeners
         """
 
-        self.origin = unum_ledger.Origin.one(who=service.WHO).retrieve(False)
+        # Lets profiling reach the loop for task stacks
+
+        self.daemon.loop = self.loop
+
+        start = phase = time.time()
+
+        def mark(name):
+            nonlocal phase
+            now = time.time()
+            service.STARTUP_LATENCY.labels(name).set(now - phase)
+            phase = now
+
+        self.origin = await self.ledger(unum_ledger.Origin.one(who=service.WHO).retrieve, False)
 
         if not self.origin:
             self.origin = await self.journal_change("create", unum_ledger.Origin(who=service.WHO))
 
-        await self.journal_change("update", self.origin, {"meta": {**yaml.safe_load(service.META), **{"guild": self.guild}}})
+        mark("origin")
+
+        # Only write meta, and Journal it to everyone, if it actually changed
+
+        meta = {**yaml.safe_load(service.META), **{"guild": self.guild}}
+
+        if meta_hash(self.origin.meta or {}) != meta_hash(meta):
+            await self.journal_change("update", self.origin, {"meta": meta})
+
+        mark("meta")
 
+        # Note where the Journal is before loading so nothing's missed in between
+
+        last = await self.reader.position()
+
+        loaded = await self.load_models(mark)
+
+        self.loop.create_task(self.on_lag())
+        await self.reader.start(last, self.journal_idle)
+
+        self.loop.create_task(self.on_journal())
         self.loop.create_task(self.on_acts())
 
+        service.STARTUP_LATENCY.labels("setup").set(time.time() - start)
+        self.started = time.time()
+
+        self.logger.info("setup", extra={"setup": {"seconds": time.time() - start, **loaded}})
+
+    async def load_models(self, mark=None):
+        """
+        Loads every local read model from the Ledger, at startup or if our Journal group went missing
+        """
+
+        mark = mark or (lambda name: None)
+
+        found, apps, origins, awards, tasks = await asyncio.gather(
+            self.ledger(unum_ledger.Witness.many(origin_id=self.origin.id).retrieve),
+            self.ledger(unum_ledger.App.many().retrieve),
+            self.ledger(unum_ledger.Origin.many().retrieve),
+            self.ledger(unum_ledger.Award.many(status__in=AWARDS_OPEN).retrieve),
+            self.ledger(unum_ledger.Task.many(status__in=TASKS_OPEN).retrieve)
+        )
+
+        mark("prefetch")
+
+        self.witnesses.load(found, origin_id=self.origin.id)
+        self.registry.load("app", apps)
+        self.registry.load("origin", origins)
+        self.awards.load(award.export() for award in awards)
+        self.tasks.load(task.export() for task in tasks)
+
+        mark("load")
+
+        # Statuses of everyone we witness, so activity checks don't wait on the Ledger
+
+        entity_ids = list(self.witnesses.whos)
+
+        entities, heralds = [], []
+
+        if entity_ids:
+            entities, heralds = await asyncio.gather(
+                self.ledger(unum_ledger.Entity.many(id__in=entity_ids).retrieve),
+                self.ledger(unum_ledger.Herald.many(entity_id__in=entity_ids).retrieve)
+            )
+
+        self.statuses.load(entities, heralds)
+
+        mark("statuses")
+
+        self.helps.clear()
+
+        return {
+            "witnesses": len(found),
+            "apps": len(apps),
+            "awards": len(awards),
+            "tasks": len(tasks),
+            "statuses": len(self.statuses)
+        }
+
 
 def run(daemon):
     """
@@ -2028,5 +2801,7 @@ def run(daemon):
     intents.members = True
     intents.message_content = True # pylint: disable=assigning-non-slot
 
+    logging.getLogger("discord.http").addFilter(RateLimits())
+
     client = OriginClient(daemon=daemon, intents=intents)
     client.run(daemon.creds["token"])
@@ -0,0 +1,230 @@
+"""
+Module for compiled command usage matching
+"""
+
+# pylint: disable=redefined-builtin
+
+import collections.abc
+
+from emoji import EMOJI_DATA
+
+import specs
+
+
+class Usage:
+    """
+    A single usage compiled once
+    """
+
+    def __init__(self, index, command, spec):
+
+        self.index = index
+        self.command = command
+        self.spec = spec
+        self.name = spec["name"]
+        self.meme = spec["meme"]
+        self.args = spec.get("args", [])
+
+        self.remainder = bool(self.args) and self.args[-1].get("format") == "remainder"
+        self.wrong = f"wrong usage - try {self.meme}{command}"
+
+        # name, format, valid values in order for messages, valid values as a set for lookups
+
+        self.parsers = []
+
+        for arg in self.args:
+
+            options = arg.get("valids") or []
+
+            if options and isinstance(options[0], collections.abc.Mapping):
+                options = [list(valid.keys())[0] for valid in options]
+
+            self.parsers.append((arg["name"], arg.get("format", "word"), options, frozenset(options)))
+
+        # If the first arg is a word with valids, only those can start a match
+
+        first = self.parsers[0] if self.parsers else None
+        self.literals = first[3] if first and first[1] == "word" and first[2] else None
+
+    def evaluate(self, meme, text, valids, decode_time):
+        """
+        Parses text the way parse_usage always has, returning values, errors, error
+        """
+
+        values = {}
+        errors = {}
+
+        if meme != self.meme:
+            return values, errors, self.wrong
+
+        if not self.args and text:
+            return values, errors, "less args than text"
+
+        current = text
+
+        for name, format, options, lookup in self.parsers:
+
+            if not current:
+                errors[name] = "missing value"
+                break
+
+            pieces = current.split(maxsplit=1)
+            piece = pieces.pop(0)
+
+            if name in valids:
+                options = lookup = valids[name]
+
+            if format == "word":
+                if not options:
+                    values[name] = piece
+                elif piece in lookup:
+                    values[name] = piece
+                else:
+                    joined = ', '.join(options)
+                    errors[name] = f"{piece} is not in {joined}"
+            elif format == "remainder":
+                values[name] = current
+                pieces = []
+            elif format == "emoji":
+                if piece in EMOJI_DATA:
+                    values[name] = piece
+                else:
+                    errors[name] = f"{pieces} is not a single emoji"
+            elif format == "duration":
+                seconds = decode_time(piece)
+                if seconds:
+                    values[name] = seconds
+                else:
+                    errors[name] = f"{piece} is not in duration format, ie 3d2h1m = 3 days 2 hours 1 min"
+            elif format == "user":
+                if piece.startswith("{entity:") and piece.endswith("}"):
+                    values[name] = int(piece[1:-1].split(":")[-1])
+                elif piece.startswith("<@") and piece.endswith(">"):
+                    errors[name] = f"{piece} hasn't joined"
+                else:
+                    errors[name] = f"{piece} is not a user"
+
+            current = pieces.pop(0) if pieces else ""
+
+        return values, errors, "more text than args" if current else None
+
+
+class UsageMatcher:
+    """
+    All the usages of a command, with a decision table by meme and leading literal
+    """
+
+    def __init__(self, command, decode_time):
+
+        self.usages = command.get("usages")
+        self.decode_time = decode_time
+        self.compiled = [Usage(index, command["name"], spec) for index, spec in enumerate(self.usages or [])]
+
+        # For each meme, what can match no text, what a leading literal can match,
+        # and what anything else can match
+
+        self.empty = {}
+        self.literals = {}
+        self.open = {}
+
+        for usage in self.compiled:
+
+            if not usage.args:
+                self.empty.setdefault(usage.meme, []).append(usage)
+            elif usage.literals is not None:
+                for literal in usage.literals:
+                    self.literals.setdefault((usage.meme, literal), []).append(usage)
+            else:
+                self.open.setdefault(usage.meme, []).append(usage)
+
+    def candidates(self, meme, text, valids):
+        """
+        Only the usages that could possibly be valid
+        """
+
+        if valids:
+            return [usage for usage in self.compiled if usage.meme == meme]
+
+        if not text:
+            return self.empty.get(meme, [])
+
+        literal = text.split(maxsplit=1)[0]
+
+        return sorted(
+            self.literals.get((meme, literal), []) + self.open.get(meme, []),
+            key=lambda usage: usage.index
+        )
+
+    def match(self, meme, text, valids=None):
+        """
+        Returns what to add to the what, same as parse_usage always has
+        """
+
+        valids = valids or {}
+        results = {}
+
+        for usage in self.candidates(meme, text, valids):
+            results[usage.index] = usage.evaluate(meme, text, valids, self.decode_time)
+
+        passed = [usage for usage in self.compiled if usage.index in results and
+            not results[usage.index][1] and results[usage.index][2] is None
+        ]
+
+        # Sort remainders by number of args. The one that matches with
+        # the most args is the best match since remainder can catch
+        # anything.
+
+        remainders = sorted([usage for usage in passed if usage.remainder],
+            key=lambda usage: len(usage.args), reverse=True)
+
+        valid = [usage for usage in passed if not usage.remainder]
+
+        # If we can one valid, that's it
+
+        if len(valid) == 1:
+            return {"usage": valid[0].name, "values": results[valid[0].index][0]}
+
+        # if there's one remainder, or if there more than one remainder and
+        # the top one has more args than the nex, that's it
+
+        if len(remainders) == 1 or (
+            len(remainders) > 1 and len(remainders[0].args) > len(remainders[1].args)
+        ):
+            return {"usage": remainders[0].name, "values": results[remainders[0].index][0]}
+
+        # Nope, too many good ones
+
+        if len(valid) > 1 or len(remainders):
+            names = " and ".join([usage.name for usage in valid + remainders])
+            return {"error": f"too many valid usages: {names}"}
+
+        if not self.compiled:
+            return {"error": "no usage found"}
+
+        # Nothing passed so everything's invalid. Only now do we need the
+        # details of the ones we skipped.
+
+        for usage in self.compiled:
+            if usage.index not in results:
+                results[usage.index] = usage.evaluate(meme, text, valids, self.decode_time)
+
+        # The closest is the one with the fewest errors, but the args and errors
+        # reported have always been those of the last usage
+
+        closest = min(self.compiled, key=lambda close: len(results[close.index][1]))
+        last = self.compiled[-1]
+
+        found = {"usage": closest.name}
+
+        if "args" in last.spec:
+            found["args"] = [
+                {**specs.thaw(arg), "valids": valids[arg["name"]]} if arg["name"] in valids else specs.thaw(arg)
+                for arg in last.args
+            ]
+
+        if results[last.index][2] is not None:
+            found["error"] = results[last.index][2]
+
+        found["errors"] = results[last.index][1]
+
+        return found
@@ -0,0 +1,89 @@
+"""
+Module for the Witness identity map
+"""
+
+
+class WitnessMap:
+    """
+    Discord user id to Entity id, and back, for the Witnesses of an Origin
+    """
+
+    def __init__(self, origin_id=None):
+
+        self.origin_id = origin_id
+        self.entity_ids = {}
+        self.whos = {}
+        self.ids = {}
+
+    def __len__(self):
+
+        return len(self.ids)
+
+    def load(self, witnesses, origin_id=None):
+        """
+        Replaces everything with a bulk retrieve
+        """
+
+        if origin_id is not None:
+            self.origin_id = origin_id
+
+        self.entity_ids = {}
+        self.whos = {}
+        self.ids = {}
+
+        for witness in witnesses:
+            self.add(witness.id, witness.who, witness.entity_id)
+
+    def add(self, id, who, entity_id):
+        """
+        Adds or replaces a single Witness
+        """
+
+        self.discard(id)
+
+        who = str(who)
+
+        self.ids[id] = who
+        self.entity_ids[who] = entity_id
+        self.whos[entity_id] = who
+
+    def discard(self, id):
+        """
+        Removes a Witness if we have it
+        """
+
+        who = self.ids.pop(id, None)
+
+        if who is None:
+            return
+
+        entity_id = self.entity_ids.pop(who, None)
+
+        if self.whos.get(entity_id) == who:
+            del self.whos[entity_id]
+
+    def apply(self, what):
+        """
+        Applies a Journal what for a Witness
+        """
+
+        self.discard(what["id"])
+
+        after = what.get("after")
+
+        if what["action"] != "delete" and after and after.get("origin_id") == self.origin_id:
+            self.add(what["id"], after["who"], after["entity_id"])
+
+    def entity_id(self, who):
+        """
+        Entity id for a Discord user id, None if not a Witness
+        """
+
+        return self.entity_ids.get(str(who))
+
+    def who(self, entity_id):
+        """
+        Discord user id for an Entity id, None if not a Witness
+        """
+
+        return self.whos.get(entity_id)
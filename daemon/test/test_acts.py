@@ -0,0 +1,83 @@
+import unittest
+import unittest.mock
+import asyncio
+
+import acts
+
+
+class TestActConsumer(unittest.IsolatedAsyncioTestCase):
+
+    maxDiff = None
+
+    async def asyncSetUp(self):
+
+        self.handled = []
+        self.running = 0
+        self.most = 0
+
+        async def handle(id, instance):
+
+            self.running += 1
+            self.most = max(self.most, self.running)
+
+            await asyncio.sleep(instance.get("sleep", 0))
+
+            self.running -= 1
+
+            if instance.get("fail"):
+                raise Exception("whoops")
+
+            self.handled.append(id)
+
+        self.logger = unittest.mock.MagicMock()
+        self.acts = acts.ActConsumer(handle, concurrency=2, backlog=3, logger=self.logger)
+
+    async def test_submit(self):
+
+        self.acts.submit(1, "1-a", {"sleep": 0.03})
+        self.acts.submit(2, "2-a", {"sleep": 0.01})
+        self.acts.submit(1, "1-b", {})
+
+        self.assertEqual(len(self.acts.tails), 2)
+        self.assertEqual(self.acts.ids, {"1-a", "2-a", "1-b"})
+
+        await self.acts.drain()
+
+        self.assertEqual(self.handled, ["2-a", "1-a", "1-b"])
+        self.assertEqual(self.acts.tails, {})
+        self.assertEqual(self.acts.ids, set())
+        self.assertEqual(self.acts.queued, 0)
+        self.assertEqual(self.acts.inflight, 0)
+
+    async def test_run(self):
+
+        for index in range(5):
+            self.acts.submit(index, f"{index}", {"sleep": 0.01})
+
+        await self.acts.drain()
+
+        self.assertEqual(self.most, 2)
+        self.assertEqual(len(self.handled), 5)
+
+    async def test_run_fail(self):
+
+        self.acts.submit(1, "1-a", {"fail": True})
+        self.acts.submit(1, "1-b", {})
+
+        await self.acts.drain()
+
+        self.assertEqual(self.handled, ["1-b"])
+        self.logger.exception.assert_called_once_with("act failed", extra={"act": {"id": "1-a"}})
+
+    async def test_room(self):
+
+        for index in range(3):
+            self.acts.submit(index, f"{index}", {"sleep": 0.01})
+
+        self.assertEqual(len(self.acts.outstanding), 3)
+
+        await self.acts.room()
+
+        self.assertLess(len(self.acts.outstanding), 3)
+
+        await self.acts.drain()
@@ -0,0 +1,58 @@
+import unittest
+import types
+
+import codec
+import witnesses
+
+
+class TestTextCodec(unittest.TestCase):
+
+    maxDiff = None
+
+    def setUp(self):
+
+        self.witnesses = witnesses.WitnessMap(origin_id=1)
+        self.witnesses.add(1, 100, 10)
+        self.witnesses.add(2, 200, 20)
+
+        self.codec = codec.TextCodec(self.witnesses)
+        self.codec.load_channels([
+            types.SimpleNamespace(id=7, name="general"),
+            types.SimpleNamespace(id=8, name="unifist-unum"),
+            types.SimpleNamespace(id=9, name="general")
+        ])
+
+    def test_load_channels(self):
+
+        self.assertEqual(self.codec.channel_names, {"7": "general", "8": "unifist-unum", "9": "general"})
+        self.assertEqual(self.codec.channel_ids, {"general": "7", "unifist-unum": "8"})
+        self.assertEqual({name: channel.id for name, channel in self.codec.channels.items()}, {"general": 7, "unifist-unum": 8})
+
+    def test_channel(self):
+
+        self.assertEqual(self.codec.channel("general").id, 7)
+        self.assertIsNone(self.codec.channel("nope"))
+
+    def test_decode(self):
+
+        self.assertEqual(
+            self.codec.decode("hey <@100> and <@300> see <#8> and <#9> not <#6>"),
+            "hey {entity:10} and <@300> see {channel:unifist-unum} and {channel:general} not <#6>"
+        )
+
+        self.assertEqual(self.codec.decode("plain"), "plain")
+
+    def test_encode(self):
+
+        self.assertEqual(
+            self.codec.encode("hey {entity:20} and {entity:30} {entity:x} in {channel:general} not {channel:nope}"),
+            "hey <@200> and {entity:30} {entity:x} in <#7> not {channel:nope}"
+        )
+
+        self.assertEqual(self.codec.encode("plain"), "plain")
+
+    def test_round_trip(self):
+
+        text = "<@100> scatted in <#8> about <@200>"
+
+        self.assertEqual(self.codec.encode(self.codec.decode(text)), text)
@@ -0,0 +1,98 @@
+import unittest
+import unittest.mock
+
+import dedup
+
+
+class MockRedis:
+
+    def __init__(self):
+
+        self.keys = {}
+
+    async def set(self, name, value, nx=False, ex=None):
+
+        if nx and name in self.keys:
+            return None
+
+        self.keys[name] = (value, ex)
+
+        return True
+
+    async def delete(self, name):
+
+        self.keys.pop(name, None)
+
+
+class TestBloomFilter(unittest.TestCase):
+
+    maxDiff = None
+
+    def test___init__(self):
+
+        bloom = dedup.BloomFilter(1000)
+
+        self.assertEqual(bloom.bits, 14377)
+        self.assertEqual(bloom.hashes, 10)
+        self.assertEqual(len(bloom.current), 1798)
+
+    def test_add(self):
+
+        bloom = dedup.BloomFilter(1000)
+
+        for index in range(1000):
+            bloom.add(f"message:{index}")
+
+        for index in range(1000):
+            self.assertIn(f"message:{index}", bloom)
+
+        false = sum(f"reaction:{index}" in bloom for index in range(10000))
+
+        self.assertLess(false, 50)
+
+    def test_generations(self):
+
+        bloom = dedup.BloomFilter(2)
+
+        bloom.add("a")
+        bloom.add("b")
+        bloom.add("c")
+
+        self.assertIn("a", bloom)
+        self.assertIn("c", bloom)
+        self.assertEqual(bloom.count, 1)
+
+        bloom.add("d")
+        bloom.add("e")
+
+        self.assertNotIn("a", bloom)
+        self.assertIn("d", bloom)
+
+
+class TestDedup(unittest.IsolatedAsyncioTestCase):
+
+    maxDiff = None
+
+    async def test_claim(self):
+
+        redis = MockRedis()
+        fact = dedup.Dedup(redis, ttl=60, size=100)
+
+        self.assertFalse(fact.seen("1:message:2"))
+        self.assertTrue(await fact.claim("1:message:2"))
+        self.assertTrue(fact.seen("1:message:2"))
+        self.assertFalse(await fact.claim("1:message:2"))
+
+        self.assertEqual(redis.keys, {"discord/dedup/1:message:2": (1, 60)})
+
+        # Another replica's claim shows up even though we've not seen it
+
+        other = dedup.Dedup(redis, ttl=60, size=100)
+
+        self.assertFalse(other.seen("1:message:2"))
+        self.assertFalse(await other.claim("1:message:2"))
+
+        await fact.release("1:message:2")
+
+        self.assertEqual(redis.keys, {})
+        self.assertTrue(await fact.claim("1:message:2"))
@@ -0,0 +1,103 @@
+import unittest
+import unittest.mock
+import asyncio
+
+import ingest
+
+
+class TestIngest(unittest.IsolatedAsyncioTestCase):
+
+    maxDiff = None
+
+    async def asyncSetUp(self):
+
+        self.handled = []
+        self.running = 0
+        self.most = 0
+        self.waits = []
+        self.sheds = []
+
+        self.logger = unittest.mock.MagicMock()
+        self.ingest = ingest.Ingest(
+            size=3, workers=2, logger=self.logger,
+            waited=lambda kind, seconds: self.waits.append(kind),
+            shed=self.sheds.append
+        )
+
+    async def handle(self, name):
+
+        self.running += 1
+        self.most = max(self.most, self.running)
+
+        await asyncio.sleep(0.01)
+
+        self.running -= 1
+
+        if name == "fail":
+            raise Exception("whoops")
+
+        self.handled.append(name)
+
+    async def test_put(self):
+
+        self.assertTrue(self.ingest.put("chatter", self.handle, "a"))
+        self.assertTrue(self.ingest.put("chatter", self.handle, "b"))
+        self.assertTrue(self.ingest.put("command", self.handle, "c"))
+
+        self.assertEqual(self.ingest.depth, 3)
+        self.assertEqual(len(self.ingest.running), 2)
+
+        self.assertFalse(self.ingest.put("chatter", self.handle, "d"))
+        self.assertTrue(self.ingest.put("command", self.handle, "e"))
+        self.assertEqual(self.sheds, ["chatter", "chatter"])
+
+        self.assertTrue(self.ingest.put("command", self.handle, "f"))
+        self.assertFalse(self.ingest.put("command", self.handle, "g"))
+        self.assertEqual(self.sheds, ["chatter", "chatter", "chatter", "command"])
+
+        await self.ingest.drain()
+
+        self.assertEqual(self.handled, ["c", "e", "f"])
+        self.assertEqual(self.waits, ["command", "command", "command"])
+        self.assertEqual(self.most, 2)
+        self.assertEqual(self.ingest.depth, 0)
+        self.assertEqual(self.ingest.running, set())
+
+    async def test_take(self):
+
+        self.ingest.queues["chatter"].append((1, self.handle, ("a",)))
+        self.ingest.queues["command"].append((2, self.handle, ("b",)))
+
+        self.assertEqual(self.ingest.take(), ("command", 2, self.handle, ("b",)))
+        self.assertEqual(self.ingest.take(), ("chatter", 1, self.handle, ("a",)))
+        self.assertIsNone(self.ingest.take())
+
+    async def test_put_after_drained(self):
+
+        self.ingest = ingest.Ingest(size=3, workers=1, logger=self.logger)
+
+        async def handle(name):
+            self.handled.append(name)
+
+            if name == "a":
+                asyncio.get_running_loop().call_soon(self.ingest.put, "chatter", handle, "b")
+
+        self.ingest.put("chatter", handle, "a")
+
+        await self.ingest.drain()
+        await asyncio.sleep(0)
+        await self.ingest.drain()
+
+        self.assertEqual(self.handled, ["a", "b"])
+        self.assertEqual(self.ingest.depth, 0)
+        self.assertEqual(self.ingest.running, set())
+
+    async def test_work(self):
+
+        self.ingest.put("command", self.handle, "fail")
+        self.ingest.put("chatter", self.handle, "b")
+
+        await self.ingest.drain()
+
+        self.assertEqual(self.handled, ["b"])
+        self.logger.exception.assert_called_once_with("ingest failed", extra={"ingest": {"kind": "command"}})
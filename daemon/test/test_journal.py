@@ -0,0 +1,261 @@
+import unittest
+import unittest.mock
+
+import json
+
+import journal
+
+
+class MockRedis:
+
+    def __init__(self):
+
+        self.entries = []
+        self.groups = {}
+        self.consumers = {}
+        self.destroyed = []
+        self.acked = []
+
+    async def exists(self, stream):
+
+        return int(bool(self.entries or self.groups))
+
+    async def xrevrange(self, stream, count=None):
+
+        return list(reversed(self.entries))[:count]
+
+    async def xinfo_groups(self, stream):
+
+        return [{"name": name, **info} for name, info in self.groups.items()]
+
+    async def xinfo_stream(self, stream):
+
+        return {"entries-added": len(self.entries)}
+
+    async def xinfo_consumers(self, stream, group):
+
+        return self.consumers.get(group, [])
+
+    async def xgroup_create(self, stream, group, id="$", mkstream=False):
+
+        self.groups[group] = {"last-delivered-id": id, "lag": None}
+
+    async def xgroup_setid(self, stream, group, id):
+
+        self.groups[group]["last-delivered-id"] = id
+
+    async def xgroup_destroy(self, stream, group):
+
+        self.destroyed.append(group)
+
+    async def xreadgroup(self, group, consumer, streams, count=None, block=None):
+
+        if group not in self.groups:
+            raise Exception("NOGROUP No such key 'ledger/journal' or consumer group")
+
+        last = self.groups[group]["last-delivered-id"]
+        entries = [entry for entry in self.entries if entry[0] > last][:count]
+
+        if not entries:
+            return []
+
+        self.groups[group]["last-delivered-id"] = entries[-1][0]
+
+        return [["ledger/journal", entries]]
+
+    async def xack(self, stream, group, *ids):
+
+        self.acked.extend(ids)
+
+    async def xrange(self, stream, min, max, count=None):
+
+        return [entry for entry in self.entries if entry[0] > min[1:]][:count]
+
+
+class TestJournalWriter(unittest.IsolatedAsyncioTestCase):
+
+    maxDiff = None
+
+    async def asyncSetUp(self):
+
+        self.writes = []
+
+        async def write(entries):
+            self.writes.append(entries)
+
+        self.journal = journal.JournalWriter(write)
+
+    async def test_batch(self):
+
+        async with self.journal.batch():
+
+            await self.journal.add({"who": "a"})
+            await self.journal.add({"who": "b"})
+
+            self.assertEqual(self.writes, [])
+
+        self.assertEqual(self.writes, [[{"who": "a"}, {"who": "b"}]])
+        self.assertIsNone(journal.BATCH.get())
+
+    async def test_batch_error(self):
+
+        with self.assertRaises(Exception):
+            async with self.journal.batch():
+                await self.journal.add({"who": "a"})
+                raise Exception("whoops")
+
+        self.assertEqual(self.writes, [[{"who": "a"}]])
+
+    async def test_add(self):
+
+        await self.journal.add({"who": "a"})
+
+        self.assertEqual(self.writes, [[{"who": "a"}]])
+
+    async def test_flush(self):
+
+        async with self.journal.batch():
+
+            await self.journal.add({"who": "a"})
+            await self.journal.flush()
+            await self.journal.flush()
+
+            self.assertEqual(self.writes, [[{"who": "a"}]])
+
+            await self.journal.add({"who": "b"})
+
+        self.assertEqual(self.writes, [[{"who": "a"}], [{"who": "b"}]])
+
+
+class TestJournalReader(unittest.IsolatedAsyncioTestCase):
+
+    maxDiff = None
+
+    async def asyncSetUp(self):
+
+        self.redis = MockRedis()
+        self.logger = unittest.mock.MagicMock()
+        self.reader = journal.JournalReader(self.redis, "discord-daemon/pod", "pod", self.logger, clock=lambda: 10)
+
+        self.applied = []
+        self.reader.register("witness", self.applied.append)
+        self.reader.register("witness", lambda what: self.applied.append("again"))
+
+    def add(self, id, what, when=7):
+
+        self.redis.entries.append((id, {"journal": json.dumps({"what": what, "when": when})}))
+
+    async def test_apply(self):
+
+        self.reader.apply({"block": "witness", "id": 1})
+        self.reader.apply({"block": "app", "id": 2})
+
+        self.assertEqual(self.applied, [{"block": "witness", "id": 1}, "again"])
+
+    async def test_position(self):
+
+        self.assertEqual(await self.reader.position(), "0-0")
+
+        self.add("1-1", {})
+        self.add("1-2", {})
+
+        self.assertEqual(await self.reader.position(), "1-2")
+
+    async def test_start(self):
+
+        await self.reader.start("1-1", idle=60)
+
+        self.assertEqual(self.redis.groups, {"discord-daemon/pod": {"last-delivered-id": "1-1", "lag": None}})
+        self.assertEqual(self.reader.last, "1-1")
+
+        self.redis.groups["discord-daemon/gone"] = {}
+        self.redis.groups["discord-daemon/live"] = {}
+        self.redis.groups["discord-daemon/starting"] = {}
+        self.redis.groups["other/gone"] = {}
+        self.redis.consumers = {
+            "discord-daemon/gone": [{"name": "gone", "idle": 61000}],
+            "discord-daemon/live": [{"name": "live", "idle": 500}],
+            "other/gone": [{"name": "gone", "idle": 61000}]
+        }
+
+        await self.reader.start("1-3", idle=60)
+
+        self.assertEqual(self.redis.groups["discord-daemon/pod"]["last-delivered-id"], "1-3")
+        self.assertEqual(self.redis.destroyed, ["discord-daemon/gone"])
+
+    async def test_read(self):
+
+        await self.reader.start("0-0", idle=60)
+
+        self.assertEqual(await self.reader.read(), 0)
+
+        self.add("1-1", {"block": "witness", "id": 1})
+        self.add("1-2", {"block": "app", "id": 2}, when=4)
+        self.redis.entries.append(("1-3", {"other": "thing"}))
+
+        self.assertEqual(await self.reader.read(count=2), 2)
+        self.assertEqual(self.applied, [{"block": "witness", "id": 1}, "again"])
+        self.assertEqual(self.reader.last, "1-2")
+        self.assertEqual(self.reader.delay, 6)
+        self.assertEqual(self.redis.acked, ["1-1", "1-2"])
+
+        self.assertEqual(await self.reader.read(), 1)
+        self.assertEqual(self.reader.last, "1-3")
+
+        self.reader.register("app", unittest.mock.MagicMock(side_effect=Exception("whoops")))
+        self.add("1-4", {"block": "app", "id": 2})
+
+        self.assertEqual(await self.reader.read(), 1)
+        self.logger.exception.assert_called_once_with("journal apply failed", extra={"journal": {"id": "1-4"}})
+
+        self.assertEqual(await self.reader.read(), 0)
+        self.assertEqual(self.reader.delay, 0)
+
+    async def test_recover(self):
+
+        reload = unittest.mock.AsyncMock()
+        self.reader.reload = reload
+
+        self.add("1-1", {"block": "witness", "id": 1})
+
+        self.assertEqual(await self.reader.read(), 0)
+
+        reload.assert_awaited_once_with()
+        self.assertEqual(self.redis.groups, {"discord-daemon/pod": {"last-delivered-id": "1-1", "lag": None}})
+        self.assertEqual(self.reader.last, "1-1")
+        self.logger.warning.assert_called_once_with("journal group missing", extra={"group": "discord-daemon/pod"})
+
+        self.add("1-2", {"block": "witness", "id": 2})
+
+        self.assertEqual(await self.reader.read(), 1)
+        self.assertEqual(self.applied, [{"block": "witness", "id": 2}, "again"])
+
+        self.redis.groups = {}
+        self.redis.xreadgroup = unittest.mock.AsyncMock(side_effect=Exception("WRONGTYPE"))
+
+        with self.assertRaisesRegex(Exception, "WRONGTYPE"):
+            await self.reader.read()
+
+    async def test_measure(self):
+
+        await self.reader.start("0-0", idle=60)
+
+        self.add("1-1", {})
+        self.add("1-2", {})
+
+        self.assertEqual(await self.reader.measure(), 2)
+
+        self.redis.groups["discord-daemon/pod"]["entries-read"] = 1
+
+        self.assertEqual(await self.reader.measure(), 1)
+
+        self.redis.groups["discord-daemon/pod"]["lag"] = 5
+
+        self.assertEqual(await self.reader.measure(), 5)
+
+        self.redis.groups["discord-daemon/pod"] = {"last-delivered-id": "0-0", "lag": None}
+
+        for index in range(3, 8):
+            self.add(f"1-{index}", {})
+
+        self.assertEqual(await self.reader.measure(limit=3), 3)
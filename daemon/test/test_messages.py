@@ -0,0 +1,62 @@
+import unittest
+import types
+
+import messages
+
+
+class TestMessageCache(unittest.TestCase):
+
+    maxDiff = None
+
+    def setUp(self):
+
+        self.messages = messages.MessageCache(2)
+
+    def test_add(self):
+
+        one = types.SimpleNamespace(id=1)
+        two = types.SimpleNamespace(id=2)
+        three = types.SimpleNamespace(id=3)
+
+        self.messages.add(one, ({"base": "statement"}, {}))
+        self.messages.add(two)
+
+        self.assertIn("1", self.messages)
+        self.assertEqual(self.messages.parsed(1), ({"base": "statement"}, {}))
+
+        self.messages.add(one)
+
+        self.assertEqual(self.messages.parsed(1), ({"base": "statement"}, {}))
+
+        self.messages.add(three)
+
+        self.assertEqual(len(self.messages), 2)
+        self.assertIsNone(self.messages.get(2))
+        self.assertEqual(self.messages.get(1), one)
+        self.assertEqual(self.messages.get("3"), three)
+
+    def test_parsed(self):
+
+        what, meta = {"base": "statement"}, {"author": {"id": 1}}
+
+        self.messages.add(types.SimpleNamespace(id=1), (what, meta))
+
+        what["entity_id"] = 2
+        meta["author"]["name"] = "me"
+
+        parsed = self.messages.parsed(1)
+
+        self.assertEqual(parsed, ({"base": "statement"}, {"author": {"id": 1}}))
+
+        parsed[0]["entity_id"] = 3
+
+        self.assertEqual(self.messages.parsed(1), ({"base": "statement"}, {"author": {"id": 1}}))
+
+    def test_discard(self):
+
+        self.messages.add(types.SimpleNamespace(id=1))
+        self.messages.discard("1")
+        self.messages.discard(2)
+
+        self.assertEqual(len(self.messages), 0)
+        self.assertIsNone(self.messages.parsed(1))
@@ -0,0 +1,118 @@
+import unittest
+import unittest.mock
+import asyncio
+import collections
+import types
+
+import outbox
+
+
+class TestOutbox(unittest.IsolatedAsyncioTestCase):
+
+    maxDiff = None
+
+    async def asyncSetUp(self):
+
+        self.sent = []
+        self.running = 0
+        self.most = 0
+
+        async def send(channel, text, reference):
+
+            self.running += 1
+            self.most = max(self.most, self.running)
+
+            await asyncio.sleep(0.01)
+
+            self.running -= 1
+
+            if text == "fail":
+                raise Exception("whoops")
+
+            self.sent.append((channel.id, text, reference))
+
+            return types.SimpleNamespace(id=len(self.sent))
+
+        self.logger = unittest.mock.MagicMock()
+        self.outbox = outbox.Outbox(send, size=3, concurrency=2, logger=self.logger)
+
+    async def test_put(self):
+
+        one = types.SimpleNamespace(id=1)
+        two = types.SimpleNamespace(id=2)
+
+        first = await self.outbox.put(one, "a")
+        await self.outbox.put(one, "b", merge=False)
+        await self.outbox.put(two, "c")
+
+        self.assertEqual(self.outbox.depth, 3)
+
+        last = await self.outbox.put(one, "d")
+
+        self.assertLessEqual(self.outbox.depth, 3)
+
+        await self.outbox.drain()
+
+        self.assertEqual(self.sent, [(1, "a", None), (2, "c", None), (1, "b", None), (1, "d", None)])
+        self.assertEqual(first.result().id, 1)
+        self.assertEqual(last.result().id, 4)
+        self.assertEqual(self.outbox.depth, 0)
+        self.assertEqual(self.outbox.queues, {})
+        self.assertEqual(self.outbox.workers, {})
+
+    async def test_put_acts(self):
+
+        one = types.SimpleNamespace(id=1)
+
+        first = await self.outbox.put(one, "?task:1 {entity:1}, do it", merge=False)
+        second = await self.outbox.put(one, "?task:2 {entity:2}, do it", merge=False)
+
+        await self.outbox.drain()
+
+        self.assertEqual(self.sent, [(1, "?task:1 {entity:1}, do it", None), (1, "?task:2 {entity:2}, do it", None)])
+        self.assertEqual(first.result().id, 1)
+        self.assertEqual(second.result().id, 2)
+        self.assertEqual(self.outbox.merged, 0)
+
+    async def test_mergeable(self):
+
+        reference = types.SimpleNamespace(id=3)
+
+        self.assertTrue(outbox.Outbox.mergeable((None, "a", reference, True, None), (None, "b", 3, True, None)))
+        self.assertFalse(outbox.Outbox.mergeable((None, "a", reference, True, None), (None, "b", 4, True, None)))
+        self.assertFalse(outbox.Outbox.mergeable((None, "a", None, False, None), (None, "b", None, True, None)))
+        self.assertFalse(outbox.Outbox.mergeable((None, "a" * 1000, None, True, None), (None, "b" * 1000, None, True, None)))
+
+    async def test_take(self):
+
+        one = types.SimpleNamespace(id=1)
+        reference = types.SimpleNamespace(id=3)
+
+        queue = collections.deque([
+            (one, "a", reference, True, "1"),
+            (one, "b", reference, True, "2"),
+            (one, "c", None, True, "3")
+        ])
+        self.outbox.depth = 3
+
+        channel, text, taken, futures = self.outbox.take(queue)
+
+        self.assertEqual((channel, text, taken, futures), (one, "a\nb", reference, ["1", "2"]))
+        self.assertEqual(self.outbox.depth, 1)
+        self.assertEqual(self.outbox.merged, 1)
+
+    async def test_work(self):
+
+        one = types.SimpleNamespace(id=1)
+        two = types.SimpleNamespace(id=2)
+        three = types.SimpleNamespace(id=3)
+
+        failed = await self.outbox.put(one, "fail")
+        await self.outbox.put(two, "b")
+        await self.outbox.put(three, "c")
+
+        await self.outbox.drain()
+
+        self.assertRaisesRegex(Exception, "whoops", failed.result)
+        self.assertEqual(self.most, 2)
+        self.logger.exception.assert_called_once_with("send failed", extra={"send": {"channel": 1}})
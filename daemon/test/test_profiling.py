@@ -0,0 +1,120 @@
+import unittest
+import unittest.mock
+import asyncio
+import threading
+import tracemalloc
+import concurrent.futures
+
+import profiling
+
+
+def busy(stop):
+
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class TestProfiling(unittest.TestCase):
+
+    maxDiff = None
+
+    def test_cpu(self):
+
+        stop = threading.Event()
+        thread = threading.Thread(target=busy, args=(stop,), name="busy")
+        thread.start()
+
+        try:
+            folded = profiling.cpu(0.1, 0.005)
+        finally:
+            stop.set()
+            thread.join()
+
+        self.assertIn("busy;", folded)
+        self.assertIn("busy (", folded)
+
+        for line in folded.strip().split("\n"):
+            self.assertRegex(line, r" \d+$")
+
+    def test_memory(self):
+
+        kept = []
+
+        def allocate():
+            kept.extend(bytearray(1000) for _ in range(1000))
+
+        timer = threading.Timer(0.02, allocate)
+        timer.start()
+
+        text = profiling.memory(0.2)
+
+        timer.join()
+
+        self.assertIn("test_profiling.py", text)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_tasks(self):
+
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+
+        async def sleeper():
+            await asyncio.sleep(10)
+
+        try:
+            task = asyncio.run_coroutine_threadsafe(sleeper(), loop)
+            text = profiling.tasks(loop)
+        finally:
+            task.cancel()
+            concurrent.futures.wait([task])
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+        self.assertIn("sleeper", text)
+
+
+class TestProfilingApp(unittest.TestCase):
+
+    maxDiff = None
+
+    def setUp(self):
+
+        self.metrics = unittest.mock.MagicMock(return_value=[b"metrics"])
+        self.loop = None
+        self.app = profiling.ProfilingApp(self.metrics, lambda: self.loop)
+        self.start_response = unittest.mock.MagicMock()
+
+    def call(self, path, query=""):
+
+        return self.app({"PATH_INFO": path, "QUERY_STRING": query}, self.start_response)
+
+    def test___call__(self):
+
+        self.assertEqual(self.call("/metrics"), [b"metrics"])
+        self.metrics.assert_called_once()
+
+        self.call("/debug/cpu", "seconds=nope")
+        self.start_response.assert_called_with("400 Bad Request", [("Content-Type", "text/plain; charset=utf-8")])
+
+        self.call("/debug/cpu", "seconds=61")
+        self.start_response.assert_called_with("400 Bad Request", [("Content-Type", "text/plain; charset=utf-8")])
+
+        self.call("/debug/tasks")
+        self.start_response.assert_called_with("503 Service Unavailable", [("Content-Type", "text/plain; charset=utf-8")])
+
+        self.call("/debug/cpu", "seconds=0.01")
+        self.start_response.assert_called_with("200 OK", [
+            ("Content-Type", "text/plain; charset=utf-8"),
+            ("Content-Disposition", 'attachment; filename="cpu.folded"')
+        ])
+
+        self.app.lock.acquire()
+
+        try:
+            self.call("/debug/memory", "seconds=0.01")
+        finally:
+            self.app.lock.release()
+
+        self.start_response.assert_called_with("409 Conflict", [("Content-Type", "text/plain; charset=utf-8")])
@@ -0,0 +1,96 @@
+import unittest
+import types
+
+import registry
+
+
+class TestCommandRegistry(unittest.TestCase):
+
+    maxDiff = None
+
+    def setUp(self):
+
+        self.registry = registry.CommandRegistry()
+
+        self.registry.load("app", [
+            types.SimpleNamespace(id=2, who="people", meta={
+                "title": "People",
+                "channel": "people",
+                "commands": [{"name": "wave"}]
+            }),
+            types.SimpleNamespace(id=1, who="ledger", meta={
+                "title": "Ledger",
+                "channel": "unifist-unum",
+                "commands": [{"name": "fact"}, {"name": "act"}]
+            })
+        ])
+
+        self.registry.load("origin", [
+            types.SimpleNamespace(id=1, who="discord", meta={
+                "title": "Discord",
+                "channel": "unifist-unum",
+                "commands": [{"name": "help"}]
+            })
+        ])
+
+    def test_load(self):
+
+        self.registry.load("app", [])
+
+        self.assertEqual(list(self.registry.sources.keys()), [("origin", 1)])
+        self.assertEqual(list(self.registry.commands.keys()), [("origin", "discord", "help")])
+
+    def test_add(self):
+
+        self.registry.add("app", 2, "people", {"channel": "folks", "commands": [{"name": "hug"}]})
+
+        self.assertEqual(self.registry.apps(meta__channel="people"), [])
+        self.assertEqual([app.who for app in self.registry.apps(meta__channel="folks")], ["people"])
+        self.assertIsNone(self.registry.command("app", "people", "wave"))
+        self.assertEqual(self.registry.command("app", "people", "hug"), {"name": "hug"})
+
+    def test_discard(self):
+
+        self.registry.discard("app", 1)
+        self.registry.discard("app", 3)
+
+        self.assertEqual(self.registry.whos.get("ledger"), None)
+        self.assertEqual([source.kind for source in self.registry.channels["unifist-unum"]], ["origin"])
+        self.assertIsNone(self.registry.command("app", "ledger", "fact"))
+
+    def test_apply(self):
+
+        self.registry.apply("app", {
+            "action": "create",
+            "id": 3,
+            "after": {"id": 3, "who": "games", "meta": {"channel": "games", "commands": [{"name": "play"}]}}
+        })
+
+        self.assertEqual(self.registry.get("app", 3).channel, "games")
+        self.assertEqual(self.registry.command("app", "games", "play"), {"name": "play"})
+
+        self.registry.apply("app", {"action": "delete", "id": 3, "before": {}})
+
+        self.assertIsNone(self.registry.get("app", 3))
+
+    def test_command(self):
+
+        self.registry.add("app", 3, "discord", {"commands": [{"name": "help", "description": "app"}]})
+
+        self.assertEqual(self.registry.command("origin", "discord", "help"), {"name": "help"})
+        self.assertEqual(self.registry.command("app", "discord", "help"), {"name": "help", "description": "app"})
+
+        self.registry.discard("origin", 1)
+
+        self.assertIsNone(self.registry.command("origin", "discord", "help"))
+        self.assertEqual(self.registry.command("app", "discord", "help"), {"name": "help", "description": "app"})
+
+    def test_search(self):
+
+        self.assertEqual([app.who for app in self.registry.apps()], ["ledger", "people"])
+        self.assertEqual([app.who for app in self.registry.apps(who="people")], ["people"])
+        self.assertEqual([app.who for app in self.registry.apps(meta__channel="unifist-unum")], ["ledger"])
+        self.assertEqual(self.registry.origin(meta__channel="unifist-unum").who, "discord")
+        self.assertIsNone(self.registry.origin(meta__channel="people"))
+        self.assertEqual(self.registry.app("ledger").title, "Ledger")
+        self.assertIsNone(self.registry.app(None))
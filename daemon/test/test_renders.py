@@ -0,0 +1,33 @@
+import unittest
+
+import renders
+
+
+class TestRenderCache(unittest.TestCase):
+
+    maxDiff = None
+
+    def setUp(self):
+
+        self.renders = renders.RenderCache(2)
+
+    def test_add(self):
+
+        self.renders.add(("a",), ["1"])
+        self.renders.add(("b",), ["2", "3"])
+
+        self.assertEqual(self.renders.get(("a",)), ("1",))
+
+        self.renders.add(("c",), [])
+
+        self.assertEqual(len(self.renders), 2)
+        self.assertIsNone(self.renders.get(("b",)))
+        self.assertEqual(self.renders.get(("c",)), ())
+
+    def test_clear(self):
+
+        self.renders.add(("a",), ["1"])
+        self.renders.clear()
+
+        self.assertEqual(len(self.renders), 0)
+        self.assertIsNone(self.renders.get(("a",)))
@@ -0,0 +1,162 @@
+import unittest
+
+import rules
+
+
+FACT = {
+    "id": 7,
+    "entity_id": 1,
+    "what": {
+        "base": "command",
+        "origin": "discord",
+        "command": "help",
+        "usage": "command",
+        "kind": "public",
+        "channel": "general",
+        "apps": ["redmine", "ledger"],
+        "values": {
+            "command": "scat"
+        }
+    }
+}
+
+
+class TestPredicate(unittest.TestCase):
+
+    maxDiff = None
+
+    def test_condition(self):
+
+        self.assertEqual(rules.Predicate.condition("what__command", "help"), ("what", ("command",), "eq", False, "help"))
+        self.assertEqual(rules.Predicate.condition("what__channel__not_eq", "a"), ("what", ("channel",), "eq", True, "a"))
+        self.assertEqual(rules.Predicate.condition("what__apps__has", "a"), ("what", ("apps",), "has", False, ["a"]))
+        self.assertEqual(rules.Predicate.condition("what__channel", None), ("what", ("channel",), "null", False, True))
+        self.assertEqual(rules.Predicate.condition("status__in", ["a"]), ("status", (), "in", False, ["a"]))
+        self.assertEqual(rules.Predicate.condition("id", 1), ("id", (), "eq", False, 1))
+        self.assertEqual(rules.Predicate.condition("what__count__gte", 3), ("what", ("count",), "gte", False, 3))
+        self.assertEqual(rules.Predicate.condition("what__channel__not_like", "gen"), ("what", ("channel",), "like", True, "gen"))
+
+    def test_index(self):
+
+        self.assertEqual(rules.Predicate({
+            "what__base": "command",
+            "what__command": "help"
+        }).index(), ("what", ("command",), "help"))
+
+        self.assertEqual(rules.Predicate({
+            "what__apps__has": ["ledger"],
+            "what__base": "command"
+        }).index(), ("what", ("base",), "command"))
+
+        self.assertIsNone(rules.Predicate({"what__apps__has": ["ledger"]}).index())
+
+    def test___call__(self):
+
+        self.assertTrue(rules.Predicate({
+            "what__origin": "discord",
+            "what__base": "command",
+            "what__command": "help",
+            "what__values__command": "scat"
+        })(FACT))
+
+        self.assertTrue(rules.Predicate({
+            "what__apps__has": ["ledger"],
+            "what__kind": "public",
+            "what__channel__not_eq": "ledger"
+        })(FACT))
+
+        self.assertFalse(rules.Predicate({"what__channel__not_eq": "general"})(FACT))
+        self.assertFalse(rules.Predicate({"what__apps__has": ["ledger", "nope"]})(FACT))
+        self.assertTrue(rules.Predicate({"what__apps__any": ["ledger", "nope"]})(FACT))
+        self.assertFalse(rules.Predicate({"what__apps__all": ["ledger"]})(FACT))
+        self.assertTrue(rules.Predicate({"what__usage__in": ["command", "general"]})(FACT))
+        self.assertFalse(rules.Predicate({"what__missing": "a"})(FACT))
+        self.assertTrue(rules.Predicate({"what__missing__not_eq": "a"})(FACT))
+        self.assertTrue(rules.Predicate({"what__missing": None})(FACT))
+        self.assertFalse(rules.Predicate({"what__channel": None})(FACT))
+        self.assertTrue(rules.Predicate({"entity_id": 1})(FACT))
+
+    def test___call___ordering(self):
+
+        self.assertTrue(rules.Predicate({"what__count__gte": 3})({"what": {"count": 5}}))
+        self.assertTrue(rules.Predicate({"what__count__gte": 5})({"what": {"count": 5}}))
+        self.assertFalse(rules.Predicate({"what__count__gt": 5})({"what": {"count": 5}}))
+        self.assertTrue(rules.Predicate({"what__count__lt": 6})({"what": {"count": 5}}))
+        self.assertFalse(rules.Predicate({"what__count__lte": 4})({"what": {"count": 5}}))
+        self.assertTrue(rules.Predicate({"what__count__not_gt": 5})({"what": {"count": 5}}))
+        self.assertFalse(rules.Predicate({"what__count__gte": 3})({"what": {}}))
+        self.assertFalse(rules.Predicate({"what__count__gte": 3})({"what": {"count": "many"}}))
+
+    def test___call___strings(self):
+
+        self.assertTrue(rules.Predicate({"what__channel__like": "NER"})(FACT))
+        self.assertFalse(rules.Predicate({"what__channel__like": "nope"})(FACT))
+        self.assertTrue(rules.Predicate({"what__channel__start": "gen"})(FACT))
+        self.assertFalse(rules.Predicate({"what__channel__start": "ral"})(FACT))
+        self.assertTrue(rules.Predicate({"what__channel__end": "RAL"})(FACT))
+        self.assertTrue(rules.Predicate({"what__channel__not_end": "gen"})(FACT))
+
+
+class TestRuleIndex(unittest.TestCase):
+
+    maxDiff = None
+
+    def setUp(self):
+
+        self.rules = rules.RuleIndex(["requested", "accepted"])
+
+        self.rules.load([
+            {"id": 1, "entity_id": 1, "status": "requested", "what": {"fact": {"what__command": "help", "what__usage": "command"}}},
+            {"id": 2, "entity_id": 1, "status": "accepted", "what": {"fact": {"what__command": "scat"}}},
+            {"id": 3, "entity_id": 1, "status": "requested", "what": {"fact": {"what__apps__has": ["ledger"]}}},
+            {"id": 4, "entity_id": 2, "status": "requested", "what": {"fact": {"what__command": "help"}}},
+            {"id": 5, "entity_id": 1, "status": "completed", "what": {"fact": {"what__command": "help"}}},
+            {"id": 6, "entity_id": 1, "status": "requested", "what": {}}
+        ])
+
+    def test_load(self):
+
+        self.assertEqual(len(self.rules), 4)
+        self.assertEqual(self.rules.index[(1, "what", ("command",), "help")], {1})
+        self.assertEqual(self.rules.unindexed[1], {3})
+        self.assertEqual(self.rules.keys[("what", ("command",))], 3)
+
+    def test_discard(self):
+
+        self.rules.discard(1)
+        self.rules.discard(3)
+        self.rules.discard(4)
+        self.rules.discard(9)
+
+        self.assertEqual(len(self.rules), 1)
+        self.assertNotIn((1, "what", ("command",), "help"), self.rules.index)
+        self.assertNotIn(1, self.rules.unindexed)
+        self.assertEqual(self.rules.keys[("what", ("command",))], 1)
+
+    def test_apply(self):
+
+        self.rules.apply({
+            "action": "update",
+            "id": 1,
+            "after": {"id": 1, "entity_id": 1, "status": "completed", "what": {"fact": {"what__command": "help"}}}
+        })
+
+        self.assertNotIn(1, self.rules.rules)
+
+        self.rules.apply({
+            "action": "create",
+            "id": 7,
+            "after": {"id": 7, "entity_id": 1, "status": "requested", "what": {"fact": {"what__command": "help"}}}
+        })
+
+        self.assertIn(7, self.rules.rules)
+
+        self.rules.apply({"action": "delete", "id": 7, "before": {}})
+
+        self.assertNotIn(7, self.rules.rules)
+
+    def test_match(self):
+
+        self.assertEqual([record["id"] for record in self.rules.match(FACT)], [1, 3])
+        self.assertEqual([record["id"] for record in self.rules.match({**FACT, "entity_id": 2})], [4])
+        self.assertEqual(self.rules.match({**FACT, "entity_id": 3}), [])
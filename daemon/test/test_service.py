@@ -85,7 +85,7 @@ class TestDaemon(micro_logger_unittest.TestCase):
 
         self.daemon = service.Daemon()
 
-    @unittest.mock.patch.dict('os.environ', {"K8S_POD": "test", "SLEEP": "7", "LOG_LEVEL": "INFO"})
+    @unittest.mock.patch.dict('os.environ', {"K8S_POD": "test", "SLEEP": "7", "PROFILING": "true", "LEDGER_WORKERS": "3", "MESSAGE_CACHE_SIZE": "100", "HELP_CACHE_SIZE": "10", "ACT_CONCURRENCY": "4", "ACT_BATCH": "20", "ACT_IDLE": "30", "ACT_DELIVERIES": "3", "OUTBOX_SIZE": "50", "PAGE_SIZE": "5", "SEND_CONCURRENCY": "2", "DEDUP_TTL": "600", "DEDUP_SIZE": "1000", "INGEST_SIZE": "100", "INGEST_WORKERS": "4", "STATUS_TTL": "60", "JOURNAL_IDLE": "600", "LOG_LEVEL": "INFO"})
     @unittest.mock.patch("micro_logger.getLogger", micro_logger_unittest.MockLogger)
     @unittest.mock.patch('relations_rest.Source', relations.unittest.MockSource)
     @unittest.mock.patch('redis.Redis', MockRedis)
@@ -100,6 +100,24 @@ class TestDaemon(micro_logger_unittest.TestCase):
         self.assertEqual(daemon.group_id, "test")
 
         self.assertEqual(daemon.sleep, 7)
+        self.assertTrue(daemon.profiling)
+        self.assertIsNone(daemon.loop)
+        self.assertEqual(daemon.ledger_workers, 3)
+        self.assertEqual(daemon.message_cache_size, 100)
+        self.assertEqual(daemon.help_cache_size, 10)
+        self.assertEqual(daemon.act_concurrency, 4)
+        self.assertEqual(daemon.act_batch, 20)
+        self.assertEqual(daemon.act_idle, 30)
+        self.assertEqual(daemon.act_deliveries, 3)
+        self.assertEqual(daemon.outbox_size, 50)
+        self.assertEqual(daemon.page_size, 5)
+        self.assertEqual(daemon.send_concurrency, 2)
+        self.assertEqual(daemon.dedup_ttl, 600)
+        self.assertEqual(daemon.dedup_size, 1000)
+        self.assertEqual(daemon.ingest_size, 100)
+        self.assertEqual(daemon.ingest_workers, 4)
+        self.assertEqual(daemon.status_ttl, 60)
+        self.assertEqual(daemon.journal_idle, 600)
 
         self.assertEqual(daemon.logger.name, "discord-daemon")
 
@@ -115,3 +133,17 @@ class TestDaemon(micro_logger_unittest.TestCase):
         self.assertRaisesRegex(Exception, "loop", self.daemon.run)
 
         mock_prom.assert_called_once_with(80)
+
+    @unittest.mock.patch('profiling.start_http_server')
+    @unittest.mock.patch('unum_discord.run')
+    def test_run_profiling(self, mock_run, mock_profiling):
+
+        self.daemon.profiling = True
+        self.daemon.loop = "loop"
+        mock_run.side_effect = Exception("loop")
+
+        self.assertRaisesRegex(Exception, "loop", self.daemon.run)
+
+        mock_profiling.assert_called_once()
+        self.assertEqual(mock_profiling.call_args.args[0], 80)
+        self.assertEqual(mock_profiling.call_args.args[1](), "loop")
@@ -0,0 +1,50 @@
+import unittest
+import types
+
+import specs
+
+
+class TestSpecs(unittest.TestCase):
+
+    maxDiff = None
+
+    def test_freeze(self):
+
+        frozen = specs.freeze({
+            "name": "help",
+            "usages": [{"name": "general", "args": [{"name": "command", "valids": []}]}]
+        })
+
+        self.assertIsInstance(frozen, types.MappingProxyType)
+        self.assertIsInstance(frozen["usages"], tuple)
+        self.assertIsInstance(frozen["usages"][0]["args"][0]["valids"], tuple)
+
+        with self.assertRaises(TypeError):
+            frozen["name"] = "nope"
+
+    def test_thaw(self):
+
+        frozen = specs.freeze({
+            "name": "help",
+            "description": "Help for",
+            "examples": [
+                {"meme": "?", "description": "Lists all for"},
+                {"meme": "?", "kind": "private", "description": "Shows privately"}
+            ]
+        })
+
+        self.assertEqual(specs.thaw(frozen, " the Ledger"), {
+            "name": "help",
+            "description": "Help for the Ledger",
+            "examples": [
+                {"meme": "?", "description": "Lists all for the Ledger"},
+                {"meme": "?", "kind": "private", "description": "Shows privately"}
+            ]
+        })
+
+        thawed = specs.thaw(frozen)
+
+        self.assertIsInstance(thawed, dict)
+        self.assertIsInstance(thawed["examples"], list)
+        self.assertEqual(thawed["description"], "Help for")
+        self.assertEqual(frozen["description"], "Help for")
@@ -0,0 +1,78 @@
+import unittest
+import types
+
+import statuses
+
+
+class TestStatusCache(unittest.TestCase):
+
+    maxDiff = None
+
+    def setUp(self):
+
+        self.now = 100
+        self.cache = statuses.StatusCache(ttl=60, clock=lambda: self.now)
+
+        self.cache.load([
+            types.SimpleNamespace(id=1, status="active"),
+            types.SimpleNamespace(id=2, status="inactive")
+        ], [
+            types.SimpleNamespace(entity_id=1, app_id=3, status="active"),
+            types.SimpleNamespace(entity_id=2, app_id=3, status="inactive")
+        ])
+
+    def test_load(self):
+
+        self.assertEqual(len(self.cache), 4)
+        self.assertEqual(self.cache.entities, {1: (True, 100), 2: (False, 100)})
+        self.assertEqual(self.cache.heralds, {(1, 3): (True, 100), (2, 3): (False, 100)})
+
+        self.cache.load([types.SimpleNamespace(id=2, status="active")], [])
+
+        self.assertEqual(self.cache.entities, {2: (True, 100)})
+        self.assertEqual(self.cache.heralds, {})
+
+    def test_entity(self):
+
+        self.assertTrue(self.cache.entity(1))
+        self.assertFalse(self.cache.entity(2))
+        self.assertIsNone(self.cache.entity(4))
+
+        self.now = 161
+
+        self.assertIsNone(self.cache.entity(1))
+        self.assertNotIn(1, self.cache.entities)
+
+    def test_herald(self):
+
+        self.assertTrue(self.cache.herald(1, 3))
+        self.assertFalse(self.cache.herald(2, 3))
+        self.assertIsNone(self.cache.herald(1, 4))
+
+        self.cache.set_herald(1, 4, False)
+
+        self.assertFalse(self.cache.herald(1, 4))
+
+        self.now = 161
+
+        self.assertIsNone(self.cache.herald(1, 3))
+
+    def test_apply_entity(self):
+
+        self.now = 150
+
+        self.cache.apply_entity({"action": "update", "id": 1, "after": {"id": 1, "status": "inactive"}})
+        self.cache.apply_entity({"action": "create", "id": 5, "after": {"id": 5, "status": "active"}})
+        self.cache.apply_entity({"action": "delete", "id": 2, "before": {"id": 2, "status": "inactive"}})
+
+        self.assertEqual(self.cache.entities, {1: (False, 150), 5: (True, 150)})
+
+    def test_apply_herald(self):
+
+        self.now = 150
+
+        self.cache.apply_herald({"action": "update", "id": 7, "after": {"entity_id": 2, "app_id": 3, "status": "active"}})
+        self.cache.apply_herald({"action": "create", "id": 8, "after": {"entity_id": 5, "app_id": 3, "status": "active"}})
+        self.cache.apply_herald({"action": "delete", "id": 6, "before": {"entity_id": 1, "app_id": 3, "status": "active"}})
+
+        self.assertEqual(self.cache.heralds, {(2, 3): (True, 150), (5, 3): (True, 150)})
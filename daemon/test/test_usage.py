@@ -0,0 +1,278 @@
+import unittest
+import copy
+import itertools
+
+from emoji import EMOJI_DATA
+
+import specs
+import usage
+
+COMMANDS = [
+    {
+        "name": "help",
+        "usages": [
+            {"name": "general", "meme": "?"},
+            {"name": "command", "meme": "?", "args": [{"name": "command", "valids": []}]}
+        ]
+    },
+    {
+        "name": "scat",
+        "usages": [
+            {"name": "record", "meme": "!", "args": [{"name": "thoughts", "format": "remainder"}]},
+            {"name": "assign", "meme": "!", "args": [
+                {"name": "task", "valids": ["task"]},
+                {"name": "thoughts", "format": "remainder"}
+            ]},
+            {"name": "list_unassigned", "meme": "?"},
+            {"name": "list_since", "meme": "?", "args": [{"name": "since", "format": "duration"}]},
+            {"name": "list_from_to", "meme": "?", "args": [
+                {"name": "from", "format": "duration"},
+                {"name": "to", "format": "duration"}
+            ]}
+        ]
+    },
+    {
+        "name": "task",
+        "usages": [
+            {"name": "assign", "meme": "!", "args": [{"name": "work", "valids": [
+                {"learn": "Learn"}, {"qa": "Run"}, {"scat": "Scat"}
+            ]}]},
+            {"name": "list_incomplete", "meme": "?"},
+            {"name": "list_all", "meme": "?", "args": [{"name": "all", "valids": ["all"]}]}
+        ]
+    },
+    {
+        "name": "react",
+        "usages": [
+            {"name": "emoji", "meme": "*", "args": [{"name": "emoji", "format": "emoji"}]},
+            {"name": "user", "meme": "*", "args": [
+                {"name": "user", "format": "user"},
+                {"name": "why", "format": "remainder"}
+            ]},
+            {"name": "free", "meme": "*", "args": [{"name": "word"}, {"name": "other"}]}
+        ]
+    }
+]
+
+TEXTS = [
+    "", "task", "task do it", "all", "all more", "learn", "qa", "nope", "3d", "3d 1h", "3d nope",
+    "1h 2h 3h", "I don't like it", "👍", "👍 more", "{entity:3}", "{entity:3} because", "<@5> hi",
+    "scat", "help", "a b", "a b c"
+]
+
+
+def decode_time(text):
+
+    seconds = 0
+    number = ""
+
+    for letter in text:
+        if letter.isdigit():
+            number += letter
+        elif letter in "dhm" and number:
+            seconds += int(number) * {"d": 86400, "h": 3600, "m": 60}[letter]
+            number = ""
+        else:
+            return 0
+
+    return 0 if number else seconds
+
+
+def legacy(what, command, text):
+    """
+    parse_usage as it was before compiling
+    """
+
+    invalid = []
+
+    for usage in command["usages"]:
+
+        current = text
+        args = usage.get("args", [])
+        usage["values"] = values = {}
+        usage["errors"] = errors = {}
+
+        if what['meme'] != usage['meme']:
+            usage["error"] = F"wrong usage - try {usage['meme']}{command['name']}"
+            invalid.append(usage)
+            continue
+
+        if not args and current:
+            usage["error"] = "less args than text"
+            invalid.append(usage)
+            continue
+
+        for arg in args:
+
+            name = arg["name"]
+
+            if not current:
+                errors[name] = "missing value"
+                invalid.append(usage)
+                break
+
+            format = arg.get("format", "word")
+            pieces = current.split(maxsplit=1)
+            piece = pieces.pop(0)
+
+            if format == "word":
+                if not arg.get("valids"):
+                    values[name] = piece
+                else:
+                    if arg["valids"] and isinstance(arg["valids"][0], dict):
+                        options = [list(valid.keys())[0] for valid in arg["valids"]]
+                    else:
+                        options = arg["valids"]
+
+                    if piece in options:
+                        values[name] = piece
+                    else:
+                        valids = ', '.join(options)
+                        errors[name] = f"{piece} is not in {valids}"
+            elif format == "remainder":
+                if current:
+                    values[name] = current
+                    current = ""
+                    pieces = []
+                else:
+                    errors[name] = "nothing remaining"
+            elif format == "emoji":
+                if piece in EMOJI_DATA:
+                    values[name] = piece
+                else:
+                    errors[name] = f"{pieces} is not a single emoji"
+            elif format == "duration":
+                seconds = decode_time(piece)
+                if seconds:
+                    values[name] = seconds
+                else:
+                    errors[name] = f"{piece} is not in duration format, ie 3d2h1m = 3 days 2 hours 1 min"
+            elif format == "user":
+                if piece.startswith("{entity:") and piece.endswith("}"):
+                    values[name] = int(piece[1:-1].split(":")[-1])
+                elif piece.startswith("<@") and piece.endswith(">"):
+                    errors[name] = f"{piece} hasn't joined"
+                else:
+                    errors[name] = f"{piece} is not a user"
+
+            current = pieces.pop(0) if pieces else ""
+
+        if current:
+            usage["error"] = "more text than args"
+            invalid.append(usage)
+        elif errors:
+            invalid.append(usage)
+
+    remainders = sorted([usage for usage in command["usages"] if
+        usage not in invalid and
+        usage.get("args") and
+        usage["args"][-1].get("format") == "remainder"
+    ], key=lambda usage: len(usage["args"]), reverse=True)
+
+    valid = [usage for usage in command["usages"] if usage not in invalid and usage not in remainders]
+
+    if len(valid) == 1:
+        what["usage"] = valid[0]["name"]
+        what["values"] = valid[0]["values"]
+    elif len(remainders) == 1 or (
+        len(remainders) > 1 and len(remainders[0]["args"]) > len(remainders[1]["args"])
+    ):
+        what["usage"] = remainders[0]["name"]
+        what["values"] = remainders[0]["values"]
+    elif len(valid) > 1 or len(remainders):
+        valids = " and ".join([usage["name"] for usage in valid + remainders])
+        what["error"] = f"too many valid usages: {valids}"
+    elif len(invalid):
+        closest = sorted(invalid, key=lambda close: len(close.get("errors", [])))[0]
+        what["usage"] = closest["name"]
+        if "args" in usage:
+            what["args"] = usage["args"]
+        if "error" in usage:
+            what["error"] = usage["error"]
+        if "errors" in usage:
+            what["errors"] = usage["errors"]
+    else:
+        what["error"] = "no usage found"
+
+    return "error" not in what
+
+
+class TestUsage(unittest.TestCase):
+
+    maxDiff = None
+
+    def test___init__(self):
+
+        compiled = usage.Usage(0, "task", COMMANDS[2]["usages"][0])
+
+        self.assertEqual(compiled.parsers, [("work", "word", ["learn", "qa", "scat"], frozenset(["learn", "qa", "scat"]))])
+        self.assertEqual(compiled.literals, frozenset(["learn", "qa", "scat"]))
+        self.assertFalse(compiled.remainder)
+        self.assertEqual(compiled.wrong, "wrong usage - try !task")
+
+    def test_evaluate(self):
+
+        compiled = usage.Usage(1, "scat", COMMANDS[1]["usages"][1])
+
+        self.assertEqual(compiled.evaluate("!", "task fix it", {}, decode_time), ({"task": "task", "thoughts": "fix it"}, {}, None))
+        self.assertEqual(compiled.evaluate("!", "nope", {}, decode_time), ({}, {"task": "nope is not in task", "thoughts": "missing value"}, None))
+        self.assertEqual(compiled.evaluate("?", "task", {}, decode_time), ({}, {}, "wrong usage - try !scat"))
+
+
+class TestUsageMatcher(unittest.TestCase):
+
+    maxDiff = None
+
+    def test___init__(self):
+
+        matcher = usage.UsageMatcher(COMMANDS[1], decode_time)
+
+        self.assertEqual([compiled.name for compiled in matcher.empty["?"]], ["list_unassigned"])
+        self.assertEqual([compiled.name for compiled in matcher.literals[("!", "task")]], ["assign"])
+        self.assertEqual([compiled.name for compiled in matcher.open["!"]], ["record"])
+        self.assertEqual([compiled.name for compiled in matcher.open["?"]], ["list_since", "list_from_to"])
+
+    def test_candidates(self):
+
+        matcher = usage.UsageMatcher(COMMANDS[1], decode_time)
+
+        self.assertEqual([compiled.name for compiled in matcher.candidates("!", "task it", {})], ["record", "assign"])
+        self.assertEqual([compiled.name for compiled in matcher.candidates("!", "it", {})], ["record"])
+        self.assertEqual([compiled.name for compiled in matcher.candidates("?", "", {})], ["list_unassigned"])
+        self.assertEqual(len(matcher.candidates("?", "", {"since": []})), 3)
+
+    def test_match(self):
+
+        matcher = usage.UsageMatcher(COMMANDS[1], decode_time)
+
+        self.assertEqual(matcher.match("!", "task fix it"), {"usage": "assign", "values": {"task": "task", "thoughts": "fix it"}})
+        self.assertEqual(matcher.match("?", "1h"), {"usage": "list_since", "values": {"since": 3600}})
+
+        help = usage.UsageMatcher(COMMANDS[0], decode_time)
+
+        self.assertEqual(help.match("?", "scat", {"command": ["help", "scat"]}), {"usage": "command", "values": {"command": "scat"}})
+        self.assertEqual(help.match("?", "nope", {"command": ["help", "scat"]}), {
+            "usage": "general",
+            "args": [{"name": "command", "valids": ["help", "scat"]}],
+            "errors": {"command": "nope is not in help, scat"}
+        })
+
+    def test_match_legacy(self):
+
+        for command, meme, text in itertools.product(COMMANDS, ["?", "!", "*", "+"], TEXTS):
+
+            with self.subTest(command=command["name"], meme=meme, text=text):
+
+                valids = {"command": ["help", "scat", "task"]} if command["name"] == "help" else None
+
+                spec = copy.deepcopy(command)
+
+                if valids:
+                    spec["usages"][1]["args"][0]["valids"] = valids["command"]
+
+                what = {"meme": meme}
+                legacy(what, spec, text)
+                del what["meme"]
+
+                self.assertEqual(usage.UsageMatcher(command, decode_time).match(meme, text, valids), what)
+                self.assertEqual(usage.UsageMatcher(specs.freeze(command), decode_time).match(meme, text, valids), what)
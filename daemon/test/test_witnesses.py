@@ -0,0 +1,83 @@
+import unittest
+import types
+
+import witnesses
+
+
+class TestWitnessMap(unittest.TestCase):
+
+    maxDiff = None
+
+    def setUp(self):
+
+        self.witnesses = witnesses.WitnessMap(origin_id=1)
+
+    def test_load(self):
+
+        self.witnesses.add(9, "old", 9)
+
+        self.witnesses.load([
+            types.SimpleNamespace(id=1, who=100, entity_id=10),
+            types.SimpleNamespace(id=2, who="200", entity_id=20)
+        ], origin_id=2)
+
+        self.assertEqual(self.witnesses.origin_id, 2)
+        self.assertEqual(len(self.witnesses), 2)
+        self.assertEqual(self.witnesses.entity_ids, {"100": 10, "200": 20})
+        self.assertEqual(self.witnesses.whos, {10: "100", 20: "200"})
+
+    def test_add(self):
+
+        self.witnesses.add(1, 100, 10)
+        self.witnesses.add(1, 101, 10)
+
+        self.assertEqual(self.witnesses.entity_ids, {"101": 10})
+        self.assertEqual(self.witnesses.whos, {10: "101"})
+
+    def test_discard(self):
+
+        self.witnesses.add(1, 100, 10)
+        self.witnesses.discard(1)
+        self.witnesses.discard(2)
+
+        self.assertEqual(self.witnesses.entity_ids, {})
+        self.assertEqual(self.witnesses.whos, {})
+        self.assertEqual(self.witnesses.ids, {})
+
+    def test_apply(self):
+
+        self.witnesses.apply({
+            "action": "create",
+            "id": 1,
+            "after": {"origin_id": 1, "who": 100, "entity_id": 10}
+        })
+
+        self.assertEqual(self.witnesses.entity_id(100), 10)
+        self.assertEqual(self.witnesses.who(10), "100")
+
+        self.witnesses.apply({
+            "action": "create",
+            "id": 2,
+            "after": {"origin_id": 2, "who": 200, "entity_id": 20}
+        })
+
+        self.assertIsNone(self.witnesses.entity_id(200))
+
+        self.witnesses.apply({
+            "action": "update",
+            "id": 1,
+            "before": {"origin_id": 1, "who": 100, "entity_id": 10},
+            "after": {"origin_id": 1, "who": 100, "entity_id": 11}
+        })
+
+        self.assertEqual(self.witnesses.entity_id("100"), 11)
+        self.assertIsNone(self.witnesses.who(10))
+
+        self.witnesses.apply({
+            "action": "delete",
+            "id": 1,
+            "before": {"origin_id": 1, "who": 100, "entity_id": 11}
+        })
+
+        self.assertIsNone(self.witnesses.entity_id(100))
+        self.assertEqual(len(self.witnesses), 0)